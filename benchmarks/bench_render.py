@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Render Benchmark for Enhanced Retro Cricket
+Compares in-game frame times under the SDL dummy video driver for:
+  - primitives: the stadium redrawn from shapes every frame, full flip
+  - cached:     the pre-rendered stadium blitted whole, full flip
+  - dirty:      only dirtied regions restored and presented
+and, for the players alone, drawing every bowler, batsman and fielder
+from primitives against one blit of a cached sprite each.
+
+Run from the repository root:
+    python benchmarks/bench_render.py
+"""
+
+import os
+import sys
+import time
+import random
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from enhanced_cricket import EnhancedCricket, Stadium, Bowler, Batsman, Fielder
+from run_benchmarks import scripted_action
+
+FRAMES = 1000
+
+
+def time_frames(game, frames=FRAMES):
+    """Per-frame draw times in milliseconds over a scripted innings"""
+    random.seed(0)
+    game.show_menu = False
+    game.restart_game()
+    game.dirty_rects = None
+    times = []
+    for tick in range(frames):
+        game.step(scripted_action(tick))
+        if game.game_over:
+            game.restart_game()
+        start = time.perf_counter()
+        game.draw()
+        times.append((time.perf_counter() - start) * 1000)
+    return sorted(times)
+
+
+def time_players(game, frames=FRAMES):
+    """Per-frame times in milliseconds to draw just the players over a scripted innings"""
+    random.seed(0)
+    game.show_menu = False
+    game.restart_game()
+    players = game.fielders + [game.bowler, game.batsman]
+    times = []
+    for tick in range(frames):
+        game.step(scripted_action(tick))
+        if game.game_over:
+            game.restart_game()
+        start = time.perf_counter()
+        for player in players:
+            player.draw(game.screen)
+        times.append((time.perf_counter() - start) * 1000)
+    return sorted(times)
+
+
+def report(name, times):
+    median = times[len(times) // 2]
+    p99 = times[int(len(times) * 0.99)]
+    print(f"{name:<12} median {median:6.3f} ms   p99 {p99:6.3f} ms")
+    return median
+
+
+def main():
+    game = EnhancedCricket(persistent=False, sound=False)
+
+    # Original path: draw the stadium from primitives every frame
+    cached_draw = Stadium.draw
+    Stadium.draw = Stadium.render
+    game.dirty_rendering = False
+    primitives = report('primitives', time_frames(game))
+    Stadium.draw = cached_draw
+
+    cached = report('cached', time_frames(game))
+    game.dirty_rendering = True
+    dirty = report('dirty', time_frames(game))
+    print(f"\nDirty rectangles vs primitives: {primitives / dirty:.1f}x faster per frame "
+          f"(cached background alone: {primitives / cached:.1f}x)\n")
+
+    # Players drawn from primitives, then from their sprite caches
+    player_classes = (Bowler, Batsman, Fielder)
+    sprite_draws = [cls.draw for cls in player_classes]
+    for cls in player_classes:
+        cls.draw = lambda self, screen: self.render(screen, self.x, self.y)
+    shapes = report('players', time_players(game))
+    for cls, draw in zip(player_classes, sprite_draws):
+        cls.draw = draw
+    sprites = report('sprites', time_players(game))
+    print(f"\nPlayer sprites vs primitives: {shapes / sprites:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Sound Synthesis Benchmark for Enhanced Retro Cricket
+Times loading the game sounds, up to playable pygame Sounds, with the
+original per-sample loop synthesis and with SoundEffects() with and
+without a cached sound bank, and checks that every path produces the same
+waveforms.
+
+Run from the repository root:
+    python benchmarks/bench_sound_effects.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+import pygame
+from sound_effects import SoundEffects
+
+
+def legacy_tone(frequency, duration, sample_rate=22050):
+    """Per-sample tone synthesis as SoundEffects.generate_tone originally did it"""
+    frames = int(duration * sample_rate)
+    arr = np.zeros((frames, 2))
+    for i in range(frames):
+        wave = np.sin(2 * np.pi * frequency * i / sample_rate)
+        arr[i] = [wave, wave]
+    fade_frames = int(0.1 * sample_rate)
+    for i in range(fade_frames):
+        arr[i] *= i / fade_frames
+        arr[frames - 1 - i] *= i / fade_frames
+    return (arr * 32767).astype(np.int16)
+
+
+def legacy_sounds():
+    """Per-sample synthesis of all five game sounds, as originally written"""
+    sounds = {'hit': legacy_tone(200, 0.2)}
+
+    frames = int(0.5 * 22050)
+    arr = np.zeros((frames, 2))
+    for i in range(frames):
+        freq = 400 - (i / frames) * 300
+        wave = np.sin(2 * np.pi * freq * i / 22050) * 0.5
+        arr[i] = [wave, wave]
+    sounds['wicket'] = (arr * 32767).astype(np.int16)
+
+    frames = int(0.8 * 22050)
+    arr = np.zeros((frames, 2))
+    for i in range(frames):
+        freq = 300 + (i / frames) * 200
+        wave = np.sin(2 * np.pi * freq * i / 22050) * 0.3
+        wave += np.sin(2 * np.pi * freq * 1.5 * i / 22050) * 0.2
+        arr[i] = [wave, wave]
+    sounds['boundary'] = (arr * 32767).astype(np.int16)
+
+    sounds['powerup'] = legacy_tone(440, 0.3)
+
+    frames = int(1.5 * 22050)
+    arr = np.zeros((frames, 2))
+    for i in range(frames):
+        wave = 0
+        for harmonic in [1, 1.5, 2, 2.5]:
+            wave += np.sin(2 * np.pi * 440 * harmonic * i / 22050) * (0.2 / harmonic)
+        wave *= 1 + 0.3 * np.sin(2 * np.pi * 5 * i / 22050)
+        arr[i] = [wave, wave]
+    sounds['milestone'] = (arr * 32767).astype(np.int16)
+    return sounds
+
+
+def legacy_load():
+    """The original loading: per-sample synthesis, then a Sound for each buffer"""
+    return {name: pygame.sndarray.make_sound(pcm) for name, pcm in legacy_sounds().items()}
+
+
+def load(bank_path):
+    """The game's loading: map or build the bank, then make every Sound"""
+    effects = SoundEffects(bank_path)
+    effects.make_sounds()
+    return effects
+
+
+def best_of(func, repeat):
+    """Fastest wall time of several calls, in seconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+
+    bank_path = os.path.join(tempfile.mkdtemp(), 'sound_bank.bin')
+    legacy = legacy_sounds()
+    effects = SoundEffects(bank_path)
+    for name, expected in legacy.items():
+        actual = pygame.sndarray.array(effects.get_sound(name))
+        # float32 synthesis may round differently by a few LSB near peaks
+        error = int(np.abs(actual.astype(np.int32) - expected).max())
+        print(f"{name:<10} {len(actual):>6} frames, max difference {error} LSB")
+
+    def cold_start():
+        os.remove(bank_path)
+        load(bank_path)
+
+    legacy_time = best_of(legacy_load, 3)
+    cold_time = best_of(cold_start, 10)
+    warm_time = best_of(lambda: load(bank_path), 10)
+    print("\nAll sounds ready to play (make_sound included):")
+    print(f"Per-sample loops:          {legacy_time * 1000:8.2f} ms")
+    print(f"SoundEffects(), no bank:   {cold_time * 1000:8.2f} ms ({legacy_time / cold_time:.0f}x faster)")
+    print(f"SoundEffects(), bank hit:  {warm_time * 1000:8.2f} ms ({legacy_time / warm_time:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
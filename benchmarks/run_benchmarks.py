@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for Enhanced Retro Cricket
+Times the frame, physics and startup hot paths under the SDL dummy drivers
+and reports median and p99 per case as JSON. With a baseline, cases slower
+than the baseline median by more than the threshold are reported as
+regressions and the run exits with status 1.
+
+Medians shift by 20-70% from one interpreter to the next on a shared
+machine, so the suite runs in --repeats fresh interpreters and reports the
+median of each case's per-repeat medians, with their spread. A case is
+only a regression when it slows by more than the threshold on top of the
+spread seen across repeats, in the results or the baseline.
+
+Run from the repository root:
+    python benchmarks/run_benchmarks.py                       # compare to baseline.json
+    python benchmarks/run_benchmarks.py --save-baseline       # record a new baseline
+    python benchmarks/run_benchmarks.py --case ball_update --threshold 0.2 --json out.json
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import random
+import platform
+import statistics
+import tempfile
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # Keep stdout pure JSON
+SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_PATH)
+
+import pygame
+from enhanced_cricket import EnhancedCricket, CELEBRATION_FRAMES
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Fail when a median is this much slower than the baseline's (0.25 = 25%)
+DEFAULT_THRESHOLD = 0.25
+
+# Fresh interpreters the suite runs in; each case reports the median of their medians
+DEFAULT_REPEATS = 10
+
+# Samples of 10 fielder updates timed per planned hit, so most fall while fielders chase
+FIELDER_SAMPLES_PER_HIT = 5
+
+
+def scripted_action(tick):
+    """Deterministic batting input that keeps the batsman moving"""
+    return ((tick // 40) % 3 - 1, (tick // 7) % 3 == 0, (tick // 13) % 4 == 1)
+
+
+def measure(func, samples, inner=1):
+    """Per-call times in milliseconds, each sample averaging inner calls"""
+    times = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        for _ in range(inner):
+            func()
+        times.append((time.perf_counter() - start) * 1000 / inner)
+    return times
+
+
+def make_game():
+    """A game in mid-innings with a fixed seed and no sound output"""
+    random.seed(0)
+    game = EnhancedCricket(persistent=False, sound=False)
+    game.show_menu = False
+    game.restart_game(seed=0)
+    for tick in range(200):
+        game.step(scripted_action(tick))
+    return game
+
+
+def bench_stadium_draw(game, samples):
+    return measure(lambda: game.stadium.draw(game.screen), samples)
+
+
+def bench_ball_update(game, samples):
+    ball, batsman = game.ball, game.batsman
+    ticks = [0]
+
+    def update():
+        ticks[0] += 1
+        if ball.update(ticks[0]) is None:
+            ball.check_collision(batsman)
+    return measure(update, samples, inner=100)
+
+
+def bench_fielders_update(game, samples):
+    """Fielders chasing: a new seeded hit is planned, untimed, every few samples"""
+    ball = copy.copy(game.ball)
+    rng = random.Random(0)
+
+    def update():
+        for fielder in game.fielders:
+            fielder.update()
+    times = []
+    while len(times) < samples:
+        game.reset_fielders()
+        ball.x = game.batsman.x + game.batsman.width / 2
+        ball.y = game.batsman.y
+        ball.speed_x, ball.speed_y = rng.uniform(-5, 5), -rng.uniform(4, 9)
+        game.field_planner.plan(ball, game.fielders)
+        times.extend(measure(update, min(FIELDER_SAMPLES_PER_HIT, samples - len(times)), inner=10))
+    game.reset_fielders()
+    return times
+
+
+def bench_draw_ui(game, samples):
+    game.celebration_timer = 0
+    return measure(game.draw_ui, samples, inner=10)
+
+
+def bench_draw_celebration(game, samples):
+    game.celebration_type = 'century'
+    timers = iter(range(10 ** 9))
+
+    def draw():
+        game.celebration_timer = CELEBRATION_FRAMES - next(timers) % CELEBRATION_FRAMES
+        game.draw_celebration()
+    times = measure(draw, samples)
+    game.celebration_timer = 0
+    return times
+
+
+def bench_full_frame(game, samples):
+    game.dirty_rects = None
+    ticks = iter(range(10 ** 9))
+
+    def frame():
+        game.step(scripted_action(next(ticks)))
+        if game.game_over:
+            game.restart_game(seed=0)
+        game.draw()
+    return measure(frame, samples)
+
+
+def bench_sound_effects_init(game, samples):
+    from sound_effects import SoundEffects
+    bank_path = os.path.join(tempfile.mkdtemp(), 'sound_bank.bin')
+    SoundEffects(bank_path)  # Build the bank so samples time the warm start
+
+    def load():
+        SoundEffects(bank_path).make_sounds()
+    return measure(load, samples)
+
+
+def bench_cold_import(game, samples):
+    """Wall time of a fresh interpreter importing the game module"""
+    command = [sys.executable, '-c', 'import enhanced_cricket']
+    env = dict(os.environ, PYTHONPATH=SRC_PATH)
+
+    def run():
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+    return measure(run, samples)
+
+
+def bench_cold_start(game, samples):
+    """Wall time of a fresh interpreter starting the game and drawing its first frame"""
+    command = [sys.executable, '-c',
+               'from enhanced_cricket import EnhancedCricket; EnhancedCricket(persistent=False, sound=False).draw()']
+    env = dict(os.environ, PYTHONPATH=SRC_PATH)
+
+    def run():
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+    return measure(run, samples)
+
+
+# Case name -> (function, samples)
+CASES = {
+    'stadium_draw': (bench_stadium_draw, 300),
+    'ball_update': (bench_ball_update, 300),
+    'fielders_update': (bench_fielders_update, 300),
+    'draw_ui': (bench_draw_ui, 300),
+    'draw_celebration': (bench_draw_celebration, 300),
+    'full_frame': (bench_full_frame, 1000),
+    'sound_effects_init': (bench_sound_effects_init, 50),
+    'cold_import': (bench_cold_import, 5),
+    'cold_start': (bench_cold_start, 5),
+}
+
+
+def summarize(times):
+    ordered = sorted(times)
+    return {
+        'median_ms': ordered[len(ordered) // 2],
+        'p99_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+        'samples': len(ordered),
+    }
+
+
+def run_suite(cases=None, scale=1.0):
+    """Run the named cases (default: all) and return {case: summary}"""
+    game = make_game()
+    results = {}
+    for name in cases or CASES:
+        func, samples = CASES[name]
+        results[name] = summarize(func(game, max(1, int(samples * scale))))
+    return results
+
+
+def run_repeated(cases=None, scale=1.0, repeats=DEFAULT_REPEATS):
+    """run_suite in repeats fresh interpreters.
+
+    Each case reports the median of its per-repeat medians and p99s, and
+    the range of those medians as a fraction of their median (spread).
+    """
+    runs = []
+    spawn = multiprocessing.get_context('spawn')
+    for _ in range(repeats):
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+            runs.append(pool.submit(run_suite, cases, scale).result())
+    results = {}
+    for name, stats in runs[0].items():
+        medians = [run[name]['median_ms'] for run in runs]
+        median = statistics.median(medians)
+        results[name] = {
+            'median_ms': median,
+            'p99_ms': statistics.median(run[name]['p99_ms'] for run in runs),
+            'spread': (max(medians) - min(medians)) / median if median else 0.0,
+            'samples': stats['samples'],
+            'repeats': repeats,
+        }
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Cases whose median exceeds the baseline median by more than threshold
+    plus the wider of the two runs' spreads across repeats"""
+    regressions = {}
+    for name, stats in results.items():
+        reference = baseline.get('results', {}).get(name)
+        if not reference:
+            continue
+        allowed = threshold + max(stats.get('spread', 0.0), reference.get('spread', 0.0))
+        if stats['median_ms'] > reference['median_ms'] * (1 + allowed):
+            regressions[name] = stats['median_ms'] / reference['median_ms'] - 1
+    return regressions
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Headless benchmarks for the game's hot paths")
+    parser.add_argument('--case', action='append', choices=list(CASES),
+                        help='case to run; repeat for several (default: all)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='baseline JSON to compare against (default: benchmarks/baseline.json)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'allowed median slowdown as a fraction (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='write the results to the baseline file instead of comparing')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='multiply every sample count, e.g. 0.1 for a quick run')
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS,
+                        help=f'fresh interpreters to run the suite in (default: {DEFAULT_REPEATS})')
+    parser.add_argument('--json', metavar='PATH', help='also write the report to PATH')
+    args = parser.parse_args(argv)
+
+    report = {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'machine': platform.machine(),
+        'results': run_repeated(args.case, args.scale, max(1, args.repeats)),
+    }
+
+    status = 0
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report['baseline'] = os.path.relpath(args.baseline)
+        report['threshold'] = args.threshold
+        report['regressions'] = compare(report['results'], baseline, args.threshold)
+        status = 1 if report['regressions'] else 0
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.json:
+        with open(args.json, 'w') as f:
+            f.write(output)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Enhanced Retro Cricket Balancing Runner
+Simulates headless innings for every difficulty preset across all CPU cores.
+"""
+
+import sys
+import os
+
+def main():
+    """Balancing runner entry point"""
+    # Worker processes need the headless engine without a window
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    # Add src directory to path
+    src_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+    sys.path.insert(0, src_path)
+
+    try:
+        from monte_carlo import main as run_balance
+    except ImportError as e:
+        print(f"❌ Import Error: {e}")
+        print("Install required dependencies:")
+        print("   pip install pygame numpy")
+        return 1
+
+    return run_balance(sys.argv[1:])
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
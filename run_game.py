@@ -4,6 +4,9 @@ Enhanced Retro Cricket Game Launcher
 Simple script to run the game with proper error handling.
 """
 
+import time
+STARTED = time.perf_counter()  # Before any other import, for the cold-start timing
+
 import sys
 import os
 
@@ -34,8 +37,11 @@ def main():
         print("  ESC - Menu/Quit")
         print("\nEnjoy the game! 🏏\n")
         
+        def report_first_frame():
+            print(f"⏱️  First frame {(time.perf_counter() - STARTED) * 1000:.0f} ms after launch")
+        
         game = EnhancedCricket()
-        game.run()
+        game.run(on_first_frame=report_first_frame)
         
     except ImportError as e:
         print(f"❌ Import Error: {e}")
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Innings Analytics for Enhanced Retro Cricket
+Aggregates the delivery log into batting statistics with NumPy.
+
+New log records are viewed in place as NumPy columns (no parsing or
+copying) and folded into running totals: outcome counts and runs by
+power-up, a combo streak histogram and per-difficulty score histograms.
+Each update only touches rows appended since the last one, so statistics
+stay instant however long the log grows.
+
+Usage:
+    python src/analytics.py [--dir DATA_DIR]
+"""
+
+import sys
+import numpy as np
+from delivery_log import (DeliveryLog, LOG_HEADER, DIFFICULTIES, OUTCOMES, POWER_UPS,
+                          DELIVERY_RECORD, INNINGS_RECORD)
+
+# Column layouts matching delivery_log's fixed-width records
+DELIVERY_DTYPE = np.dtype([
+    ('time', '<f8'), ('session', '<u4'), ('innings', '<u4'), ('tick', '<u4'),
+    ('difficulty', 'u1'), ('outcome', 'u1'), ('stance', 'u1'), ('power_up', 'u1'),
+    ('combo_multiplier', 'u1'), ('outs', 'u1'), ('score_delta', '<i2'), ('score', '<u4'),
+])
+INNINGS_DTYPE = np.dtype([
+    ('start_time', '<f8'), ('end_time', '<f8'), ('session', '<u4'), ('innings', '<u4'),
+    ('first_delivery', '<u8'), ('deliveries', '<u4'), ('seed', '<u4'), ('score', '<u4'),
+    ('boundaries', '<u2'), ('sixes', '<u2'), ('difficulty', 'u1'), ('completed', 'u1'),
+    ('pad', 'V6'),
+])
+assert DELIVERY_DTYPE.itemsize == DELIVERY_RECORD.size
+assert INNINGS_DTYPE.itemsize == INNINGS_RECORD.size
+
+HIT, BOUNDARY, SIX, WICKET = range(len(OUTCOMES))
+
+# Scores above this share the last histogram bucket
+MAX_SCORE = 5000
+
+# Streaks of this many scoring balls or more share the last bucket
+MAX_STREAK = 50
+
+def columns(record_file, dtype, start):
+    """Records from start onwards as a structured array over the file's mmap"""
+    count = record_file.count - start
+    if count <= 0:
+        return np.empty(0, dtype)
+    return np.frombuffer(record_file.view(), dtype, count, LOG_HEADER.size + start * dtype.itemsize)
+
+def percentile(histogram, q):
+    """Score at quantile q of a score histogram"""
+    cumulative = np.cumsum(histogram)
+    return int(np.searchsorted(cumulative, q * cumulative[-1]))
+
+class InningsAnalytics:
+    """Running batting statistics over a DeliveryLog, updated incrementally"""
+    def __init__(self, log):
+        self.log = log
+        self.deliveries_seen = 0
+        self.innings_seen = 0
+        # Outcome counts and runs per power-up code
+        self.outcomes = np.zeros((len(POWER_UPS), len(OUTCOMES)), dtype=np.int64)
+        self.runs = np.zeros(len(POWER_UPS), dtype=np.int64)
+        self.streaks = np.zeros(MAX_STREAK + 1, dtype=np.int64)
+        self.scores = np.zeros((len(DIFFICULTIES), MAX_SCORE + 1), dtype=np.int64)
+        # Streak still open at the end of the rows seen so far: (innings, length)
+        self.open_streak = (None, 0)
+
+    def update(self):
+        """Fold in records appended since the last update; returns the new delivery count"""
+        deliveries = columns(self.log.deliveries, DELIVERY_DTYPE, self.deliveries_seen)
+        added = len(deliveries)
+        if added:
+            self.add_deliveries(deliveries)
+            self.deliveries_seen += added
+        del deliveries  # Release the mmap export before the log remaps
+
+        innings = columns(self.log.innings, INNINGS_DTYPE, self.innings_seen)
+        if len(innings):
+            self.add_innings(innings)
+            self.innings_seen += len(innings)
+        del innings
+        return added
+
+    def add_deliveries(self, deliveries):
+        outcome = deliveries['outcome']
+        self.add_streaks(deliveries['innings'], outcome == WICKET)
+
+        # Codes written as 255 (unknown) are left out of the per-power-up totals
+        known = (deliveries['power_up'] < len(POWER_UPS)) & (outcome < len(OUTCOMES))
+        power_up = deliveries['power_up'][known].astype(np.intp)
+        self.outcomes += np.bincount(power_up * len(OUTCOMES) + outcome[known],
+                                     minlength=self.outcomes.size).reshape(self.outcomes.shape)
+        self.runs += np.bincount(power_up, weights=deliveries['score_delta'][known],
+                                 minlength=len(POWER_UPS)).astype(np.int64)
+
+    def add_streaks(self, innings, wicket):
+        """Count runs of consecutive scoring outcomes, ended by a wicket or a new innings"""
+        count = len(innings)
+        scoring_before = np.cumsum(~wicket) - ~wicket  # Scoring outcomes before each row
+        new_innings = np.empty(count, dtype=bool)
+        new_innings[0] = innings[0] != self.open_streak[0]
+        new_innings[1:] = innings[1:] != innings[:-1]
+        after_wicket = np.zeros(count, dtype=bool)
+        after_wicket[1:] = wicket[:-1]
+
+        # Row where each row's streak began, and the scoring count carried into it
+        starts = new_innings | after_wicket
+        streak_start = np.maximum.accumulate(np.where(starts, np.arange(count), 0))
+        carried = np.where((streak_start == 0) & ~starts[0], self.open_streak[1], 0)
+        length = scoring_before - scoring_before[streak_start] + carried
+
+        # Streaks closed by a wicket, or left open by an innings that ended
+        closed = [length[wicket]]
+        ends = np.flatnonzero(new_innings[1:] & ~wicket[:-1])
+        closed.append(length[ends] + 1)
+        if new_innings[0] and self.open_streak[1]:
+            closed.append(np.array([self.open_streak[1]]))
+        for lengths in closed:
+            self.streaks += np.bincount(np.minimum(lengths, MAX_STREAK), minlength=MAX_STREAK + 1)
+
+        last = count - 1
+        self.open_streak = (innings[last], 0 if wicket[last] else int(length[last]) + 1)
+
+    def add_innings(self, innings):
+        known = innings['difficulty'] < len(DIFFICULTIES)
+        difficulty = innings['difficulty'][known].astype(np.intp)
+        score = np.minimum(innings['score'][known], MAX_SCORE).astype(np.intp)
+        self.scores += np.bincount(difficulty * (MAX_SCORE + 1) + score,
+                                   minlength=self.scores.size).reshape(self.scores.shape)
+
+    def summary(self):
+        """Statistics by power-up, combo streak and difficulty"""
+        by_power_up = {}
+        for code, name in enumerate(POWER_UPS):
+            counts = self.outcomes[code]
+            balls = int(counts[BOUNDARY] + counts[SIX] + counts[WICKET])  # Every ball ends in one
+            if not balls:
+                continue
+            by_power_up[name or 'normal'] = {
+                'balls': balls,
+                'runs': int(self.runs[code]),
+                'strike_rate': 100 * self.runs[code] / balls,
+                'boundary_pct': 100 * counts[BOUNDARY] / balls,
+                'six_rate': counts[SIX] / balls,
+                'wicket_rate': counts[WICKET] / balls,
+            }
+
+        streaks = self.streaks
+        total_streaks = int(streaks.sum())
+        combo = {
+            'streaks': total_streaks,
+            'mean_length': float((streaks * np.arange(len(streaks))).sum() / total_streaks) if total_streaks else 0.0,
+            'longest': int(np.flatnonzero(streaks).max()) if total_streaks else 0,
+            # Shares of streaks reaching no combo, x2 (3+ hits) and x3 (5+ hits)
+            'x1_share': streaks[:3].sum() / total_streaks if total_streaks else 0.0,
+            'x2_share': streaks[3:5].sum() / total_streaks if total_streaks else 0.0,
+            'x3_share': streaks[5:].sum() / total_streaks if total_streaks else 0.0,
+        }
+
+        by_difficulty = {}
+        for code, name in enumerate(DIFFICULTIES):
+            histogram = self.scores[code]
+            innings = int(histogram.sum())
+            if not innings:
+                continue
+            by_difficulty[name] = {
+                'innings': innings,
+                'p10_score': percentile(histogram, 0.10),
+                'median_score': percentile(histogram, 0.50),
+                'p90_score': percentile(histogram, 0.90),
+                'best_score': int(np.flatnonzero(histogram).max()),
+            }
+
+        return {
+            'deliveries': self.deliveries_seen,
+            'innings': self.innings_seen,
+            'by_power_up': by_power_up,
+            'combo_streaks': combo,
+            'by_difficulty': by_difficulty,
+        }
+
+def main(argv=None):
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description="Batting statistics from the delivery log")
+    parser.add_argument('--dir', help='log directory (default: the game data directory)')
+    args = parser.parse_args(argv)
+
+    log = DeliveryLog(args.dir)
+    try:
+        analytics = InningsAnalytics(log)
+        analytics.update()
+        print(json.dumps(analytics.summary(), indent=2, default=float))
+    finally:
+        log.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Spectator Broadcast for Enhanced Retro Cricket
+Fans one live innings out to any number of watching screens over local IPC.
+
+The game only captures each tick as a net_protocol snapshot and writes it
+down a pipe to a relay process, a few microseconds whatever the audience;
+the relay does all the fan-out. Subscribers get a keyframe when they join
+and deltas after that. A subscriber that falls behind has deltas dropped
+rather than queued, then resyncs from a fresh keyframe once it catches up.
+The game never waits on the relay either: when the pipe is full the tick
+is skipped, and the next one goes as a delta from the last tick sent.
+Ball trails are rebuilt by subscribers from the ball positions.
+
+Broadcast from the game by setting CRICKET_BROADCAST to a socket path (or
+HOST:PORT for TCP), then watch:
+    python src/broadcast.py watch [--address PATH]
+Time the game-side cost against the number of subscribers:
+    python src/broadcast.py bench --subscribers 0 10 100
+"""
+
+import os
+import sys
+import time
+import select
+import asyncio
+import tempfile
+import multiprocessing
+from net_protocol import encode_snapshot, decode_snapshot, capture, read_snapshot
+
+DEFAULT_ADDRESS = os.path.join(tempfile.gettempdir(), 'cricket-broadcast.sock')
+
+# Unsent bytes a subscriber may have queued before its deltas are dropped (a few seconds' worth)
+MAX_BACKLOG = 8 * 1024
+
+# Seconds the game waits for the relay to open its socket
+RELAY_STARTUP_TIMEOUT = 5
+
+# Scheduling niceness of the relay, so fan-out never preempts the game's frames
+RELAY_NICENESS = 10
+
+# Message from the game ending the broadcast
+END = b''
+
+def parse_address(address):
+    """(host, port) for a HOST:PORT address, else None for a Unix socket path"""
+    host, _, port = address.rpartition(':')
+    if host and port.isdigit() and os.sep not in address:
+        return host, int(port)
+    return None
+
+async def start_server(handler, address):
+    tcp = parse_address(address)
+    if tcp:
+        return await asyncio.start_server(handler, *tcp)
+    if os.path.exists(address):
+        try:
+            _, writer = await asyncio.open_unix_connection(address)
+        except OSError:
+            os.unlink(address)  # Left behind by a relay that didn't exit cleanly
+        else:
+            writer.close()
+            raise OSError(f"{address} is already broadcasting")
+    return await asyncio.start_unix_server(handler, address)
+
+async def open_connection(address):
+    tcp = parse_address(address)
+    if tcp:
+        return await asyncio.open_connection(*tcp)
+    return await asyncio.open_unix_connection(address)
+
+class Relay:
+    """Relay process side: follows the game's snapshot stream and fans it out"""
+    def __init__(self, conn):
+        self.conn = conn
+        self.state = None
+        self.tick = 0
+        self.keyframe = None  # Keyframe of the current tick, encoded when first needed
+        self.subscribers = {}  # StreamWriter -> in sync (False until sent a keyframe)
+        self.handlers = set()
+        self.finished = None
+
+    async def serve(self, address):
+        loop = asyncio.get_running_loop()
+        self.finished = loop.create_future()
+        try:
+            server = await start_server(self.handle_subscriber, address)
+        except OSError as e:
+            self.conn.send_bytes(str(e).encode())
+            return
+        self.conn.send_bytes(b'')
+        loop.add_reader(self.conn.fileno(), self.receive)
+        await self.finished
+        loop.remove_reader(self.conn.fileno())
+        server.close()
+        for writer in list(self.subscribers):
+            writer.close()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        if not parse_address(address) and os.path.exists(address):
+            os.unlink(address)
+
+    def receive(self):
+        """Take every snapshot waiting in the pipe and pass each on"""
+        try:
+            while self.conn.poll():
+                data = self.conn.recv_bytes()
+                if data == END:
+                    raise EOFError
+                self.forward(data)
+        except (EOFError, OSError):
+            if not self.finished.done():
+                self.finished.set_result(None)  # The game has gone
+
+    def forward(self, data):
+        self.tick, _, self.state = decode_snapshot(data, self.state)
+        self.keyframe = None
+        for writer, synced in list(self.subscribers.items()):
+            if writer.transport.is_closing():
+                del self.subscribers[writer]
+            elif writer.transport.get_write_buffer_size() > MAX_BACKLOG:
+                self.subscribers[writer] = False  # Too slow: drop this delta, resync later
+            elif synced:
+                writer.write(data)
+            else:
+                writer.write(self.current_keyframe())
+                self.subscribers[writer] = True
+
+    def current_keyframe(self):
+        if self.keyframe is None:
+            self.keyframe = encode_snapshot(self.tick, self.state)
+        return self.keyframe
+
+    async def handle_subscriber(self, reader, writer):
+        self.handlers.add(asyncio.current_task())
+        if self.state is None:
+            self.subscribers[writer] = False
+        else:
+            writer.write(self.current_keyframe())  # Late joiners start from the current tick
+            self.subscribers[writer] = True
+        try:
+            await reader.read()  # Subscribers send nothing; this returns when they leave
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.pop(writer, None)
+            self.handlers.discard(asyncio.current_task())
+            writer.close()
+
+def run_relay(conn, address):
+    """Relay process entry point"""
+    if hasattr(os, 'nice'):
+        os.nice(RELAY_NICENESS)
+    try:
+        asyncio.run(Relay(conn).serve(address))
+    except KeyboardInterrupt:
+        pass
+
+class BroadcastPublisher:
+    """Game side of a broadcast: publish() each tick; the relay process does the rest"""
+    def __init__(self, address=DEFAULT_ADDRESS):
+        self.address = address
+        self.conn, relay_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=run_relay, args=(relay_conn, address), daemon=True)
+        self.process.start()
+        relay_conn.close()
+        self.previous = None  # Last state sent, which the relay's next delta applies to
+        self.tick = 0
+        self.dropped = 0
+        if not self.conn.poll(RELAY_STARTUP_TIMEOUT):
+            self.close()
+            raise OSError(f"broadcast relay did not start on {address}")
+        error = self.conn.recv_bytes()
+        if error:
+            self.close()
+            raise OSError(f"cannot broadcast on {address}: {error.decode()}")
+
+    def publish(self, sim):
+        """Send the simulator's current tick to the relay, or skip it if the pipe is full"""
+        if self.conn is None:
+            return
+        tick = self.tick
+        self.tick += 1
+        try:
+            if not select.select((), (self.conn,), (), 0)[1]:
+                self.dropped += 1  # The relay is behind; never stall a frame on it
+                return
+            state = capture(sim)
+            self.conn.send_bytes(encode_snapshot(tick, state, self.previous))
+        except OSError:
+            self.close()  # The relay died; play on without it
+            return
+        self.previous = state
+
+    def close(self):
+        if self.conn is None:
+            return
+        try:
+            self.conn.send_bytes(END)  # Forked children may hold the pipe open, so say so
+        except OSError:
+            pass
+        self.conn.close()
+        self.conn = None
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.terminate()
+
+class Spectator:
+    """A subscriber: keeps the latest broadcast state"""
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+        self.state = None
+        self.tick = 0
+        self.snapshots = 0
+        self.keyframes = 0
+
+    async def connect(self, address=DEFAULT_ADDRESS):
+        self.reader, self.writer = await open_connection(address)
+        return self
+
+    async def receive(self):
+        """Wait for the next snapshot and return the updated state; raises EOFError when the broadcast ends"""
+        try:
+            data = await read_snapshot(self.reader)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            raise EOFError("broadcast over")
+        self.tick, keyframe, self.state = decode_snapshot(data, self.state)
+        self.snapshots += 1
+        self.keyframes += keyframe
+        return self.state
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+async def watch(address):
+    """Show a broadcast in a window"""
+    import pygame
+    from net_protocol import restore
+    from enhanced_cricket import EnhancedCricket, TICK_MS
+    game = EnhancedCricket(persistent=False, sound=False)
+    game.show_menu = False
+    pygame.display.set_caption("Enhanced Retro Cricket - spectating")
+    spectator = await Spectator().connect(address)
+
+    async def receive():
+        try:
+            while True:
+                await spectator.receive()
+        except EOFError:
+            pass
+    receiver = asyncio.create_task(receive())
+    try:
+        while not receiver.done():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    return
+            if spectator.state:
+                restore(game, spectator.state)
+                game.dirty_rects = None
+                game.draw()
+            await asyncio.sleep(TICK_MS / 1000)
+    finally:
+        receiver.cancel()
+        await spectator.close()
+        pygame.quit()
+
+def run_subscribers(address, count, ready, stop):
+    """Benchmark helper process: count spectators reading until stop is set"""
+    async def main():
+        spectators = [await Spectator().connect(address) for _ in range(count)]
+        ready.set()
+
+        async def drain(spectator):
+            try:
+                while True:
+                    await spectator.receive()
+            except EOFError:
+                pass
+        tasks = [asyncio.create_task(drain(s)) for s in spectators]
+        while not stop.is_set():
+            await asyncio.sleep(0.05)
+        for spectator in spectators:
+            await spectator.close()
+        await asyncio.gather(*tasks)
+    asyncio.run(main())
+
+def benchmark(subscribers=0, ticks=600, address=None, seed=0):
+    """Game-side publish cost per tick, with subscribers watching from another process"""
+    from enhanced_cricket import MatchSimulator, TICK_MS
+    from controllers import TrackerController
+    address = address or DEFAULT_ADDRESS
+    publisher = BroadcastPublisher(address)
+    ready, stop = multiprocessing.Event(), multiprocessing.Event()
+    audience = multiprocessing.Process(target=run_subscribers, args=(address, subscribers, ready, stop))
+    audience.start()
+    ready.wait(30)
+    sim = MatchSimulator(seed=seed)
+    sim.restart_game()
+    controller = TrackerController()
+    times = []
+    next_tick = time.perf_counter()
+    for _ in range(ticks):
+        sim.step(controller(sim))
+        if sim.game_over:
+            sim.restart_game()
+        start = time.perf_counter()
+        publisher.publish(sim)
+        times.append(time.perf_counter() - start)
+        next_tick += TICK_MS / 1000  # Real-time pacing, as in the game
+        time.sleep(max(0.0, next_tick - time.perf_counter()))
+    stop.set()
+    audience.join(30)
+    publisher.close()
+    times.sort()
+    return {'subscribers': subscribers, 'ticks': ticks,
+            'publish_mean_us': 1e6 * sum(times) / len(times),
+            'publish_p99_us': 1e6 * times[int(len(times) * 0.99)]}
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Watch a live game, or time broadcasting")
+    commands = parser.add_subparsers(dest='command', required=True)
+    spectate = commands.add_parser('watch', help='watch a broadcast in a window')
+    spectate.add_argument('--address', default=os.environ.get('CRICKET_BROADCAST', DEFAULT_ADDRESS),
+                          help='socket path or HOST:PORT (default: $CRICKET_BROADCAST or %(default)s)')
+    bench = commands.add_parser('bench', help='time the game-side cost against the number of subscribers')
+    bench.add_argument('--subscribers', type=int, nargs='+', default=[0, 10, 100])
+    bench.add_argument('--ticks', type=int, default=600, help='ticks per run, at 60 a second (default: 600)')
+    bench.add_argument('--address', default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == 'watch':
+        asyncio.run(watch(args.address))
+        return 0
+    for count in args.subscribers:
+        stats = benchmark(count, args.ticks, args.address)
+        print(f"{count:4d} subscribers: publish mean {stats['publish_mean_us']:.1f} us, "
+              f"p99 {stats['publish_p99_us']:.1f} us per tick")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Batting Controllers for Enhanced Retro Cricket
+Anything that can bat: a controller turns an Observation of the ball and
+batsman into a (move, swing, defend) action each tick.
+
+Controllers are called with the simulator, so they plug straight into
+MatchSimulator.run_innings(policy=...) and the game's input. Bots never
+touch pygame and run inside the headless engine at full speed.
+
+Benchmark a bot batsman:
+    python src/controllers.py --controller tracker --difficulty Hard --innings 1000
+"""
+
+import sys
+import time
+import random
+from collections import namedtuple
+import pygame
+
+# Batting action with no keys held: (move, swing, defend)
+IDLE_ACTION = (0, False, False)
+
+# What a controller sees each tick; batsman_x and bat_y locate the middle of the bat
+Observation = namedtuple('Observation', 'tick ball_x ball_y ball_speed_x ball_speed_y power_up '
+                                        'batsman_x bat_y stance')
+
+# How far above the bat (px) the tracker bot starts reacting to the ball
+TRACKER_REACTION = 60
+
+# Innings still going after this many ticks (5 minutes at 60 FPS) are cut off
+MAX_TICKS = 5 * 60 * 60
+
+def keyboard_action():
+    """Map the current keyboard state to a batting action (move, swing, defend)"""
+    keys = pygame.key.get_pressed()
+    move = 0
+    if keys[pygame.K_a] or keys[pygame.K_LEFT]:
+        move -= 1
+    if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
+        move += 1
+    return (move, bool(keys[pygame.K_SPACE]), bool(keys[pygame.K_s]))
+
+def observe(sim):
+    """Observation of a MatchSimulator's current tick"""
+    ball, batsman = sim.ball, sim.batsman
+    return Observation(sim.ticks, ball.x, ball.y, ball.speed_x, ball.speed_y, ball.power_up,
+                       batsman.x + batsman.width // 2, batsman.y + batsman.height // 2, batsman.stance)
+
+class Controller:
+    """Base batting controller: act() maps an observation to an action"""
+    def __call__(self, sim):
+        return self.act(observe(sim))
+
+    def act(self, observation):
+        return IDLE_ACTION
+
+    def reset(self):
+        """Called before a new innings"""
+        pass
+
+class KeyboardController(Controller):
+    """The human at the keyboard"""
+    def __call__(self, sim):
+        return keyboard_action()  # Nothing to observe
+
+    def act(self, observation):
+        return keyboard_action()
+
+class ScriptedController(Controller):
+    """Plays a fixed sequence of actions, looping it or idling once it ends"""
+    def __init__(self, actions, loop=True):
+        self.actions = list(actions) or [IDLE_ACTION]
+        self.loop = loop
+        self.index = 0
+
+    def act(self, observation):
+        if self.index >= len(self.actions):
+            if not self.loop:
+                return IDLE_ACTION
+            self.index = 0
+        action = self.actions[self.index]
+        self.index += 1
+        return action
+
+    def reset(self):
+        self.index = 0
+
+def tracker_action(offset, distance, falling, reaction=TRACKER_REACTION):
+    """The tracker's batting action, from the ball's offset from the middle of
+    the bat, its height above the bat and whether it is coming down.
+
+    Works on plain numbers or on NumPy arrays with one entry per innings.
+    """
+    closing = falling & (distance < reaction)
+    move = closing * ((offset > 3) * 1 - (offset < -3) * 1)
+    return move, closing & (distance < 20), False
+
+class TrackerController(Controller):
+    """Bot that lines up with the ball once it is close and swings as it reaches the bat"""
+    def __init__(self, reaction=TRACKER_REACTION):
+        self.reaction = reaction
+
+    def act(self, observation):
+        return tracker_action(observation.ball_x - observation.batsman_x,
+                              observation.bat_y - observation.ball_y,
+                              observation.ball_speed_y > 0, self.reaction)
+
+class RandomController(Controller):
+    """Mashes keys at random, from its own seeded generator"""
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def act(self, observation):
+        rng = self.rng
+        return (rng.randint(-1, 1), rng.random() < 0.1, rng.random() < 0.1)
+
+class ReplayController(Controller):
+    """Replays a recorded innings' actions tick by tick, then idles"""
+    def __init__(self, replay):
+        self.replay = replay
+        self.reset()
+
+    def act(self, observation):
+        return next(self.actions, IDLE_ACTION)
+
+    def reset(self):
+        self.actions = self.replay.actions()
+
+# Bots selectable by name, as factories taking a seed
+CONTROLLERS = {
+    'idle': lambda seed: ScriptedController([IDLE_ACTION]),
+    'swing': lambda seed: ScriptedController([(0, True, False)]),
+    'defend': lambda seed: ScriptedController([(0, False, True)]),
+    'tracker': lambda seed: TrackerController(),
+    'random': lambda seed: RandomController(seed),
+}
+
+def play_innings(controller_name, difficulty, seeds, max_ticks=MAX_TICKS):
+    """Worker task: bat one innings per seed and return summable totals"""
+    from enhanced_cricket import MatchSimulator
+    totals = {'innings': 0, 'score': 0, 'deliveries': 0, 'ticks': 0}
+    sim = MatchSimulator(difficulty)
+    for seed in seeds:
+        controller = CONTROLLERS[controller_name](seed)
+        results = sim.run_innings(controller, max_ticks, seed)
+        totals['innings'] += 1
+        totals['score'] += results['score']
+        totals['deliveries'] += 3 - results['outs'] + results['boundaries'] + results['sixes']
+        totals['ticks'] += results['ticks']
+    return totals
+
+def benchmark(controller_name, difficulty='Medium', innings=1000, seed=0, workers=1, max_ticks=MAX_TICKS):
+    """Bat innings headless across worker processes; returns totals and throughput"""
+    seeds = [random.Random(seed + i).getrandbits(32) for i in range(innings)]
+    start = time.perf_counter()
+    if workers == 1:
+        totals = play_innings(controller_name, difficulty, seeds, max_ticks)
+    else:
+        from monte_carlo import run_tasks
+        tasks = [(controller_name, (controller_name, difficulty, seeds[i::workers], max_ticks))
+                 for i in range(workers)]
+        totals = run_tasks(play_innings, tasks, workers)[controller_name]
+    elapsed = time.perf_counter() - start
+    return dict(totals, seconds=elapsed, mean_score=totals['score'] / max(totals['innings'], 1),
+                deliveries_per_second=totals['deliveries'] / elapsed,
+                ticks_per_second=totals['ticks'] / elapsed)
+
+def main(argv=None):
+    import os
+    import argparse
+    from enhanced_cricket import DIFFICULTY_LEVELS
+    parser = argparse.ArgumentParser(description="Benchmark a bot batsman in the headless engine")
+    parser.add_argument('--controller', choices=list(CONTROLLERS), default='tracker',
+                        help='bot to bat with (default: tracker)')
+    parser.add_argument('--difficulty', choices=list(DIFFICULTY_LEVELS), default='Medium')
+    parser.add_argument('--innings', type=int, default=1000, help='innings to play (default: 1000)')
+    parser.add_argument('--seed', type=int, default=0, help='master seed (default: 0)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('--max-ticks', type=int, default=MAX_TICKS,
+                        help='cut off innings after this many ticks')
+    args = parser.parse_args(argv)
+
+    stats = benchmark(args.controller, args.difficulty, args.innings, args.seed, args.workers, args.max_ticks)
+    print(f"{args.controller} on {args.difficulty}: {stats['innings']} innings, "
+          f"mean score {stats['mean_score']:.2f}, {stats['deliveries']} deliveries in {stats['seconds']:.1f}s "
+          f"({stats['deliveries_per_second']:,.0f} deliveries/s, {stats['ticks_per_second']:,.0f} ticks/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
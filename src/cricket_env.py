@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Training Environments for Enhanced Retro Cricket
+Gymnasium-style batting environments over the headless MatchSimulator.
+
+CricketEnv is one innings: reset() starts it, step(action) plays one tick
+and rewards the runs scored on it. VectorCricketEnv steps many of them in
+worker processes; actions, observations, rewards and done flags live in
+one multiprocessing.shared_memory block that workers read and write in
+place, so a step costs each worker a one-byte message, not a pickle.
+
+Actions are the 4-bit codes of replay.encode_action (0-15) or
+(move, swing, defend) tuples.
+
+Measure throughput:
+    python src/cricket_env.py --envs 64 --workers 4 --steps 2000
+"""
+
+import os
+import sys
+import time
+import random
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from enhanced_cricket import MatchSimulator
+from controllers import MAX_TICKS, observe
+from replay import decode_action
+
+# Observation vector layout
+OBSERVATION_FIELDS = ('ball_x', 'ball_y', 'ball_speed_x', 'ball_speed_y', 'power_up',
+                      'batsman_x', 'stance', 'outs', 'combo_multiplier')
+OBSERVATION_SIZE = len(OBSERVATION_FIELDS)
+POWER_UP_CODES = {None: 0, 'fast': 1, 'slow': 2, 'curve': 3}
+STANCE_CODES = {'ready': 0, 'swing': 1, 'defensive': 2}
+
+# Every action code decoded once
+ACTIONS = [decode_action(code) for code in range(16)]
+
+# Worker commands, one byte each
+STEP, RESET, CLOSE = b's', b'r', b'c'
+
+class CricketEnv:
+    """One batting innings as a reset()/step() environment.
+
+    step() returns (observation, reward, terminated, truncated, info):
+    reward is the score gained on the tick, terminated means the last
+    wicket fell and truncated that max_ticks ran out first.
+    """
+    def __init__(self, difficulty='Medium', seed=None, max_ticks=MAX_TICKS):
+        self.sim = MatchSimulator(difficulty, seed)
+        self.max_ticks = max_ticks
+
+    def reset(self, seed=None):
+        """Start a new innings; returns (observation, info)"""
+        self.sim.restart_game(seed)
+        return self.observation(), {'seed': self.sim.seed}
+
+    def step(self, action):
+        reward, terminated, truncated = self.advance(action)
+        return self.observation(), reward, terminated, truncated, self.sim.results()
+
+    def advance(self, action):
+        """Play one tick; returns (reward, terminated, truncated)"""
+        sim = self.sim
+        if not isinstance(action, tuple):
+            action = ACTIONS[int(action)]
+        score_before = sim.score
+        sim.step(action)
+        return sim.score - score_before, sim.game_over, not sim.game_over and sim.ticks >= self.max_ticks
+
+    def observation(self, out=None):
+        """Observation vector, written into out when given"""
+        if out is None:
+            out = np.empty(OBSERVATION_SIZE, dtype=np.float32)
+        o = observe(self.sim)
+        out[:] = (o.ball_x, o.ball_y, o.ball_speed_x, o.ball_speed_y, POWER_UP_CODES.get(o.power_up, 0),
+                  o.batsman_x, STANCE_CODES.get(o.stance, 0), self.sim.outs, self.sim.combo_multiplier)
+        return out
+
+def shared_layout(num_envs):
+    """(name, dtype, shape, offset) of each shared array, and the total size in bytes"""
+    arrays = (('actions', np.uint8, (num_envs,)),
+              ('observations', np.float32, (num_envs, OBSERVATION_SIZE)),
+              ('rewards', np.float32, (num_envs,)),
+              ('terminated', np.bool_, (num_envs,)),
+              ('truncated', np.bool_, (num_envs,)))
+    layout = []
+    offset = 0
+    for name, dtype, shape in arrays:
+        offset = -(-offset // 8) * 8  # Keep every array 8-byte aligned
+        layout.append((name, dtype, shape, offset))
+        offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return layout, offset
+
+def shared_arrays(buffer, num_envs):
+    """NumPy views of the actions, observations, rewards and done flags in a shared buffer"""
+    layout, _ = shared_layout(num_envs)
+    return {name: np.ndarray(shape, dtype, buffer=buffer, offset=offset)
+            for name, dtype, shape, offset in layout}
+
+def run_envs(envs, arrays, start, command):
+    """Reset or step envs[i] as environment start + i, auto-resetting finished innings"""
+    actions = arrays['actions']
+    observations = arrays['observations']
+    rewards = arrays['rewards']
+    terminated = arrays['terminated']
+    truncated = arrays['truncated']
+    for i, env in enumerate(envs, start):
+        if command == RESET:
+            env.reset()
+            rewards[i] = 0
+            terminated[i] = truncated[i] = False
+        else:
+            rewards[i], terminated[i], truncated[i] = env.advance(actions[i])
+            if terminated[i] or truncated[i]:
+                env.reset()
+        env.observation(observations[i])
+
+def worker(conn, name, num_envs, start, difficulty, seeds, max_ticks):
+    """Worker process: owns environments start.. and steps them on command"""
+    memory = shared_memory.SharedMemory(name=name)
+    arrays = shared_arrays(memory.buf, num_envs)
+    envs = [CricketEnv(difficulty, seed, max_ticks) for seed in seeds]
+    try:
+        while True:
+            command = conn.recv_bytes()
+            if command == CLOSE:
+                break
+            run_envs(envs, arrays, start, command)
+            conn.send_bytes(command)
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del arrays  # Release the views before closing the mapping
+        memory.close()
+
+class VectorCricketEnv:
+    """num_envs CricketEnvs stepped together across worker processes.
+
+    step(actions) takes one action code per environment and returns
+    (observations, rewards, terminated, truncated), arrays shared with the
+    workers that stay valid until the next call; copy what you keep.
+    Finished innings start again at once, so the observation of a
+    terminated environment is the first of its next innings.
+    workers=0 steps every environment in this process.
+    """
+    def __init__(self, num_envs, difficulty='Medium', seed=None, workers=None, max_ticks=MAX_TICKS):
+        self.num_envs = num_envs
+        if workers is None:
+            workers = min(num_envs, os.cpu_count() or 1)
+        master = random.Random(seed)
+        seeds = [master.getrandbits(32) for _ in range(num_envs)]
+        self.memory = shared_memory.SharedMemory(create=True, size=shared_layout(num_envs)[1])
+        self.arrays = shared_arrays(self.memory.buf, num_envs)
+        self.connections = []
+        self.processes = []
+        self.envs = None
+        if workers <= 0:
+            self.envs = [CricketEnv(difficulty, s, max_ticks) for s in seeds]
+            return
+        bounds = np.linspace(0, num_envs, workers + 1).astype(int)
+        context = multiprocessing.get_context()
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            parent, child = context.Pipe()
+            process = context.Process(target=worker, daemon=True, args=(
+                child, self.memory.name, num_envs, int(start), difficulty, seeds[start:stop], max_ticks))
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def command(self, command):
+        if self.envs is not None:
+            run_envs(self.envs, self.arrays, 0, command)
+            return
+        for conn in self.connections:
+            conn.send_bytes(command)
+        for conn in self.connections:
+            conn.recv_bytes()
+
+    def reset(self):
+        """Start a new innings everywhere; returns the observations"""
+        self.command(RESET)
+        return self.arrays['observations']
+
+    def step(self, actions):
+        self.arrays['actions'][:] = actions
+        self.command(STEP)
+        arrays = self.arrays
+        return arrays['observations'], arrays['rewards'], arrays['terminated'], arrays['truncated']
+
+    def close(self):
+        if self.memory is None:
+            return
+        for conn in self.connections:
+            try:
+                conn.send_bytes(CLOSE)
+            except OSError:
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+        for conn in self.connections:
+            conn.close()
+        self.arrays = None
+        self.memory.close()
+        self.memory.unlink()
+        self.memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+def benchmark(num_envs=64, workers=None, steps=2000, seed=0):
+    """Environment steps per second with random actions"""
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, 16, (steps, num_envs), dtype=np.uint8)
+    with VectorCricketEnv(num_envs, seed=seed, workers=workers) as env:
+        env.reset()
+        start = time.perf_counter()
+        total_reward = 0.0
+        for tick_actions in actions:
+            _, rewards, _, _ = env.step(tick_actions)
+            total_reward += float(rewards.sum())
+        elapsed = time.perf_counter() - start
+    return {'steps': steps * num_envs, 'seconds': elapsed,
+            'steps_per_second': steps * num_envs / elapsed, 'total_reward': total_reward}
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Measure VectorCricketEnv throughput")
+    parser.add_argument('--envs', type=int, default=64, help='environments (default: 64)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes, 0 for in-process (default: one per CPU)')
+    parser.add_argument('--steps', type=int, default=2000, help='vector steps to time (default: 2000)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    stats = benchmark(args.envs, args.workers, args.steps, args.seed)
+    print(f"{stats['steps']} environment steps in {stats['seconds']:.2f}s "
+          f"({stats['steps_per_second']:,.0f} steps/s, total reward {stats['total_reward']:.0f})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Delivery Log for Enhanced Retro Cricket
+Append-only on-disk record of every delivery and innings, kept across runs.
+
+deliveries.log holds one fixed-width record per ball outcome (hit, boundary,
+six, wicket) and innings.idx one per finished innings, pointing at its
+deliveries. Both are read through mmap, so a query touches only the records
+it needs: innings are stored in time order, which makes session and date
+lookups binary searches, and the best innings of each difficulty is kept in
+best.idx, so opening the log reads only innings added since it was saved.
+
+Usage:
+    python src/delivery_log.py [--best DIFFICULTY] [--last N] [--session N] [--since YYYY-MM-DD]
+"""
+
+import os
+import sys
+import mmap
+import time
+import struct
+from collections import namedtuple
+from replay import default_data_dir
+
+# File layout: a header, then fixed-width little-endian records
+LOG_HEADER = struct.Struct('<4sHH24x')  # magic, format, record size
+LOG_FORMAT = 1
+DELIVERIES_MAGIC = b'CRDL'
+INNINGS_MAGIC = b'CRIX'
+BEST_MAGIC = b'CRBS'
+
+# time, session, innings, tick, difficulty, outcome, stance, power-up,
+# combo multiplier, outs left, score delta, score after
+DELIVERY_RECORD = struct.Struct('<dIIIBBBBBBhI')
+Delivery = namedtuple('Delivery', 'time session innings tick difficulty outcome stance '
+                                  'power_up combo_multiplier outs score_delta score')
+
+# start time, end time, session, innings, first delivery, delivery count,
+# seed, score, boundaries, sixes, difficulty, completed
+INNINGS_RECORD = struct.Struct('<ddIIQIIIHHBB6x')
+Innings = namedtuple('Innings', 'start_time end_time session innings first_delivery deliveries '
+                                'seed score boundaries sixes difficulty completed')
+
+# Stored codes for the categorical fields
+DIFFICULTIES = ('Easy', 'Medium', 'Hard')
+
+# best.idx: innings indexed so far, then the best score and its innings
+# position plus one (0 when none yet) for each difficulty
+BEST_RECORD = struct.Struct('<Q' + 'IQ' * len(DIFFICULTIES))
+OUTCOMES = ('hit', 'boundary', 'six', 'wicket')
+STANCES = ('ready', 'swing', 'defensive')
+POWER_UPS = (None, 'fast', 'slow', 'curve')
+
+def encode(values, value):
+    return values.index(value) if value in values else 255
+
+def decode(values, code):
+    return values[code] if code < len(values) else None
+
+class RecordFile:
+    """Append-only file of fixed-width records, read through mmap"""
+    def __init__(self, path, magic, record):
+        self.path = path
+        self.record = record
+        self.file = open(path, 'a+b')
+        size = self.file.seek(0, os.SEEK_END)
+        if size == 0:
+            self.file.write(LOG_HEADER.pack(magic, LOG_FORMAT, record.size))
+            self.file.flush()
+            size = LOG_HEADER.size
+        else:
+            self.file.seek(0)
+            header = self.file.read(LOG_HEADER.size)
+            if len(header) < LOG_HEADER.size or LOG_HEADER.unpack(header) != (magic, LOG_FORMAT, record.size):
+                self.file.close()
+                raise ValueError(f"{path} is not a compatible log file")
+
+        # Drop a partial record left by a crash mid-write
+        self.count = (size - LOG_HEADER.size) // record.size
+        if LOG_HEADER.size + self.count * record.size != size:
+            self.file.truncate(LOG_HEADER.size + self.count * record.size)
+        self.map = None
+        self.mapped = 0
+
+    def append(self, values):
+        self.file.write(self.record.pack(*values))
+        self.count += 1
+        return self.count - 1
+
+    def flush(self):
+        self.file.flush()
+
+    def view(self):
+        """mmap covering every record appended so far"""
+        if self.mapped != self.count:
+            self.file.flush()
+            if self.map:
+                self.map.close()
+            self.map = mmap.mmap(self.file.fileno(), LOG_HEADER.size + self.count * self.record.size,
+                                 access=mmap.ACCESS_READ)
+            self.mapped = self.count
+        return self.map
+
+    def get(self, i):
+        return self.record.unpack_from(self.view(), LOG_HEADER.size + i * self.record.size)
+
+    def slice(self, start, stop):
+        """Records start..stop-1 as tuples, read straight from the map"""
+        start, stop = max(start, 0), min(stop, self.count)
+        if start >= stop:
+            return []
+        begin = LOG_HEADER.size + start * self.record.size
+        end = LOG_HEADER.size + stop * self.record.size
+        return list(self.record.iter_unpack(memoryview(self.view())[begin:end]))
+
+    def bisect(self, field, value):
+        """First record whose field is >= value; records must be sorted on it"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.get(middle)[field] < value:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def close(self):
+        if self.map:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+class DeliveryLog:
+    """Ball-by-ball event store with session, date and difficulty queries.
+
+    A log opened by the game is one session; every innings begun in it
+    gets the next innings number, even if abandoned before the last wicket.
+    """
+    def __init__(self, directory=None):
+        self.directory = directory or default_data_dir()
+        os.makedirs(self.directory, exist_ok=True)
+        self.deliveries = RecordFile(os.path.join(self.directory, 'deliveries.log'),
+                                     DELIVERIES_MAGIC, DELIVERY_RECORD)
+        try:
+            self.innings = RecordFile(os.path.join(self.directory, 'innings.idx'),
+                                      INNINGS_MAGIC, INNINGS_RECORD)
+        except (OSError, ValueError):
+            self.deliveries.close()
+            raise
+
+        # Best completed innings of each difficulty: saved in best.idx, caught up with
+        # any innings added after it was last written
+        self.best_path = os.path.join(self.directory, 'best.idx')
+        self.best = {}  # difficulty code -> (score, position)
+        indexed = self.load_best()
+        for position, values in enumerate(self.innings.slice(indexed, self.innings.count), indexed):
+            if values[11]:
+                self.index_innings(position, values[10], values[7])
+        if indexed != self.innings.count:
+            self.save_best()
+
+        last_innings = self.innings.get(self.innings.count - 1) if self.innings.count else None
+        last_delivery = self.deliveries.get(self.deliveries.count - 1) if self.deliveries.count else None
+        self.session = 1 + max(last_innings[2] if last_innings else 0, last_delivery[1] if last_delivery else 0)
+        self.next_innings = 1 + max(last_innings[3] if last_innings else 0, last_delivery[2] if last_delivery else 0)
+        self.current = None
+
+    def load_best(self):
+        """Read best.idx; returns how many innings it covers (0 if it must be rebuilt)"""
+        try:
+            with open(self.best_path, 'rb') as f:
+                data = f.read()
+            if LOG_HEADER.unpack_from(data) != (BEST_MAGIC, LOG_FORMAT, BEST_RECORD.size):
+                return 0
+            values = BEST_RECORD.unpack_from(data, LOG_HEADER.size)
+        except (OSError, struct.error):
+            return 0
+        indexed = values[0]
+        if indexed > self.innings.count:
+            return 0  # Written for a different innings.idx
+        for code in range(len(DIFFICULTIES)):
+            score, position = values[1 + 2 * code:3 + 2 * code]
+            if position:
+                self.best[code] = (score, position - 1)
+        return indexed
+
+    def save_best(self):
+        values = [self.innings.count]
+        for code in range(len(DIFFICULTIES)):
+            score, position = self.best.get(code, (0, -1))
+            values += [score, position + 1]
+        temp_path = self.best_path + '.tmp'
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(LOG_HEADER.pack(BEST_MAGIC, LOG_FORMAT, BEST_RECORD.size) + BEST_RECORD.pack(*values))
+            os.replace(temp_path, self.best_path)
+        except OSError:
+            pass  # Rebuilt from innings.idx on the next open
+
+    def index_innings(self, position, difficulty, score):
+        if difficulty >= len(DIFFICULTIES):
+            return
+        best = self.best.get(difficulty)
+        if best is None or score > best[0]:
+            self.best[difficulty] = (score, position)
+
+    # Recording
+
+    def begin_innings(self, difficulty, seed=0):
+        if self.current:
+            self.end_innings(completed=False)
+        self.current = {
+            'start_time': time.time(),
+            'innings': self.next_innings,
+            'first_delivery': self.deliveries.count,
+            'difficulty': encode(DIFFICULTIES, difficulty),
+            'seed': seed,
+            # Totals so far, kept for an innings abandoned before its results
+            'score': 0,
+            'boundaries': 0,
+            'sixes': 0,
+        }
+        self.next_innings += 1
+
+    def record(self, tick, outcome, stance, power_up, combo_multiplier, outs, score_delta, score):
+        """Append one delivery outcome of the current innings"""
+        current = self.current
+        if not current:
+            return
+        self.deliveries.append((
+            time.time(), self.session, current['innings'], tick, current['difficulty'],
+            encode(OUTCOMES, outcome), encode(STANCES, stance), encode(POWER_UPS, power_up),
+            combo_multiplier, outs, score_delta, score))
+        current['score'] = score
+        if outcome == 'boundary':
+            current['boundaries'] += 1
+        elif outcome == 'six':
+            current['sixes'] += 1
+
+    def end_innings(self, results=None, completed=True):
+        """Close the current innings and add it to the index; without results
+        it is stored with the totals of its recorded deliveries"""
+        if not self.current:
+            return
+        current, self.current = self.current, None
+        results = results or current
+        self.deliveries.flush()
+        innings = Innings(
+            current['start_time'], time.time(), self.session, current['innings'],
+            current['first_delivery'], self.deliveries.count - current['first_delivery'],
+            current['seed'], results.get('score', 0), results.get('boundaries', 0),
+            results.get('sixes', 0), current['difficulty'], int(completed))
+        position = self.innings.append(innings)
+        self.innings.flush()
+        if completed:  # Abandoned innings never set the high score
+            self.index_innings(position, innings.difficulty, innings.score)
+        self.save_best()
+
+    def close(self):
+        if self.current:
+            self.end_innings(completed=False)
+        self.deliveries.close()
+        self.innings.close()
+
+    # Queries
+
+    def innings_at(self, position):
+        return Innings(*self.innings.get(position))
+
+    def best_innings(self, difficulty=None):
+        """Highest-scoring completed innings, on one difficulty or any"""
+        if difficulty is not None:
+            best = self.best.get(encode(DIFFICULTIES, difficulty))
+        else:
+            best = max(self.best.values(), default=None)
+        return self.innings_at(best[1]) if best else None
+
+    def best_score(self, difficulty=None):
+        innings = self.best_innings(difficulty)
+        return innings.score if innings else 0
+
+    def last_innings(self, count, difficulty=None):
+        """The most recent innings, oldest first"""
+        if difficulty is None:
+            return [Innings(*values) for values in self.innings.slice(self.innings.count - count, self.innings.count)]
+        code = encode(DIFFICULTIES, difficulty)
+        found = []
+        position = self.innings.count - 1
+        while position >= 0 and len(found) < count:  # Newest first, reading only as far back as needed
+            innings = self.innings_at(position)
+            if innings.difficulty == code:
+                found.append(innings)
+            position -= 1
+        return found[::-1]
+
+    def session_innings(self, session):
+        start = self.innings.bisect(2, session)
+        stop = self.innings.bisect(2, session + 1)
+        return [Innings(*values) for values in self.innings.slice(start, stop)]
+
+    def innings_between(self, start_time, end_time=float('inf')):
+        """Innings started in [start_time, end_time), as Unix timestamps"""
+        start = self.innings.bisect(0, start_time)
+        stop = self.innings.bisect(0, end_time)
+        return [Innings(*values) for values in self.innings.slice(start, stop)]
+
+    def innings_deliveries(self, innings):
+        start = innings.first_delivery
+        return [Delivery(*values) for values in self.deliveries.slice(start, start + innings.deliveries)]
+
+    def deliveries_between(self, start_time, end_time=float('inf')):
+        start = self.deliveries.bisect(0, start_time)
+        stop = self.deliveries.bisect(0, end_time)
+        return [Delivery(*values) for values in self.deliveries.slice(start, stop)]
+
+def describe(innings):
+    started = time.strftime('%Y-%m-%d %H:%M', time.localtime(innings.start_time))
+    status = '' if innings.completed else ' (abandoned)'
+    return (f"#{innings.innings:<7} {started}  session {innings.session:<5} "
+            f"{decode(DIFFICULTIES, innings.difficulty) or '?':<7} score {innings.score:<5} "
+            f"4s {innings.boundaries:<3} 6s {innings.sixes:<3} {innings.deliveries} deliveries{status}")
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Query the ball-by-ball delivery log")
+    parser.add_argument('--dir', help='log directory (default: the game data directory)')
+    parser.add_argument('--best', metavar='DIFFICULTY', choices=DIFFICULTIES + ('any',),
+                        help='show the best innings on a difficulty, or any')
+    parser.add_argument('--last', type=int, metavar='N', help='show the last N innings')
+    parser.add_argument('--difficulty', choices=DIFFICULTIES, help='restrict --last to one difficulty')
+    parser.add_argument('--session', type=int, help='show the innings of one session')
+    parser.add_argument('--since', metavar='YYYY-MM-DD', help='show innings started on or after a date')
+    args = parser.parse_args(argv)
+
+    log = DeliveryLog(args.dir)
+    try:
+        print(f"{log.deliveries.count} deliveries, {log.innings.count} innings, {log.session - 1} sessions")
+        if args.best:
+            innings = log.best_innings(None if args.best == 'any' else args.best)
+            print(describe(innings) if innings else "No innings recorded")
+        if args.last:
+            for innings in log.last_innings(args.last, args.difficulty):
+                print(describe(innings))
+        if args.session is not None:
+            for innings in log.session_innings(args.session):
+                print(describe(innings))
+        if args.since:
+            start = time.mktime(time.strptime(args.since, '%Y-%m-%d'))
+            for innings in log.innings_between(start):
+                print(describe(innings))
+    finally:
+        log.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
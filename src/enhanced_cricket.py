@@ -2,16 +2,22 @@ import pygame
 import sys
 import random
 import math
-try:
-    import numpy as np
-    from sound_effects import SoundEffects
-    SOUND_AVAILABLE = True
-except ImportError:
-    SOUND_AVAILABLE = False
-    print("NumPy not available - running without sound effects")
+import os
+import time
+import threading
+import importlib.util
+from array import array
+from collections import OrderedDict
+from frame_profiler import FrameProfiler
+from frame_recorder import FrameRecorder
+from replay import Replay, default_replay_dir, save_replay
+from delivery_log import DeliveryLog
+from controllers import IDLE_ACTION, keyboard_action, KeyboardController, TrackerController
 
-# Initialize Pygame
-pygame.init()
+# NumPy (sound synthesis, statistics) is imported when first needed, off the startup path
+SOUND_AVAILABLE = ANALYTICS_AVAILABLE = importlib.util.find_spec('numpy') is not None
+if not SOUND_AVAILABLE:
+    print("NumPy not available - running without sound effects")
 
 # Constants
 SCREEN_WIDTH = 1000
@@ -34,13 +40,180 @@ DIFFICULTY_LEVELS = {
     'Hard': {'ball_speed': 7, 'spawn_delay': 90, 'accuracy': 0.4}
 }
 
+# Simulation time per tick in milliseconds; play runs at 60 ticks per second
+TICK_MS = 1000 / 60
+
+# Fixed-timestep loop: the simulation always advances in TICK_MS steps and
+# frames are drawn in between, so play runs at the same speed on any display
+DEFAULT_MAX_FPS = 60  # Drawn frames per second unless CRICKET_MAX_FPS says otherwise
+MAX_FRAME_SKIP = 10  # Ticks run per drawn frame at most: full speed down to 6 FPS
+MAX_LAG = 0.25  # Seconds of backlog kept; longer stalls are not caught up
+INTERPOLATION_MAX_JUMP = 50  # Pixels; longer moves (resets) are drawn unblended
+
+# Ball speed multipliers for power-ups; others move at normal speed
+POWER_UP_SPEEDS = {'fast': 1.5, 'slow': 0.7}
+
+# Ball colours for power-ups; a normal ball is red
+POWER_UP_COLORS = {'fast': YELLOW, 'slow': BLUE, 'curve': (255, 0, 255)}  # curve: purple
+
+# Player sprites: poses are drawn on a square canvas with the player's position at the origin point
+SPRITE_CANVAS = 128
+SPRITE_ORIGIN = 48
+
+# Celebrations
+CELEBRATION_FRAMES = 180  # 3 seconds at 60 FPS
+CELEBRATION_MESSAGES = {
+    'boundary': "BOUNDARY! 4 RUNS!",
+    'six': "SIX! MAXIMUM!",
+    'fifty': "FIFTY! WELL PLAYED!",
+    'century': "CENTURY! FANTASTIC!",
+    'one_fifty': "150 RUNS! AMAZING!"
+}
+GOLD = (255, 215, 0)
+
+def sweep_box(x0, y0, x1, y1, left, top, right, bottom):
+    """Fraction of the way from (x0, y0) to (x1, y1) where the segment first
+    touches the box, or None if it misses it"""
+    enter, leave = 0.0, 1.0
+    for start, delta, low, high in ((x0, x1 - x0, left, right), (y0, y1 - y0, top, bottom)):
+        if delta == 0:
+            if start < low or start > high:
+                return None
+            continue
+        t0 = (low - start) / delta
+        t1 = (high - start) / delta
+        if t0 > t1:
+            t0, t1 = t1, t0
+        enter = max(enter, t0)
+        leave = min(leave, t1)
+        if enter > leave:
+            return None
+    return enter
+
+# Attract mode: a bot bats a demo innings after the menu sits idle this long (ticks)
+ATTRACT_TICKS = 20 * 60
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces.
+    
+    Keyed by (font, text, color, antialias), so HUD strings are only
+    rasterised again when their value actually changes.
+    """
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)  # Evict least recently used
+        return surface
+    
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+class EffectsCompositor:
+    """Full-screen overlays and celebration animation with no per-frame allocations.
+    
+    Overlay surfaces are created once and reused; the fade alpha, pulse
+    colour and star polygons for every celebration frame are precomputed.
+    """
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.flash_surface = pygame.Surface(size)
+        self.flash_color = None
+        self.dim_surface = pygame.Surface(size)
+        self.dim_key = None
+        
+        frames = range(CELEBRATION_FRAMES + 1)
+        self.flash_alpha = [int((timer / CELEBRATION_FRAMES) * 100) for timer in frames]
+        # Pulsing yellow-red text colour
+        self.pulse_colors = [(255, 255 - int(abs(math.sin(timer * 0.1)) * 50), 0) for timer in frames]
+        self.star_polygons = [self.build_stars(timer) for timer in frames]
+    
+    def build_stars(self, timer):
+        """The 8 star polygons orbiting the celebration text at one timer step"""
+        stars = []
+        for i in range(8):
+            angle = (i * 45) + (timer * 2)
+            star_x = SCREEN_WIDTH//2 + math.cos(math.radians(angle)) * 100
+            star_y = SCREEN_HEIGHT//2 + math.sin(math.radians(angle)) * 50
+            stars.append((
+                (star_x, star_y - 10),
+                (star_x + 3, star_y - 3),
+                (star_x + 10, star_y - 3),
+                (star_x + 5, star_y + 2),
+                (star_x + 8, star_y + 10),
+                (star_x, star_y + 6),
+                (star_x - 8, star_y + 10),
+                (star_x - 5, star_y + 2),
+                (star_x - 10, star_y - 3),
+                (star_x - 3, star_y - 3)
+            ))
+        return tuple(stars)
+    
+    def step(self, timer):
+        """Lookup index for a celebration timer value"""
+        return max(0, min(timer, CELEBRATION_FRAMES))
+    
+    def flash(self, screen, color, timer):
+        """Blend the fading celebration flash over the screen"""
+        if color != self.flash_color:
+            self.flash_surface.fill(color)
+            self.flash_color = color
+        self.flash_surface.set_alpha(self.flash_alpha[self.step(timer)])
+        return screen.blit(self.flash_surface, (0, 0))
+    
+    def dim(self, screen, color, alpha):
+        """Blend a constant translucent overlay over the screen"""
+        if (color, alpha) != self.dim_key:
+            self.dim_surface.fill(color)
+            self.dim_surface.set_alpha(alpha)
+            self.dim_key = (color, alpha)
+        return screen.blit(self.dim_surface, (0, 0))
+    
+    def pulse_color(self, timer):
+        return self.pulse_colors[self.step(timer)]
+    
+    def draw_stars(self, screen, color, timer):
+        for polygon in self.star_polygons[self.step(timer)]:
+            pygame.draw.polygon(screen, color, polygon)
+
 class Stadium:
     def __init__(self):
         self.boundary_radius = 300
         self.pitch_width = 200
         self.pitch_height = 400
+        self.background = None
+        self.background_key = None
+        
+    def get_background(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        """Pre-rendered static field, rebuilt only when the geometry changes"""
+        key = (size, self.boundary_radius, self.pitch_width, self.pitch_height)
+        if self.background_key != key:
+            self.background = pygame.Surface(size)
+            self.render(self.background)
+            if pygame.display.get_surface():
+                self.background = self.background.convert()
+            self.background_key = key
+        return self.background
         
     def draw(self, screen):
+        screen.blit(self.get_background(screen.get_size()), (0, 0))
+        
+    def render(self, screen):
         # Draw stadium background
         screen.fill(DARK_GREEN)
         
@@ -74,7 +247,36 @@ class Stadium:
         # Draw bails
         pygame.draw.line(screen, WHITE, (x - 15, y - 15), (x + 15, y - 15), 2)
 
+class SpriteCache:
+    """Pre-rendered poses of a kind of player, so drawing one is a single blit.
+    
+    A pose is drawn from primitives once, onto a transparent canvas with the
+    player's position at SPRITE_ORIGIN, then cropped to what was drawn.
+    """
+    def __init__(self):
+        self.sprites = {}
+    
+    def get(self, pose, render):
+        """(surface, x offset, y offset) for a pose, rendering it the first time"""
+        sprite = self.sprites.get(pose)
+        if sprite is None:
+            canvas = pygame.Surface((SPRITE_CANVAS, SPRITE_CANVAS), pygame.SRCALPHA)
+            render(canvas, SPRITE_ORIGIN, SPRITE_ORIGIN)
+            bounds = canvas.get_bounding_rect()
+            surface = canvas.subsurface(bounds).copy()
+            if pygame.display.get_surface():
+                surface = surface.convert_alpha()
+            sprite = self.sprites[pose] = (surface, bounds.x - SPRITE_ORIGIN, bounds.y - SPRITE_ORIGIN)
+        return sprite
+    
+    def draw(self, screen, pose, render, x, y):
+        """Blit a pose with the player's position at (x, y); returns the covered rect"""
+        surface, offset_x, offset_y = self.get(pose, render)
+        return screen.blit(surface, (int(x) + offset_x, int(y) + offset_y))
+
 class Bowler:
+    sprites = SpriteCache()
+    
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -96,24 +298,35 @@ class Bowler:
         self.bowling_action = True
         self.bowl_timer = 0
         
+    def pose(self):
+        return (self.bowling_action, self.bowl_timer if self.bowling_action else 0)
+    
     def draw(self, screen):
+        return self.sprites.draw(screen, self.pose(), self.render, self.x, self.y)
+    
+    def render(self, screen, x, y):
+        x, y = int(x), int(y)  # Whole pixels, as the sprite cache blits the pose
+        
         # Draw bowler body
         color = BLUE if not self.bowling_action else RED
-        pygame.draw.rect(screen, color, (self.x, self.y, self.width, self.height))
+        body = pygame.draw.rect(screen, color, (x, y, self.width, self.height))
         
         # Draw head
-        pygame.draw.circle(screen, BROWN, (self.x + self.width//2, self.y - 10), 8)
+        head = pygame.draw.circle(screen, BROWN, (x + self.width//2, y - 10), 8)
         
         # Draw arms (animated during bowling)
         if self.bowling_action:
             arm_angle = math.sin(self.bowl_timer * 0.5) * 45
-            arm_x = self.x + self.width//2 + math.cos(math.radians(arm_angle)) * 15
-            arm_y = self.y + 10 + math.sin(math.radians(arm_angle)) * 15
-            pygame.draw.line(screen, BROWN, (self.x + self.width//2, self.y + 10), (arm_x, arm_y), 3)
+            arm_x = x + self.width//2 + math.cos(math.radians(arm_angle)) * 15
+            arm_y = y + 10 + math.sin(math.radians(arm_angle)) * 15
+            arm = pygame.draw.line(screen, BROWN, (x + self.width//2, y + 10), (arm_x, arm_y), 3)
         else:
-            pygame.draw.line(screen, BROWN, (self.x + self.width//2, self.y + 10), (self.x + self.width//2 + 10, self.y + 20), 3)
+            arm = pygame.draw.line(screen, BROWN, (x + self.width//2, y + 10), (x + self.width//2 + 10, y + 20), 3)
+        return body.unionall([head, arm])
 
 class Batsman:
+    sprites = SpriteCache()
+    
     def __init__(self, x, y):
         self.width = 30
         self.height = 50
@@ -123,20 +336,20 @@ class Batsman:
         self.stance = 'ready'  # ready, swing, defensive
         self.swing_timer = 0
         
-    def update(self):
-        keys = pygame.key.get_pressed()
+    def update(self, action=None):
+        # action is (move, swing, defend); read the keyboard when not supplied
+        if action is None:
+            action = keyboard_action()
+        move, swing, defend = action
         
         # Movement
-        if keys[pygame.K_a] or keys[pygame.K_LEFT]:
-            self.x -= self.speed
-        if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-            self.x += self.speed
+        self.x += move * self.speed
             
         # Batting actions
-        if keys[pygame.K_SPACE]:
+        if swing:
             self.stance = 'swing'
             self.swing_timer = 20
-        elif keys[pygame.K_s]:
+        elif defend:
             self.stance = 'defensive'
         else:
             self.stance = 'ready'
@@ -153,7 +366,15 @@ class Batsman:
         elif self.x + self.width > SCREEN_WIDTH//2 + 100:
             self.x = SCREEN_WIDTH//2 + 100 - self.width
     
+    def pose(self):
+        return (self.stance, self.swing_timer if self.stance == 'swing' else 0)
+    
     def draw(self, screen):
+        return self.sprites.draw(screen, self.pose(), self.render, self.x, self.y)
+    
+    def render(self, screen, x, y):
+        x, y = int(x), int(y)  # Whole pixels, as the sprite cache blits the pose
+        
         # Draw batsman body
         color = BLUE
         if self.stance == 'swing':
@@ -161,10 +382,10 @@ class Batsman:
         elif self.stance == 'defensive':
             color = YELLOW
             
-        pygame.draw.rect(screen, color, (self.x, self.y, self.width, self.height))
+        body = pygame.draw.rect(screen, color, (x, y, self.width, self.height))
         
         # Draw head
-        pygame.draw.circle(screen, BROWN, (self.x + self.width//2, self.y - 8), 6)
+        head = pygame.draw.circle(screen, BROWN, (x + self.width//2, y - 8), 6)
         
         # Draw bat based on stance
         bat_length = 25
@@ -175,13 +396,16 @@ class Batsman:
         else:
             bat_angle = 0
             
-        bat_end_x = self.x + self.width//2 + bat_length * math.cos(math.radians(bat_angle))
-        bat_end_y = self.y + self.height//2 - bat_length * math.sin(math.radians(bat_angle))
-        pygame.draw.line(screen, WHITE, 
-                        (self.x + self.width//2, self.y + self.height//2),
-                        (bat_end_x, bat_end_y), 4)
+        bat_end_x = x + self.width//2 + bat_length * math.cos(math.radians(bat_angle))
+        bat_end_y = y + self.height//2 - bat_length * math.sin(math.radians(bat_angle))
+        bat = pygame.draw.line(screen, WHITE, 
+                              (x + self.width//2, y + self.height//2),
+                              (bat_end_x, bat_end_y), 4)
+        return body.unionall([head, bat])
 
 class Fielder:
+    sprites = SpriteCache()
+    
     def __init__(self, x, y, position_name):
         self.original_x = x  # Store original position
         self.original_y = y
@@ -194,18 +418,36 @@ class Fielder:
         self.target_y = y
         self.speed = 2
         self.is_chasing = False
+        self.path = None  # Planned interception run, one position per tick
+        self.path_index = 0
         
-    def update(self, ball=None):
-        # Simple AI: move towards ball if it's hit
-        if ball and ball.speed_y < 0:  # Ball is going up (hit)
-            self.target_x = ball.x
-            self.target_y = ball.y
-            self.is_chasing = True
-        else:
-            # Return to original position
-            self.target_x = self.original_x
-            self.target_y = self.original_y
-            self.is_chasing = False
+    def center(self):
+        return (self.x + self.width / 2, self.y + self.height / 2)
+    
+    def follow(self, target_x, target_y):
+        """Precompute a straight run bringing the fielder's centre to the target"""
+        center_x, center_y = self.center()
+        dx = target_x - center_x
+        dy = target_y - center_y
+        steps = max(1, int(math.ceil(math.hypot(dx, dy) / self.speed)))
+        self.path = [(self.x + dx * i / steps, self.y + dy * i / steps) for i in range(1, steps + 1)]
+        self.path_index = 0
+        self.target_x = self.x + dx
+        self.target_y = self.y + dy
+        self.is_chasing = True
+    
+    def update(self):
+        if self.path:
+            # Follow the planned interception path, then hold the spot
+            self.x, self.y = self.path[self.path_index]
+            if self.path_index < len(self.path) - 1:
+                self.path_index += 1
+            return
+        
+        # Return to original position
+        self.target_x = self.original_x
+        self.target_y = self.original_y
+        self.is_chasing = False
             
         # Move towards target
         dx = self.target_x - self.x
@@ -223,61 +465,188 @@ class Fielder:
         self.target_x = self.original_x
         self.target_y = self.original_y
         self.is_chasing = False
+        self.path = None
     
     def draw(self, screen):
+        return self.sprites.draw(screen, self.is_chasing, self.render, self.x, self.y)
+    
+    def render(self, screen, x, y):
+        x, y = int(x), int(y)  # Whole pixels, as the sprite cache blits the pose
         color = RED if self.is_chasing else GRAY
-        pygame.draw.rect(screen, color, (int(self.x), int(self.y), self.width, self.height))
-        pygame.draw.circle(screen, BROWN, (int(self.x + self.width//2), int(self.y - 5)), 4)
+        body = pygame.draw.rect(screen, color, (x, y, self.width, self.height))
+        head = pygame.draw.circle(screen, BROWN, (x + self.width//2, y - 5), 4)
+        return body.union(head)
 
-class Ball:
+class FieldingPlanner:
+    """Sends fielders to intercept a hit ball, planned once per hit.
+    
+    The ball's path is predicted up front, every fielder's earliest
+    reachable point on it is found, and the quickest fielders are sent
+    there on precomputed runs while the rest hold their positions.
+    """
+    def __init__(self, max_chasers=2):
+        self.max_chasers = max_chasers
+    
+    def intercept(self, fielder, trajectory):
+        """(ticks, x, y) of the first trajectory point the fielder can reach in time"""
+        fielder_x, fielder_y = fielder.center()
+        for tick, (ball_x, ball_y) in enumerate(trajectory, 1):
+            dx = ball_x - fielder_x
+            dy = ball_y - fielder_y
+            reach = fielder.speed * tick
+            if dx*dx + dy*dy <= reach * reach:
+                return tick, ball_x, ball_y
+        
+        # Out of reach: run to where the ball leaves the field
+        ball_x, ball_y = trajectory[-1]
+        distance = math.hypot(ball_x - fielder_x, ball_y - fielder_y)
+        return distance / fielder.speed, ball_x, ball_y
+    
+    def plan(self, ball, fielders):
+        trajectory = ball.predict_path()
+        if not trajectory:
+            return
+        options = sorted(((self.intercept(fielder, trajectory), i) for i, fielder in enumerate(fielders)))
+        for (ticks, x, y), i in options[:self.max_chasers]:
+            fielders[i].follow(x, y)
+
+class Trail:
+    """Fixed-capacity ring buffer of recent ball positions, oldest first.
+    
+    Coordinates live in preallocated int arrays; head is the slot the next
+    point is written to, so appending never allocates.
+    """
+    def __init__(self, capacity=10):
+        self.capacity = capacity
+        self.xs = array('i', bytes(4 * capacity))
+        self.ys = array('i', bytes(4 * capacity))
+        self.head = 0  # Slot the next point is written to
+        self.count = 0
+    
+    def append(self, point):
+        head = self.head
+        self.xs[head], self.ys[head] = point
+        head += 1
+        self.head = 0 if head == self.capacity else head
+        if self.count < self.capacity:
+            self.count += 1
+    
+    def clear(self):
+        self.head = 0
+        self.count = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def __iter__(self):
+        return iter(self.ordered())
+    
+    def ordered(self):
+        """Stored points as a list, oldest first"""
+        start = self.head - self.count
+        return [(self.xs[i], self.ys[i]) for i in range(start, start + self.count)]
+
+class TrailRenderer:
+    """Draws a whole trail in one batched blit of pre-rendered alpha discs.
+    
+    Each (color, radius, length) keeps its blit sequence of [disc, [x, y]]
+    entries, and draw() only rewrites the positions in place.
+    """
     def __init__(self):
+        self.sequences = {}
+    
+    def get_sequence(self, color, radius, length):
+        """([disc, dest] per trail index, fading in from oldest to newest; disc radii)"""
+        key = (color, radius, length)
+        cached = self.sequences.get(key)
+        if cached is None:
+            sequence, offsets = [], []
+            for i in range(length):
+                disc_radius = max(1, radius - (length - i))
+                alpha = int(255 * (i / length))
+                surface = pygame.Surface((disc_radius * 2 + 1, disc_radius * 2 + 1), pygame.SRCALPHA)
+                pygame.draw.circle(surface, (*color[:3], alpha), (disc_radius, disc_radius), disc_radius)
+                if pygame.display.get_surface():
+                    surface = surface.convert_alpha()
+                sequence.append([surface, [0, 0]])
+                offsets.append(disc_radius)
+            cached = self.sequences[key] = (sequence, offsets)
+        return cached
+    
+    def draw(self, screen, trail, color, radius):
+        """Blend every trail point onto screen; returns the covered rect or None"""
+        count = len(trail)
+        if not count:
+            return None
+        sequence, offsets = self.get_sequence(color, radius, count)
+        xs, ys = trail.xs, trail.ys
+        index = trail.head - count  # Oldest point; negative indexes wrap to the end of the arrays
+        left = right = xs[index]
+        top = bottom = ys[index]
+        for (_, dest), offset in zip(sequence, offsets):
+            x, y = xs[index], ys[index]
+            dest[0] = x - offset
+            dest[1] = y - offset
+            if x < left:
+                left = x
+            elif x > right:
+                right = x
+            if y < top:
+                top = y
+            elif y > bottom:
+                bottom = y
+            index += 1
+        if hasattr(screen, 'fblits'):
+            screen.fblits(sequence)
+        else:
+            screen.blits(sequence, doreturn=False)
+        return pygame.Rect(left - radius, top - radius, right - left + 1 + radius * 2, bottom - top + 1 + radius * 2)
+
+class Ball:
+    trail_renderer = TrailRenderer()
+    
+    def __init__(self, rng=None):
+        # All randomness comes from rng so a seeded match replays exactly
+        self.rng = rng or random.Random()
         self.radius = 6
         self.speed_y = 4
         self.speed_x = 0
         self.color = RED
-        self.trail = []  # Initialize trail first
+        self.trail = Trail(10)  # Initialize trail first
         self.power_up = None
+        self.impact_time = None  # Fraction of the tick at which the bat last hit the ball
         self.reset_position()  # Now call reset_position
         
     def reset_position(self):
         center_x = SCREEN_WIDTH // 2
         center_y = SCREEN_HEIGHT // 2
-        self.x = center_x + random.randint(-20, 20)
+        self.x = center_x + self.rng.randint(-20, 20)
         self.y = center_y - 180  # Start from bowler's end
+        self.previous_x, self.previous_y = self.x, self.y
         self.speed_y = 4
-        self.speed_x = random.uniform(-1, 1)
+        self.speed_x = self.rng.uniform(-1, 1)
         self.trail.clear()
         
         # Random power-up chance
-        if random.random() < 0.1:  # 10% chance
-            self.power_up = random.choice(['fast', 'slow', 'curve'])
+        if self.rng.random() < 0.1:  # 10% chance
+            self.power_up = self.rng.choice(['fast', 'slow', 'curve'])
         else:
             self.power_up = None
     
-    def update(self):
-        # Apply power-up effects
-        if self.power_up == 'fast':
-            speed_multiplier = 1.5
-            self.color = YELLOW
-        elif self.power_up == 'slow':
-            speed_multiplier = 0.7
-            self.color = BLUE
-        elif self.power_up == 'curve':
-            speed_multiplier = 1.0
-            self.speed_x += math.sin(pygame.time.get_ticks() * 0.01) * 0.1
-            self.color = (255, 0, 255)  # Purple
-        else:
-            speed_multiplier = 1.0
-            self.color = RED
-        
-        # Update position
+    def update(self, ticks=0):
+        # Apply power-up effects; curve swing follows simulation time, not the wall clock
+        speed_multiplier = POWER_UP_SPEEDS.get(self.power_up, 1.0)
+        if self.power_up == 'curve':
+            self.speed_x += math.sin(ticks * TICK_MS * 0.01) * 0.1
+        self.color = POWER_UP_COLORS.get(self.power_up, RED)
+        
+        # Update position, remembering where the tick started for collision sweeps
+        self.previous_x, self.previous_y = self.x, self.y
         self.x += self.speed_x
         self.y += self.speed_y * speed_multiplier
         
         # Add to trail
         self.trail.append((int(self.x), int(self.y)))
-        if len(self.trail) > 10:
-            self.trail.pop(0)
         
         # Boundary checks
         if self.x - self.radius <= 0 or self.x + self.radius >= SCREEN_WIDTH:
@@ -300,15 +669,51 @@ class Ball:
             
         return None
     
+    def predict_path(self, max_ticks=600):
+        """Positions the ball will pass through until it leaves play.
+        
+        Follows update() without moving the ball; curve drift is not predicted.
+        """
+        speed_multiplier = POWER_UP_SPEEDS.get(self.power_up, 1.0)
+        center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
+        x, y, speed_x = self.x, self.y, self.speed_x
+        path = []
+        for _ in range(max_ticks):
+            x += speed_x
+            y += self.speed_y * speed_multiplier
+            if x - self.radius <= 0 or x + self.radius >= SCREEN_WIDTH:
+                speed_x *= -0.8
+                x = max(self.radius, min(SCREEN_WIDTH - self.radius, x))
+            path.append((x, y))
+            if ((x - center_x)**2 + (y - center_y)**2 > 300**2 or
+                    y > center_y + 180 or y < center_y - 200):
+                break
+        return path
+    
     def check_collision(self, batsman):
+        """Hit the ball if its bottom edge crossed the bat this tick.
+        
+        The whole path since the last update is swept against the bat, so a
+        ball moving further than the bat is tall in one tick still connects.
+        On contact the ball is moved back to the point of impact, stored in
+        impact_time, and travels the rest of the tick with its new velocity.
+        """
         bat_x = batsman.x + batsman.width // 2
         bat_y = batsman.y + batsman.height // 2
         bat_width = 35 if batsman.stance == 'swing' else 25
         bat_height = 10
         
-        if (bat_x - bat_width//2 <= self.x <= bat_x + bat_width//2 and
-            bat_y - bat_height//2 <= self.y + self.radius <= bat_y + bat_height//2 and
-            self.speed_y > 0):
+        # Sweep only when the path crosses the bat's height band; an incoming
+        # ball only moves down, so it spans previous_y to y
+        top, bottom = bat_y - bat_height//2, bat_y + bat_height//2
+        impact = None
+        if self.speed_y > 0 and self.y + self.radius >= top and self.previous_y + self.radius <= bottom:
+            impact = sweep_box(self.previous_x, self.previous_y + self.radius, self.x, self.y + self.radius,
+                               bat_x - bat_width//2, top, bat_x + bat_width//2, bottom)
+        self.impact_time = impact
+        if impact is not None:
+            self.x = self.previous_x + (self.x - self.previous_x) * impact
+            self.y = self.previous_y + (self.y - self.previous_y) * impact
             
             hit_position = (self.x - bat_x) / (bat_width // 2)
             hit_position = max(-1, min(1, hit_position))
@@ -325,38 +730,53 @@ class Ball:
             self.speed_x = hit_position * 5
             
             # Add randomness
-            self.speed_x += random.uniform(-0.5, 0.5)
-            self.speed_y += random.uniform(-1, 0.5)
+            self.speed_x += self.rng.uniform(-0.5, 0.5)
+            self.speed_y += self.rng.uniform(-1, 0.5)
             
+            # Rest of the tick after the impact
+            remaining = 1 - impact
+            self.x += self.speed_x * remaining
+            self.y += self.speed_y * POWER_UP_SPEEDS.get(self.power_up, 1.0) * remaining
+            self.previous_x, self.previous_y = self.x, self.y
             return True
         return False
     
     def draw(self, screen):
         # Draw trail
-        for i, pos in enumerate(self.trail):
-            alpha = int(255 * (i / len(self.trail)))
-            trail_color = (*self.color[:3], alpha) if len(self.color) == 3 else self.color
-            pygame.draw.circle(screen, trail_color, pos, max(1, self.radius - (len(self.trail) - i)))
+        rects = []
+        trail_rect = self.trail_renderer.draw(screen, self.trail, self.color, self.radius)
+        if trail_rect:
+            rects.append(trail_rect)
         
         # Draw ball
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
+        ball = pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
         
         # Draw power-up indicator
         if self.power_up:
-            pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.radius + 2, 1)
-class EnhancedCricket:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Enhanced Retro Cricket")
-        self.clock = pygame.time.Clock()
-        self.running = True
+            rects.append(pygame.draw.circle(screen, WHITE, (int(self.x), int(self.y)), self.radius + 2, 1))
+        return ball.unionall(rects)
+class MatchSimulator:
+    """Display-free innings engine: game objects, scoring rules and one tick of play.
+    
+    Needs no window, fonts or clock, so innings can be stepped as fast as the
+    CPU allows. EnhancedCricket builds on it, so both produce the same results.
+    
+    Every innings draws its randomness from one generator seeded with
+    self.seed, so the seed plus the batting actions reproduce it exactly.
+    """
+    def __init__(self, difficulty='Medium', seed=None):
+        # Per-match generator: innings seeds come from it, ball physics from rng
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seeds = random.Random(seed)
+        self.seed = seed
+        self.rng = random.Random(seed)
         
         # Game objects
-        self.stadium = Stadium()
         center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
         self.bowler = Bowler(center_x - 12, center_y - 180)
         self.batsman = Batsman(center_x, center_y + 160)
-        self.ball = Ball()
+        self.ball = Ball(self.rng)
         
         # Create fielders
         self.fielders = []
@@ -373,6 +793,8 @@ class EnhancedCricket:
         
         for x, y, name in fielder_positions:
             self.fielders.append(Fielder(x, y, name))
+        self.field_planner = FieldingPlanner()
+        self.profiler = FrameProfiler()
         
         # Game state
         self.score = 0
@@ -380,76 +802,21 @@ class EnhancedCricket:
         self.boundaries = 0
         self.sixes = 0
         self.game_over = False
-        self.high_score = 0
-        self.difficulty = 'Medium'
+        self.difficulty = difficulty
         self.ball_spawn_timer = 0
         self.combo_multiplier = 1
         self.consecutive_hits = 0
+        self.ticks = 0
         
         # Celebration system
         self.celebration_timer = 0
         self.celebration_type = None
         self.last_milestone = 0  # Track last milestone achieved
-        
-        # UI
-        self.font = pygame.font.Font(None, 28)
-        self.large_font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 20)
-        
-        # Sound effects
-        if SOUND_AVAILABLE:
-            try:
-                self.sound_effects = SoundEffects()
-            except:
-                self.sound_effects = None
-                print("Sound effects disabled")
-        else:
-            self.sound_effects = None
-        
-        # Menu state
-        self.show_menu = True
-        self.menu_selection = 0
-        self.menu_options = ['Start Game', 'Difficulty: Medium', 'High Score: 0', 'Quit']
-    
-    def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            elif event.type == pygame.KEYDOWN:
-                if self.show_menu:
-                    self.handle_menu_input(event.key)
-                elif self.game_over:
-                    if event.key == pygame.K_r:
-                        self.restart_game()
-                    elif event.key == pygame.K_m:
-                        self.show_menu = True
-                        self.game_over = False
-                    elif event.key == pygame.K_ESCAPE:
-                        self.running = False
-                else:
-                    if event.key == pygame.K_ESCAPE:
-                        self.show_menu = True
-                    elif event.key == pygame.K_p:
-                        self.toggle_pause()
-    
-    def handle_menu_input(self, key):
-        if key == pygame.K_UP:
-            self.menu_selection = (self.menu_selection - 1) % len(self.menu_options)
-        elif key == pygame.K_DOWN:
-            self.menu_selection = (self.menu_selection + 1) % len(self.menu_options)
-        elif key == pygame.K_RETURN:
-            if self.menu_selection == 0:  # Start Game
-                self.show_menu = False
-                self.restart_game()
-            elif self.menu_selection == 1:  # Difficulty
-                difficulties = list(DIFFICULTY_LEVELS.keys())
-                current_index = difficulties.index(self.difficulty)
-                self.difficulty = difficulties[(current_index + 1) % len(difficulties)]
-                self.menu_options[1] = f'Difficulty: {self.difficulty}'
-            elif self.menu_selection == 3:  # Quit
-                self.running = False
     
-    def restart_game(self):
+    def restart_game(self, seed=None):
+        """Start a fresh innings, seeded from the match generator unless given a seed"""
+        self.seed = seed if seed is not None else self.seeds.getrandbits(32)
+        self.rng.seed(self.seed)
         self.score = 0
         self.outs = 3
         self.boundaries = 0
@@ -458,6 +825,7 @@ class EnhancedCricket:
         self.ball_spawn_timer = 0
         self.combo_multiplier = 1
         self.consecutive_hits = 0
+        self.ticks = 0
         self.celebration_timer = 0
         self.celebration_type = None
         self.last_milestone = 0
@@ -479,21 +847,27 @@ class EnhancedCricket:
         else:
             self.combo_multiplier = 1
     
-    def update(self):
-        if self.show_menu or self.game_over:
+    def step(self, action=IDLE_ACTION):
+        """Advance the innings by one tick using the given batting action"""
+        if self.game_over:
             return
+        self.ticks += 1
         
         # Update celebration timer
         if self.celebration_timer > 0:
             self.celebration_timer -= 1
             
         # Update game objects
-        self.batsman.update()
-        self.bowler.update()
+        profiler = self.profiler
+        with profiler.phase('update.batsman'):
+            self.batsman.update(action)
+        with profiler.phase('update.bowler'):
+            self.bowler.update()
         
         # Update fielders
-        for fielder in self.fielders:
-            fielder.update(self.ball)
+        with profiler.phase('update.fielders'):
+            for fielder in self.fielders:
+                fielder.update()
         
         # Ball spawning logic
         self.ball_spawn_timer += 1
@@ -503,22 +877,20 @@ class EnhancedCricket:
             self.bowler.start_bowling()
             self.ball_spawn_timer = 0
         
-        # Update ball
-        ball_event = self.ball.update()
+        # Update ball; a finished delivery is logged with the power-up it was bowled with
+        power_up = self.ball.power_up
+        score_before = self.score
+        combo_before = self.combo_multiplier
+        with profiler.phase('update.ball'):
+            ball_event = self.ball.update(self.ticks)
         
         # Handle ball events
         if ball_event == "wicket":
-            if self.sound_effects:
-                self.sound_effects.play('wicket')
+            self.play_sound('wicket')
             self.outs -= 1
             self.consecutive_hits = 0
             self.combo_multiplier = 1
             self.reset_fielders()  # Reset fielders after each ball
-            if self.outs <= 0:
-                self.game_over = True
-                if self.score > self.high_score:
-                    self.high_score = self.score
-                    self.menu_options[2] = f'High Score: {self.high_score}'
         elif ball_event == "boundary":
             self.boundaries += 1
             self.score += 4 * self.combo_multiplier
@@ -536,30 +908,50 @@ class EnhancedCricket:
             self.reset_fielders()  # Reset fielders after each ball
             self.check_milestones()
         
+        if ball_event:
+            self.record_delivery(ball_event, power_up, combo_before, self.score - score_before)
+            if self.outs <= 0:
+                self.end_innings()
+        
         # Check collision
         if self.ball.check_collision(self.batsman):
-            if self.sound_effects:
-                self.sound_effects.play('hit')
+            self.play_sound('hit')
+            self.field_planner.plan(self.ball, self.fielders)
             base_points = 1
             if self.batsman.stance == 'swing':
                 base_points = 2
             elif self.batsman.stance == 'defensive':
                 base_points = 1
                 
-            self.score += base_points * self.combo_multiplier
+            combo_before = self.combo_multiplier
+            points = base_points * combo_before
+            self.score += points
             self.consecutive_hits += 1
             self.update_combo()
             self.check_milestones()
+            self.record_delivery('hit', self.ball.power_up, combo_before, points)
+    
+    def play_sound(self, sound_name):
+        """Hook for sound effects; the headless engine stays silent"""
+        pass
+    
+    def record_delivery(self, outcome, power_up, combo_multiplier, score_delta):
+        """Hook for each ball outcome: 'hit', 'boundary', 'six' or 'wicket', with the
+        combo multiplier it was scored at and the runs it added"""
+        pass
+    
+    def end_innings(self):
+        """Called when the last wicket falls"""
+        self.game_over = True
     
     def trigger_celebration(self, celebration_type):
         """Trigger a celebration animation"""
-        self.celebration_timer = 180  # 3 seconds at 60 FPS
+        self.celebration_timer = CELEBRATION_FRAMES
         self.celebration_type = celebration_type
-        if self.sound_effects:
-            if celebration_type in ['boundary', 'six']:
-                self.sound_effects.play('boundary')
-            elif celebration_type in ['fifty', 'century', 'one_fifty']:
-                self.sound_effects.play('milestone')  # Use special milestone sound
+        if celebration_type in ['boundary', 'six']:
+            self.play_sound('boundary')
+        elif celebration_type in ['fifty', 'century', 'one_fifty']:
+            self.play_sound('milestone')  # Use special milestone sound
     
     def reset_fielders(self):
         """Reset all fielders to their original positions"""
@@ -581,28 +973,393 @@ class EnhancedCricket:
             self.trigger_celebration('one_fifty')
             self.last_milestone = 150
     
+    def results(self):
+        """Summary of the innings so far"""
+        return {
+            'score': self.score,
+            'outs': self.outs,
+            'boundaries': self.boundaries,
+            'sixes': self.sixes,
+            'ticks': self.ticks,
+        }
+    
+    def run_innings(self, policy=None, max_ticks=100000, seed=None):
+        """Play a fresh innings to completion with no display or frame pacing.
+        
+        policy is called with the simulator each tick and returns a batting
+        action (move, swing, defend); without one the batsman stands still.
+        max_ticks guards against innings that never lose a wicket.
+        """
+        self.restart_game(seed)
+        while not self.game_over and self.ticks < max_ticks:
+            action = policy(self) if policy else IDLE_ACTION
+            self.step(action)
+        return self.results()
+
+def parse_max_fps(value):
+    """Frame rate cap from a CRICKET_MAX_FPS setting: at least 1, DEFAULT_MAX_FPS if unset or invalid"""
+    if not value:
+        return DEFAULT_MAX_FPS
+    try:
+        return max(1, int(value))
+    except ValueError:
+        print(f"Ignoring CRICKET_MAX_FPS={value!r}: not a whole number")
+        return DEFAULT_MAX_FPS
+
+class EnhancedCricket(MatchSimulator):
+    def __init__(self, persistent=True, controller=None, sound=True):
+        # persistent=False keeps tools and benchmarks out of the saved
+        # replays, delivery log, high score and broadcast; controller bats
+        # instead of the keyboard; sound=False never starts the mixer
+        
+        # Only video and fonts start before the first frame; sound loads in the background
+        pygame.display.init()
+        pygame.font.init()
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Enhanced Retro Cricket")
+        self.clock = pygame.time.Clock()
+        self.running = True
+        
+        # Game objects and innings state
+        super().__init__()
+        self.stadium = Stadium()
+        
+        # Dirty-rectangle rendering: regions drawn over the static field last
+        # frame, or None when the whole screen has to be restored and presented
+        self.dirty_rendering = True
+        self.dirty_rects = None
+        self.last_background = None
+        self.high_score = 0
+        
+        # Fixed timestep: frames are drawn up to max_fps times a second with
+        # positions blended render_alpha of the way from the previous tick
+        self.max_fps = parse_max_fps(os.environ.get('CRICKET_MAX_FPS'))
+        self.previous_positions = None
+        self.render_alpha = 1.0
+        
+        # Replay of the innings in progress; kept on disk for the latest
+        # innings and the high score so disputed scores can be re-checked
+        self.replay = None
+        self.replay_dir = default_replay_dir() if persistent else None
+        
+        # Ball-by-ball log kept across runs; the high score comes from it once
+        # the background loader has opened it, and innings begun before then
+        # go unlogged
+        self.delivery_log = None
+        
+        # Batting statistics over the log, built and caught up with new deliveries when shown
+        self.analytics = None
+        self.show_stats = False
+        self.stats = None
+        self.stats_font = None
+        
+        # Frame profiler: F3 toggles the overlay, F4 exports the trace
+        self.profiler.enabled = bool(os.environ.get('CRICKET_PROFILE'))
+        self.profiler_font = None
+        
+        # Frame recording: F9 starts and stops streaming frames to disk
+        self.recorder = None
+        self.record_format = os.environ.get('CRICKET_RECORD_FORMAT', 'raw')
+        
+        # Spectator broadcast: CRICKET_BROADCAST names the socket screens watch from
+        self.broadcast = None
+        self.broadcast_address = os.environ.get('CRICKET_BROADCAST') if persistent else None
+        
+        # UI
+        self.font = pygame.font.Font(None, 28)
+        self.large_font = pygame.font.Font(None, 48)
+        self.small_font = pygame.font.Font(None, 20)
+        self.text_cache = TextCache()
+        self.effects = EffectsCompositor()
+        
+        # Sound effects: silent until the background loader has them ready
+        self.sound_effects = None
+        self.load_sound = sound and SOUND_AVAILABLE
+        
+        # Batting input, and the attract-mode demo a bot plays while the menu is idle
+        self.controller = controller or KeyboardController()
+        self.demo_controller = TrackerController()
+        self.demo = False
+        self.menu_idle_ticks = 0
+        
+        # Menu state
+        self.show_menu = True
+        self.menu_selection = 0
+        self.menu_options = ['Start Game', 'Difficulty: Medium', f'High Score: {self.high_score}', 'Stats', 'Quit']
+        
+        # Everything the first frame doesn't need opens on a background loader
+        self.loader = None
+        if persistent or self.load_sound:
+            self.loader = threading.Thread(target=self.load_background, args=(persistent,), daemon=True)
+            self.loader.start()
+    
+    def handle_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler.toggle_overlay()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                self.export_profile()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F9:
+                self.toggle_recording()
+            elif event.type == pygame.KEYDOWN:
+                self.menu_idle_ticks = 0
+                if self.demo:
+                    self.stop_demo()
+                elif self.show_stats:
+                    self.show_stats = False
+                elif self.show_menu:
+                    self.handle_menu_input(event.key)
+                elif self.game_over:
+                    if event.key == pygame.K_r:
+                        self.restart_game()
+                    elif event.key == pygame.K_m:
+                        self.show_menu = True
+                        self.game_over = False
+                    elif event.key == pygame.K_ESCAPE:
+                        self.running = False
+                else:
+                    if event.key == pygame.K_ESCAPE:
+                        self.show_menu = True
+                    elif event.key == pygame.K_p:
+                        self.toggle_pause()
+    
+    def handle_menu_input(self, key):
+        if key == pygame.K_UP:
+            self.menu_selection = (self.menu_selection - 1) % len(self.menu_options)
+        elif key == pygame.K_DOWN:
+            self.menu_selection = (self.menu_selection + 1) % len(self.menu_options)
+        elif key == pygame.K_RETURN:
+            if self.menu_selection == 0:  # Start Game
+                self.show_menu = False
+                self.restart_game()
+            elif self.menu_selection == 1:  # Difficulty
+                difficulties = list(DIFFICULTY_LEVELS.keys())
+                current_index = difficulties.index(self.difficulty)
+                self.difficulty = difficulties[(current_index + 1) % len(difficulties)]
+                self.menu_options[1] = f'Difficulty: {self.difficulty}'
+            elif self.menu_selection == 3:  # Stats
+                self.open_stats()
+            elif self.menu_selection == 4:  # Quit
+                self.running = False
+    
+    def load_background(self, persistent):
+        """Background loader: delivery log and high score, broadcast relay, then sound"""
+        if persistent:
+            self.open_delivery_log()
+        if self.broadcast_address:
+            self.start_broadcast()
+        if self.load_sound:
+            self.load_sound_effects()
+    
+    def open_delivery_log(self):
+        try:
+            log = DeliveryLog()
+            best = log.best_score()
+        except (OSError, ValueError) as e:
+            print(f"Delivery log disabled: {e}")
+            return
+        self.delivery_log = log  # Only once it is ready to record
+        if best > self.high_score:
+            self.high_score = best
+            self.menu_options[2] = f'High Score: {self.high_score}'
+    
+    def start_broadcast(self):
+        from broadcast import BroadcastPublisher  # Only when broadcasting, to keep startup lean
+        try:
+            self.broadcast = BroadcastPublisher(self.broadcast_address)
+        except OSError as e:
+            print(f"Broadcast disabled: {e}")
+    
+    def load_sound_effects(self):
+        """Import NumPy, open the mixer, map the sound bank and make its sounds"""
+        try:
+            from sound_effects import SoundEffects
+            sound_effects = SoundEffects()
+            sound_effects.make_sounds()  # make_sound would otherwise hitch the first play
+            self.sound_effects = sound_effects
+        except Exception:
+            print("Sound effects disabled")
+    
+    def open_stats(self):
+        if self.analytics is None and self.delivery_log and ANALYTICS_AVAILABLE:
+            from analytics import InningsAnalytics
+            self.analytics = InningsAnalytics(self.delivery_log)
+        if self.analytics:
+            self.analytics.update()
+            self.stats = self.analytics.summary()
+        self.show_stats = True
+    
+    def start_demo(self):
+        """Attract mode: the demo bot bats an unrecorded innings until a key is pressed"""
+        self.demo = True
+        self.show_menu = False
+        self.demo_controller.reset()
+        self.restart_game()
+    
+    def stop_demo(self):
+        self.demo = False
+        self.game_over = False
+        self.show_menu = True
+        self.menu_idle_ticks = 0
+    
+    def restart_game(self, seed=None):
+        super().restart_game(seed)
+        if self.demo:
+            self.replay = None
+            return
+        self.replay = Replay(self.seed, self.difficulty)
+        if self.delivery_log:
+            self.delivery_log.begin_innings(self.difficulty, self.seed)
+    
+    def update(self):
+        if self.demo and self.game_over:
+            self.stop_demo()
+        if self.show_menu and not self.show_stats:
+            self.menu_idle_ticks += 1
+            if self.menu_idle_ticks >= ATTRACT_TICKS:
+                self.start_demo()
+        if self.show_menu or self.game_over:
+            self.previous_positions = None
+            return
+        self.previous_positions = [(obj.x, obj.y) for obj in self.moving_objects()]
+        action = (self.demo_controller if self.demo else self.controller)(self)
+        if self.replay:
+            self.replay.record(action)
+        self.step(action)
+        if self.broadcast:
+            self.broadcast.publish(self)
+    
+    def moving_objects(self):
+        return self.fielders + [self.batsman, self.ball]
+    
+    def interpolate_positions(self):
+        """Move objects render_alpha of the way back from the last tick; returns their tick positions"""
+        objects = self.moving_objects()
+        current = [(obj.x, obj.y) for obj in objects]
+        if self.previous_positions and self.render_alpha < 1.0:
+            alpha = self.render_alpha
+            for obj, (x0, y0), (x1, y1) in zip(objects, self.previous_positions, current):
+                if abs(x1 - x0) + abs(y1 - y0) < INTERPOLATION_MAX_JUMP:
+                    obj.x = x0 + (x1 - x0) * alpha
+                    obj.y = y0 + (y1 - y0) * alpha
+        return current
+    
+    def restore_positions(self, positions):
+        for obj, (x, y) in zip(self.moving_objects(), positions):
+            obj.x, obj.y = x, y
+    
+    def play_sound(self, sound_name):
+        if self.sound_effects:
+            self.sound_effects.play(sound_name)
+    
+    def end_innings(self):
+        super().end_innings()
+        if self.demo:
+            return
+        new_high_score = self.score > self.high_score
+        if new_high_score:
+            self.high_score = self.score
+            self.menu_options[2] = f'High Score: {self.high_score}'
+        if self.replay:
+            self.replay.results = self.results()
+            self.save_replays(new_high_score)
+        if self.delivery_log:
+            self.delivery_log.end_innings(self.results())
+    
+    def record_delivery(self, outcome, power_up, combo_multiplier, score_delta):
+        if self.delivery_log and not self.demo:
+            self.delivery_log.record(self.ticks, outcome, self.batsman.stance, power_up,
+                                     combo_multiplier, self.outs, score_delta, self.score)
+    
+    def save_replays(self, new_high_score):
+        """Keep the finished innings' replay, and the high score's, on disk"""
+        if not self.replay_dir:
+            return
+        names = ['last_innings.crr'] + (['high_score.crr'] if new_high_score else [])
+        try:
+            for name in names:
+                save_replay(os.path.join(self.replay_dir, name), self.replay)
+        except OSError:
+            pass  # Read-only data location; replays stay in memory only
+    
     def draw(self):
-        if self.show_menu:
+        if self.show_stats:
+            self.draw_stats()
+            self.dirty_rects = None
+            self.draw_profiler()
+        elif self.show_menu:
             self.draw_menu()
+            self.dirty_rects = None
+            self.draw_profiler()
         elif self.game_over:
             self.draw_game_over()
+            self.dirty_rects = None
+            self.draw_profiler()
         else:
-            self.draw_game()
-        
-        pygame.display.flip()
+            rects = self.draw_game()
+            overlay_rect = self.draw_profiler()
+            if not self.dirty_rendering:
+                rects = None
+            if rects is not None and overlay_rect:
+                rects.append(overlay_rect)
+            if self.dirty_rects is not None and rects is not None:
+                # Present only what was erased last frame and drawn this frame
+                with self.profiler.phase('display.flip'):
+                    pygame.display.update(self.dirty_rects + rects)
+                self.dirty_rects = rects
+                return
+            self.dirty_rects = rects
+        
+        with self.profiler.phase('display.flip'):
+            pygame.display.flip()
+    
+    def draw_profiler(self):
+        """Draw the frame profiler overlay when shown and return its rectangle"""
+        if not self.profiler.overlay_visible:
+            return None
+        if self.profiler_font is None:
+            self.profiler_font = pygame.font.SysFont('monospace', 14)
+        return self.profiler.draw_overlay(self.screen, self.profiler_font)
+    
+    def toggle_recording(self):
+        """Start streaming frames to a new recordings/ directory, or finish the current one"""
+        if self.recorder:
+            stats = self.recorder.stop()
+            print(f"Recorded {stats['frames']} frames to {self.recorder.output} "
+                  f"({stats['dropped']} dropped)")
+            self.recorder = None
+            return
+        output = os.path.join('recordings', time.strftime('session_%Y%m%d-%H%M%S'))
+        try:
+            self.recorder = FrameRecorder.for_surface(output, self.screen, fmt=self.record_format).start()
+            print(f"Recording frames to {output}")
+        except (OSError, RuntimeError, ValueError) as e:
+            print(f"Could not start recording: {e}")
+    
+    def export_profile(self):
+        """Write the recorded frame trace as Chrome trace JSON and CSV"""
+        base = time.strftime('frame_profile_%Y%m%d-%H%M%S')
+        try:
+            self.profiler.export_chrome_trace(base + '.json')
+            self.profiler.export_csv(base + '.csv')
+            print(f"Frame profile written to {base}.json and {base}.csv")
+        except OSError as e:
+            print(f"Could not write frame profile: {e}")
     
     def draw_menu(self):
         self.screen.fill(DARK_GREEN)
         
         # Title
-        title = self.large_font.render("ENHANCED CRICKET", True, WHITE)
+        title = self.text_cache.render(self.large_font, "ENHANCED CRICKET", WHITE)
         title_rect = title.get_rect(center=(SCREEN_WIDTH//2, 150))
         self.screen.blit(title, title_rect)
         
         # Menu options
         for i, option in enumerate(self.menu_options):
             color = YELLOW if i == self.menu_selection else WHITE
-            text = self.font.render(option, True, color)
+            text = self.text_cache.render(self.font, option, color)
             text_rect = text.get_rect(center=(SCREEN_WIDTH//2, 250 + i * 50))
             self.screen.blit(text, text_rect)
         
@@ -618,57 +1375,127 @@ class EnhancedCricket:
         ]
         
         for i, instruction in enumerate(instructions):
-            text = self.small_font.render(instruction, True, WHITE)
+            text = self.text_cache.render(self.small_font, instruction, WHITE)
             self.screen.blit(text, (50, 450 + i * 25))
     
-    def draw_game(self):
-        # Draw stadium and field
-        self.stadium.draw(self.screen)
+    def draw_stats(self):
+        self.screen.fill(DARK_GREEN)
         
-        # Draw fielders
-        for fielder in self.fielders:
-            fielder.draw(self.screen)
+        # Title
+        title = self.text_cache.render(self.large_font, "STATISTICS", WHITE)
+        title_rect = title.get_rect(center=(SCREEN_WIDTH//2, 80))
+        self.screen.blit(title, title_rect)
         
-        # Draw game objects
-        self.bowler.draw(self.screen)
-        self.batsman.draw(self.screen)
-        self.ball.draw(self.screen)
+        if self.stats is None:
+            lines = ["Statistics need NumPy and the delivery log"]
+        elif not self.stats['deliveries']:
+            lines = ["No deliveries recorded yet - play an innings!"]
+        else:
+            stats = self.stats
+            lines = [f"{stats['innings']} innings, {stats['deliveries']} deliveries", "",
+                     "Ball      Balls   Strike rate   4s %   6s/ball   Wkts/ball"]
+            for name, row in stats['by_power_up'].items():
+                lines.append(f"{name.capitalize():<9}{row['balls']:>6}{row['strike_rate']:>14.1f}"
+                             f"{row['boundary_pct']:>7.1f}{row['six_rate']:>10.2f}{row['wicket_rate']:>12.2f}")
+            
+            combo = stats['combo_streaks']
+            lines += ["", f"Combo streaks: {combo['streaks']}, mean {combo['mean_length']:.1f} hits, "
+                          f"longest {combo['longest']}",
+                      f"No combo {combo['x1_share']:.0%}   x2 {combo['x2_share']:.0%}   x3 {combo['x3_share']:.0%}",
+                      "", "Level     Innings   10th   Median   90th   Best"]
+            for name, row in stats['by_difficulty'].items():
+                lines.append(f"{name:<9}{row['innings']:>8}{row['p10_score']:>7}{row['median_score']:>9}"
+                             f"{row['p90_score']:>7}{row['best_score']:>7}")
+        
+        if self.stats_font is None:
+            self.stats_font = pygame.font.SysFont('monospace', 18)
+        for i, line in enumerate(lines):
+            text = self.text_cache.render(self.stats_font, line, WHITE)
+            self.screen.blit(text, (120, 140 + i * 26))
+        
+        text = self.text_cache.render(self.small_font, "Press any key to return", YELLOW)
+        self.screen.blit(text, text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 40)))
+    
+    def draw_game(self):
+        """Draw the field and everything on it.
+        
+        Returns the rectangles drawn over the static field, or None when the
+        frame covers the whole screen (celebration flash).
+        """
+        profiler = self.profiler
+        
+        # Restore the static field, only where last frame drew over it if possible
+        with profiler.phase('draw_game.stadium'):
+            background = self.stadium.get_background()
+            if self.dirty_rects is None or background is not self.last_background:
+                self.stadium.draw(self.screen)
+                self.last_background = background
+            else:
+                for rect in self.dirty_rects:
+                    self.screen.blit(background, rect, rect)
+        
+        with profiler.phase('draw_game.entities'):
+            # Draw moving objects between their last two tick positions
+            positions = self.interpolate_positions()
+            try:
+                # Draw fielders
+                rects = [fielder.draw(self.screen) for fielder in self.fielders]
+                
+                # Draw game objects
+                rects.append(self.bowler.draw(self.screen))
+                rects.append(self.batsman.draw(self.screen))
+                rects.append(self.ball.draw(self.screen))
+            finally:
+                self.restore_positions(positions)
         
         # Draw UI
-        self.draw_ui()
+        with profiler.phase('draw_game.ui'):
+            rects.extend(self.draw_ui())
+        if self.celebration_timer > 0:
+            return None
+        return rects
     
     def draw_ui(self):
+        """Draw the HUD and return the rectangles it covers"""
+        rects = []
+        
         # Score panel
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (10, 10))
+        score_text = self.text_cache.render(self.font, f"Score: {self.score}", WHITE)
+        rects.append(self.screen.blit(score_text, (10, 10)))
         
-        outs_text = self.font.render(f"Outs: {self.outs}", True, WHITE)
-        self.screen.blit(outs_text, (10, 40))
+        outs_text = self.text_cache.render(self.font, f"Outs: {self.outs}", WHITE)
+        rects.append(self.screen.blit(outs_text, (10, 40)))
         
-        boundaries_text = self.font.render(f"Boundaries: {self.boundaries}", True, WHITE)
-        self.screen.blit(boundaries_text, (10, 70))
+        boundaries_text = self.text_cache.render(self.font, f"Boundaries: {self.boundaries}", WHITE)
+        rects.append(self.screen.blit(boundaries_text, (10, 70)))
         
-        sixes_text = self.font.render(f"Sixes: {self.sixes}", True, WHITE)
-        self.screen.blit(sixes_text, (10, 100))
+        sixes_text = self.text_cache.render(self.font, f"Sixes: {self.sixes}", WHITE)
+        rects.append(self.screen.blit(sixes_text, (10, 100)))
         
         # Combo multiplier
         if self.combo_multiplier > 1:
-            combo_text = self.font.render(f"COMBO x{self.combo_multiplier}!", True, YELLOW)
-            self.screen.blit(combo_text, (10, 130))
+            combo_text = self.text_cache.render(self.font, f"COMBO x{self.combo_multiplier}!", YELLOW)
+            rects.append(self.screen.blit(combo_text, (10, 130)))
         
         # Difficulty
-        diff_text = self.small_font.render(f"Difficulty: {self.difficulty}", True, WHITE)
-        self.screen.blit(diff_text, (SCREEN_WIDTH - 150, 10))
+        diff_text = self.text_cache.render(self.small_font, f"Difficulty: {self.difficulty}", WHITE)
+        rects.append(self.screen.blit(diff_text, (SCREEN_WIDTH - 150, 10)))
         
         # High score
-        high_score_text = self.small_font.render(f"High Score: {self.high_score}", True, WHITE)
-        self.screen.blit(high_score_text, (SCREEN_WIDTH - 150, 30))
+        high_score_text = self.text_cache.render(self.small_font, f"High Score: {self.high_score}", WHITE)
+        rects.append(self.screen.blit(high_score_text, (SCREEN_WIDTH - 150, 30)))
         
         # Power-up indicator
         if self.ball.power_up:
-            power_text = self.font.render(f"Special Ball: {self.ball.power_up.upper()}", True, YELLOW)
+            power_text = self.text_cache.render(self.font, f"Special Ball: {self.ball.power_up.upper()}", YELLOW)
             text_rect = power_text.get_rect(center=(SCREEN_WIDTH//2, 50))
-            self.screen.blit(power_text, text_rect)
+            rects.append(self.screen.blit(power_text, text_rect))
+        
+        # Attract mode banner
+        if self.demo:
+            demo_text = self.text_cache.render(self.font, "DEMO - PRESS ANY KEY", YELLOW)
+            text_rect = demo_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 20))
+            rects.append(self.screen.blit(demo_text, text_rect))
         
         # Batting stance indicator
         stance_color = WHITE
@@ -677,47 +1504,33 @@ class EnhancedCricket:
         elif self.batsman.stance == 'defensive':
             stance_color = BLUE
             
-        stance_text = self.small_font.render(f"Stance: {self.batsman.stance.upper()}", True, stance_color)
-        self.screen.blit(stance_text, (10, SCREEN_HEIGHT - 30))
+        stance_text = self.text_cache.render(self.small_font, f"Stance: {self.batsman.stance.upper()}", stance_color)
+        rects.append(self.screen.blit(stance_text, (10, SCREEN_HEIGHT - 30)))
         
         # Draw celebration if active
         if self.celebration_timer > 0:
-            self.draw_celebration()
+            with self.profiler.phase('draw_game.celebration'):
+                self.draw_celebration()
+        return rects
     
     def draw_celebration(self):
         """Draw celebration animations and messages"""
-        # Create pulsing effect
-        pulse = int(abs(math.sin(self.celebration_timer * 0.1)) * 50)
-        
-        # Celebration messages
-        messages = {
-            'boundary': "BOUNDARY! 4 RUNS!",
-            'six': "SIX! MAXIMUM!",
-            'fifty': "FIFTY! WELL PLAYED!",
-            'century': "CENTURY! FANTASTIC!",
-            'one_fifty': "150 RUNS! AMAZING!"
-        }
-        
-        if self.celebration_type in messages:
+        message = CELEBRATION_MESSAGES.get(self.celebration_type)
+        if message:
             # Background flash effect
-            flash_alpha = int((self.celebration_timer / 180) * 100)
-            flash_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            flash_surface.set_alpha(flash_alpha)
-            
             if self.celebration_type in ['boundary', 'six']:
-                flash_surface.fill(YELLOW)
+                flash_color = YELLOW
             else:  # Milestones
-                flash_surface.fill((255, 215, 0))  # Gold color
-            
-            self.screen.blit(flash_surface, (0, 0))
+                flash_color = GOLD
+            self.effects.flash(self.screen, flash_color, self.celebration_timer)
             
             # Main celebration text
-            celebration_color = (255, 255 - pulse, 0)  # Pulsing yellow-red
-            celebration_text = self.large_font.render(messages[self.celebration_type], True, celebration_color)
+            celebration_color = self.effects.pulse_color(self.celebration_timer)
+            celebration_text = self.text_cache.render(self.large_font, message, celebration_color)
             text_rect = celebration_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
             
             # Add shadow effect
-            shadow_text = self.large_font.render(messages[self.celebration_type], True, BLACK)
+            shadow_text = self.text_cache.render(self.large_font, message, BLACK)
             shadow_rect = shadow_text.get_rect(center=(SCREEN_WIDTH//2 + 3, SCREEN_HEIGHT//2 + 3))
             self.screen.blit(shadow_text, shadow_rect)
             self.screen.blit(celebration_text, text_rect)
@@ -725,35 +1538,17 @@ class EnhancedCricket:
             # Additional effects for milestones
             if self.celebration_type in ['fifty', 'century', 'one_fifty']:
                 # Draw stars around the text
-                for i in range(8):
-                    angle = (i * 45) + (self.celebration_timer * 2)
-                    star_x = SCREEN_WIDTH//2 + math.cos(math.radians(angle)) * 100
-                    star_y = SCREEN_HEIGHT//2 + math.sin(math.radians(angle)) * 50
-                    pygame.draw.polygon(self.screen, YELLOW, [
-                        (star_x, star_y - 10),
-                        (star_x + 3, star_y - 3),
-                        (star_x + 10, star_y - 3),
-                        (star_x + 5, star_y + 2),
-                        (star_x + 8, star_y + 10),
-                        (star_x, star_y + 6),
-                        (star_x - 8, star_y + 10),
-                        (star_x - 5, star_y + 2),
-                        (star_x - 10, star_y - 3),
-                        (star_x - 3, star_y - 3)
-                    ])
+                self.effects.draw_stars(self.screen, YELLOW, self.celebration_timer)
     
     def draw_game_over(self):
         # Draw game background (dimmed)
         self.draw_game()
         
         # Overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(180)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.effects.dim(self.screen, BLACK, 180)
         
         # Game over text
-        game_over_text = self.large_font.render("GAME OVER", True, WHITE)
+        game_over_text = self.text_cache.render(self.large_font, "GAME OVER", WHITE)
         text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 120))
         self.screen.blit(game_over_text, text_rect)
         
@@ -771,17 +1566,57 @@ class EnhancedCricket:
         
         for i, stat in enumerate(stats):
             color = YELLOW if stat.startswith("High Score") and self.score == self.high_score else WHITE
-            text = self.font.render(stat, True, color)
+            text = self.text_cache.render(self.font, stat, color)
             text_rect = text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 40 + i * 30))
             self.screen.blit(text, text_rect)
     
-    def run(self):
+    def run(self, on_first_frame=None):
+        """Main loop: fixed-length simulation ticks, with frames drawn in between.
+        
+        Each frame runs every tick that has come due, up to MAX_FRAME_SKIP;
+        when ticks take longer than real time the rest carry over to later
+        frames, so a slow machine draws fewer frames but plays at full speed.
+        on_first_frame is called once the first frame is on screen.
+        """
+        profiler = self.profiler
+        tick_seconds = TICK_MS / 1000
+        next_tick = time.perf_counter()
         while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(60)
-        
+            with profiler.phase('frame'):
+                with profiler.phase('handle_events'):
+                    self.handle_events()
+                with profiler.phase('update'):
+                    now = time.perf_counter()
+                    if now - next_tick > MAX_LAG:
+                        next_tick = now - MAX_LAG  # Drop a stall's backlog instead of racing through it
+                    steps = 0
+                    while now >= next_tick and steps < MAX_FRAME_SKIP:
+                        self.update()
+                        next_tick += tick_seconds
+                        steps += 1
+                        now = time.perf_counter()
+                    # Fraction of the next tick already elapsed
+                    self.render_alpha = max(0.0, min(1.0, 1 - (next_tick - now) / tick_seconds))
+                with profiler.phase('draw'):
+                    self.draw()
+                if on_first_frame:
+                    on_first_frame()
+                    on_first_frame = None
+                if self.recorder:
+                    with profiler.phase('record'):
+                        self.recorder.capture(self.screen)
+                with profiler.phase('clock.tick'):
+                    self.clock.tick(self.max_fps)
+            profiler.next_frame()
+        
+        if self.recorder:
+            self.toggle_recording()
+        if self.loader:
+            self.loader.join()  # Don't close what it is still opening, or shut SDL down under the mixer
+        if self.broadcast:
+            self.broadcast.close()
+        if self.delivery_log:
+            self.delivery_log.close()
         pygame.quit()
         sys.exit()
 
@@ -0,0 +1,192 @@
+"""
+Frame Profiler for Enhanced Retro Cricket
+Times named phases of every frame into fixed-size histograms, draws them as
+a toggleable overlay and exports recent frames as Chrome trace-event JSON
+(chrome://tracing, Perfetto) or CSV.
+
+Phases are timed with `with profiler.phase(name):`. While the profiler is
+disabled that returns a shared do-nothing context, so instrumented code
+costs one method call per phase.
+"""
+
+import csv
+import json
+import math
+import time
+from collections import deque
+import pygame
+
+# Histogram buckets: 8 per doubling of duration (~9% resolution), up to ~4 s
+HISTOGRAM_BUCKETS_PER_OCTAVE = 8
+HISTOGRAM_BUCKETS = 256
+
+# Overlay statistics are recomputed this often (frames)
+OVERLAY_REFRESH = 30
+
+class PhaseHistogram:
+    """Fixed-size duration histogram for one phase"""
+    def __init__(self):
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, duration_ns):
+        bucket = int(math.log2(duration_ns + 1) * HISTOGRAM_BUCKETS_PER_OCTAVE)
+        self.buckets[min(bucket, HISTOGRAM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def percentile_ms(self, q):
+        """Upper edge of the bucket holding quantile q, in milliseconds"""
+        target = q * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target and seen:
+                return 2 ** ((i + 1) / HISTOGRAM_BUCKETS_PER_OCTAVE) / 1e6
+        return 0.0
+
+    def mean_ms(self):
+        return self.total_ns / self.count / 1e6 if self.count else 0.0
+
+class NullPhase:
+    """Context used for every phase while profiling is off"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_PHASE = NullPhase()
+
+class Phase:
+    """Reusable timing context for one named phase"""
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.histogram = PhaseHistogram()
+        self.depth = profiler.depth  # Nesting level where the phase was first seen
+        self.start = 0.0
+
+    def __enter__(self):
+        self.profiler.depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self.profiler.depth -= 1
+        duration_ns = int((end - self.start) * 1e9)
+        self.histogram.add(duration_ns)
+        self.profiler.trace.append((self.profiler.frames, self.name, self.start, duration_ns))
+        return False
+
+class FrameProfiler:
+    """Per-phase frame timings with an on-screen overlay and trace export.
+
+    Histograms accumulate from when profiling is enabled; the trace keeps
+    the most recent trace_capacity phase timings.
+    """
+    def __init__(self, enabled=False, trace_capacity=100000):
+        self.enabled = enabled
+        self.overlay_visible = False
+        self.pending = None  # Overlay state requested for the next frame
+        self.phases = {}  # In order of first use, so parents precede their sub-phases
+        self.depth = 0
+        self.trace = deque(maxlen=trace_capacity)  # (frame, name, start_s, duration_ns)
+        self.frames = 0
+        self.origin = time.perf_counter()
+        self.overlay_surface = None
+        self.overlay_frame = None
+
+    def phase(self, name):
+        if not self.enabled:
+            return NULL_PHASE
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = Phase(self, name)
+        return phase
+
+    def next_frame(self):
+        """Mark a frame boundary; overlay toggles take effect here"""
+        if self.pending is not None:
+            self.overlay_visible = self.pending
+            self.pending = None
+            self.overlay_frame = None
+            if self.overlay_visible:
+                self.enabled = True  # The overlay needs timings; hiding it keeps profiling on
+        if self.enabled:
+            self.frames += 1
+
+    def toggle_overlay(self):
+        """Show or hide the overlay from the next frame, leaving profiling as it is"""
+        visible = self.overlay_visible if self.pending is None else self.pending
+        self.pending = not visible
+
+    def reset(self):
+        self.phases.clear()
+        self.trace.clear()
+        self.frames = 0
+        self.overlay_frame = None
+
+    def summary(self):
+        """{phase: {count, mean_ms, p50_ms, p99_ms, max_ms}} for every timed phase"""
+        return {name: {
+            'count': phase.histogram.count,
+            'mean_ms': phase.histogram.mean_ms(),
+            'p50_ms': phase.histogram.percentile_ms(0.50),
+            'p99_ms': phase.histogram.percentile_ms(0.99),
+            'max_ms': phase.histogram.max_ns / 1e6,
+        } for name, phase in self.phases.items()}
+
+    def draw_overlay(self, screen, font, position=None):
+        """Blit the statistics panel and return its rectangle"""
+        if self.overlay_frame is None or self.frames - self.overlay_frame >= OVERLAY_REFRESH:
+            self.overlay_surface = self.render_overlay(font)
+            self.overlay_frame = self.frames
+        if position is None:
+            position = (screen.get_width() - self.overlay_surface.get_width() - 10,
+                        screen.get_height() - self.overlay_surface.get_height() - 10)
+        return screen.blit(self.overlay_surface, position)
+
+    def render_overlay(self, font):
+        lines = [f"{'phase':<30}{'mean':>7}{'p50':>7}{'p99':>7}{'max':>7}  ms"]
+        for name, stats in self.summary().items():
+            # Indent sub-phases under their parent
+            label = '  ' * self.phases[name].depth + name
+            lines.append(f"{label:<30}{stats['mean_ms']:>7.2f}{stats['p50_ms']:>7.2f}"
+                         f"{stats['p99_ms']:>7.2f}{stats['max_ms']:>7.2f}")
+        line_height = font.get_linesize()
+        width = max(font.size(line)[0] for line in lines) + 12
+        panel = pygame.Surface((width, line_height * len(lines) + 12))
+        panel.fill((0, 0, 0))
+        panel.set_alpha(200)
+        for i, line in enumerate(lines):
+            panel.blit(font.render(line, True, (255, 255, 255)), (6, 6 + i * line_height))
+        return panel
+
+    def export_chrome_trace(self, path):
+        """Write the trace as Chrome trace-event JSON"""
+        events = [{
+            'name': name,
+            'cat': 'frame',
+            'ph': 'X',
+            'ts': (start - self.origin) * 1e6,
+            'dur': duration / 1000,
+            'pid': 0,
+            'tid': 0,
+            'args': {'frame': frame},
+        } for frame, name, start, duration in self.trace]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def export_csv(self, path):
+        """Write the trace as one row per timed phase"""
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'phase', 'start_ms', 'duration_ms'])
+            for frame, name, start, duration in self.trace:
+                writer.writerow([frame, name, f"{(start - self.origin) * 1000:.4f}", f"{duration / 1e6:.4f}"])
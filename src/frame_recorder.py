@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Frame Recorder for Enhanced Retro Cricket
+Streams rendered frames to disk from a background writer thread, as raw
+video, a PNG sequence or, when ffmpeg is installed, an encoded video.
+
+Frames are copied straight out of the display surface's pixel buffer into
+a small pool of reused slots, so capturing allocates nothing per frame once
+the pool has grown to the writer's pace. When the writer falls behind and
+every slot is full, frames are dropped instead of stalling the game loop.
+
+Render a recorded innings to video:
+    python src/frame_recorder.py REPLAY --output highlights --format ffmpeg
+"""
+
+import os
+import sys
+import json
+import zlib
+import queue
+import struct
+import shutil
+import threading
+import subprocess
+
+# ffmpeg pixel format for 32/24-bit surfaces by red and alpha masks (little-endian)
+PIXEL_FORMATS = {
+    (4, 0xff0000, 0): 'bgr0',
+    (4, 0xff0000, 0xff000000): 'bgra',
+    (4, 0xff, 0): 'rgb0',
+    (4, 0xff, 0xff000000): 'rgba',
+    (3, 0xff0000, 0): 'bgr24',
+    (3, 0xff, 0): 'rgb24',
+}
+
+# Bytes per pixel and red, green, blue byte offsets for each pixel format
+CHANNEL_OFFSETS = {
+    'bgr0': (4, 2, 1, 0), 'bgra': (4, 2, 1, 0),
+    'rgb0': (4, 0, 1, 2), 'rgba': (4, 0, 1, 2),
+    'bgr24': (3, 2, 1, 0), 'rgb24': (3, 0, 1, 2),
+}
+
+RECORD_FORMATS = ('raw', 'png', 'ffmpeg')
+
+# Most frames waiting for the writer at once; slots are allocated as the
+# backlog first needs them, a few MB each, instead of all up front
+MAX_SLOTS = 16
+
+def pixel_format(surface):
+    """ffmpeg pixel format name describing a surface's memory layout"""
+    red, _, _, alpha = surface.get_masks()
+    key = (surface.get_bytesize(), red, alpha)
+    if key not in PIXEL_FORMATS or sys.byteorder != 'little':
+        raise ValueError(f"unsupported surface layout for recording: {key}")
+    return PIXEL_FORMATS[key]
+
+def png_chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+def encode_png(pixels, size, pitch, pix_fmt):
+    """Encode raw surface pixels as an 8-bit RGB PNG.
+    
+    Pure Python and zlib, which releases the GIL while compressing, so the
+    writer thread never calls into pygame while the game is drawing.
+    """
+    width, height = size
+    step, red, green, blue = CHANNEL_OFFSETS[pix_fmt]
+    rows = bytearray((width * 3 + 1) * height)  # Each row starts with filter type 0
+    for y in range(height):
+        source = memoryview(pixels)[y * pitch:y * pitch + width * step]
+        start = y * (width * 3 + 1) + 1
+        end = start + width * 3
+        rows[start:end:3] = source[red::step]
+        rows[start + 1:end:3] = source[green::step]
+        rows[start + 2:end:3] = source[blue::step]
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + png_chunk(b'IHDR', header) +
+            png_chunk(b'IDAT', zlib.compress(bytes(rows), 6)) + png_chunk(b'IEND', b''))
+
+class FrameRecorder:
+    """Bounded-queue frame capture drained by a writer thread.
+
+    output is a directory; 'raw' writes frames.raw plus a frames.json
+    description, 'png' writes frame_000000.png onwards and 'ffmpeg' pipes
+    frames to an ffmpeg process encoding video.mp4.
+    """
+    def __init__(self, output, size, layout, fmt='raw', fps=60, slots=MAX_SLOTS):
+        if fmt not in RECORD_FORMATS:
+            raise ValueError(f"unknown record format: {fmt}")
+        if fmt == 'ffmpeg' and not shutil.which('ffmpeg'):
+            raise RuntimeError("ffmpeg not found on PATH")
+        self.output = output
+        self.size = size
+        self.pitch, self.pix_fmt = layout
+        self.format = fmt
+        self.fps = fps
+        self.frame_bytes = self.pitch * size[1]
+        self.max_slots = slots
+        self.slots = []
+        self.slot_views = []
+        self.free = queue.SimpleQueue()
+        self.filled = queue.SimpleQueue()
+        self.frames = 0
+        self.dropped = 0
+        self.written = 0
+        self.error = None
+        self.thread = None
+
+    @classmethod
+    def for_surface(cls, output, surface, **options):
+        """Recorder matching a surface's size and pixel layout"""
+        return cls(output, surface.get_size(), (surface.get_pitch(), pixel_format(surface)), **options)
+
+    def start(self):
+        os.makedirs(self.output, exist_ok=True)
+        self.thread = threading.Thread(target=self.write_frames, name='frame-writer', daemon=True)
+        self.thread.start()
+        return self
+
+    def capture(self, surface, block=False):
+        """Queue a copy of the surface's pixels; returns False if the frame was dropped.
+
+        The game loop never blocks: with every slot waiting for the writer the
+        frame is dropped. Offline rendering can pass block=True to wait instead.
+        """
+        slot = self.free_slot(block)
+        if slot is None:
+            self.dropped += 1
+            return False
+        # One copy from the surface's own pixel memory into a reused slot
+        view = surface.get_view('0')
+        try:
+            self.slot_views[slot][:] = memoryview(view)
+        finally:
+            del view  # Unlock the surface
+        self.filled.put(slot)
+        self.frames += 1
+        return True
+
+    def free_slot(self, block):
+        """Index of a slot to capture into, growing the pool while below max_slots"""
+        try:
+            return self.free.get_nowait()
+        except queue.Empty:
+            pass
+        if len(self.slots) < self.max_slots:
+            slot = bytearray(self.frame_bytes)
+            self.slots.append(slot)
+            self.slot_views.append(memoryview(slot))
+            return len(self.slots) - 1
+        return self.free.get() if block else None
+
+    def write_frames(self):
+        """Writer thread: drain filled slots to the output until told to stop"""
+        sink = None
+        try:
+            sink = self.open_sink()
+        except OSError as e:
+            self.error = e
+        index = 0
+        while True:
+            slot = self.filled.get()
+            if slot is None:
+                break
+            if self.error is None:
+                try:
+                    self.write_frame(sink, index, self.slots[slot])
+                    self.written += 1
+                except OSError as e:
+                    self.error = e  # Keep draining so capture never blocks
+            index += 1
+            self.free.put(slot)
+        if sink is not None:
+            self.close_sink(sink)
+
+    def open_sink(self):
+        if self.format == 'raw':
+            return open(os.path.join(self.output, 'frames.raw'), 'wb')
+        if self.format == 'ffmpeg':
+            width, height = self.size
+            bytes_per_pixel = 3 if self.pix_fmt.endswith('24') else 4
+            command = ['ffmpeg', '-loglevel', 'error', '-y',
+                       '-f', 'rawvideo', '-pix_fmt', self.pix_fmt,
+                       '-s', f'{self.pitch // bytes_per_pixel}x{height}', '-r', str(self.fps),
+                       '-i', '-', '-vf', f'crop={width}:{height}:0:0',
+                       '-pix_fmt', 'yuv420p', os.path.join(self.output, 'video.mp4')]
+            return subprocess.Popen(command, stdin=subprocess.PIPE)
+        return None
+
+    def write_frame(self, sink, index, pixels):
+        if self.format == 'raw':
+            sink.write(pixels)
+        elif self.format == 'ffmpeg':
+            sink.stdin.write(pixels)
+        else:
+            with open(os.path.join(self.output, f'frame_{index:06d}.png'), 'wb') as f:
+                f.write(encode_png(pixels, self.size, self.pitch, self.pix_fmt))
+
+    def close_sink(self, sink):
+        if self.format == 'raw':
+            sink.close()
+        elif self.format == 'ffmpeg':
+            sink.stdin.close()
+            sink.wait()
+
+    def stop(self):
+        """Flush queued frames, close the output and return recording statistics"""
+        if self.thread:
+            self.filled.put(None)
+            self.thread.join()
+            self.thread = None
+        stats = {
+            'format': self.format,
+            'width': self.size[0],
+            'height': self.size[1],
+            'pitch': self.pitch,
+            'pix_fmt': self.pix_fmt,
+            'fps': self.fps,
+            'frames': self.written,
+            'dropped': self.dropped,
+        }
+        if self.format == 'raw':
+            with open(os.path.join(self.output, 'frames.json'), 'w') as f:
+                json.dump(stats, f, indent=2)
+        if self.error:
+            print(f"Frame recording failed: {self.error}")
+        return stats
+
+def render_replay(replay, output, fmt='raw', start=0, end=None):
+    """Render ticks [start, end) of a replay headless into a recording"""
+    from enhanced_cricket import EnhancedCricket
+    game = EnhancedCricket(persistent=False, sound=False)
+    game.show_menu = False
+    game.difficulty = replay.difficulty
+    game.restart_game(replay.seed)
+    game.replay = None  # Don't re-record the innings being rendered
+
+    recorder = FrameRecorder.for_surface(output, game.screen, fmt=fmt).start()
+    for tick, action in enumerate(replay.actions()):
+        if end is not None and tick >= end:
+            break
+        game.step(action)
+        if tick >= start:
+            game.draw()
+            recorder.capture(game.screen, block=True)
+    return recorder.stop()
+
+def main(argv=None):
+    import argparse
+    from replay import load_replay
+    parser = argparse.ArgumentParser(description="Render a recorded innings to video frames")
+    parser.add_argument('replay', help='replay file to render')
+    parser.add_argument('--output', default='recording', help='output directory (default: recording)')
+    parser.add_argument('--format', choices=RECORD_FORMATS, default='raw',
+                        help='raw frames, PNG sequence or ffmpeg-encoded MP4 (default: raw)')
+    parser.add_argument('--start', type=int, default=0, help='first tick to render')
+    parser.add_argument('--end', type=int, default=None, help='stop before this tick')
+    args = parser.parse_args(argv)
+
+    stats = render_replay(load_replay(args.replay), args.output, args.format, args.start, args.end)
+    print(f"{stats['frames']} frames written to {args.output}/")
+    return 0
+
+if __name__ == "__main__":
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    sys.exit(main())
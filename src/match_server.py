@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Head-to-Head Match Server for Enhanced Retro Cricket
+An asyncio server running authoritative two-player matches: one player
+bats, the other steers the bowler, picking the line and variation of each
+delivery.
+
+Clients send a one-byte input code whenever their controls change; every
+tick the server steps each match with the latest inputs and sends both
+players a snapshot (see net_protocol) of only the blocks that changed. One
+tick loop serves every match, so a single process hosts hundreds.
+
+Usage:
+    python src/match_server.py serve [--host 0.0.0.0] [--port 5050]
+    python src/match_server.py play --role bat|bowl [--host HOST] [--match ID]
+    python src/match_server.py loadtest [--matches 200] [--seconds 10]
+"""
+
+import sys
+import time
+import struct
+import asyncio
+from collections import deque
+from enhanced_cricket import (MatchSimulator, Ball, Batsman, TICK_MS, SCREEN_WIDTH, SCREEN_HEIGHT,
+                              DIFFICULTY_LEVELS)
+from controllers import Observation, TrackerController
+from replay import encode_action, decode_action, LEFT, RIGHT
+from net_protocol import (BALL, BATSMAN, POSITION_SCALE, POWER_UPS, STANCES,
+                          capture, encode_snapshot, decode_snapshot, read_snapshot)
+
+DEFAULT_PORT = 5050
+BATTER, BOWLER = 0, 1
+ROLES = ('bat', 'bowl')
+
+# Client messages: join a match in a role, then input codes
+JOIN = struct.Struct('<cIB')  # b'J', match id, role
+INPUT = struct.Struct('<cB')  # b'I', input code
+# Server replies to a join: b'A' accepted or b'R' rejected, with the role
+REPLY = struct.Struct('<cB')
+
+# Bowling input code: LEFT/RIGHT bits as in batting codes, variation in bits 2-3
+VARIATIONS = (None, 'fast', 'slow', 'curve')  # None: the usual random power-up chance
+BOWLER_SPEED = 3  # px per tick
+BOWLER_RANGE = 60  # px either side of the bowler's mark
+
+# A player whose socket has this much unsent data is dropped as too slow
+MAX_SEND_BUFFER = 64 * 1024
+
+# Ticks of backlog the tick loop catches up before giving up on real time
+MAX_CATCH_UP = 15
+
+# The batsman as placed at the crease; only x travels in snapshots
+BAT = Batsman(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 160)
+
+# Every batting code decoded once
+ACTIONS = [decode_action(code) for code in range(16)]
+
+def bowling_code(move, variation=0):
+    return (LEFT if move < 0 else 0) | (RIGHT if move > 0 else 0) | (variation & 3) << 2
+
+class BowledBall(Ball):
+    """A ball bowled down the line the bowler stands on, with the bowler's chosen variation"""
+    def __init__(self, rng, bowler):
+        self.bowler = bowler
+        self.mark = bowler.x
+        self.variation = 0
+        super().__init__(rng)
+
+    def reset_position(self):
+        super().reset_position()
+        self.x += self.bowler.x - self.mark
+        self.previous_x = self.x
+        if self.variation:
+            self.power_up = VARIATIONS[self.variation]
+
+class HeadToHeadMatch(MatchSimulator):
+    """An innings with the bowler under a second player's control"""
+    def __init__(self, difficulty='Medium', seed=None):
+        super().__init__(difficulty, seed)
+        self.ball = BowledBall(self.rng, self.bowler)
+
+    def step(self, action=(0, False, False), bowling=0):
+        """Advance one tick with the batting action and bowling input code"""
+        move = (1 if bowling & RIGHT else 0) - (1 if bowling & LEFT else 0)
+        mark = self.ball.mark
+        self.bowler.x = max(mark - BOWLER_RANGE, min(mark + BOWLER_RANGE, self.bowler.x + move * BOWLER_SPEED))
+        self.ball.variation = bowling >> 2 & 3
+        super().step(action)
+
+class Match:
+    """One match's simulation, players and last sent state"""
+    def __init__(self, match_id, difficulty, seed=None):
+        self.id = match_id
+        self.sim = HeadToHeadMatch(difficulty, seed)
+        self.sim.restart_game()
+        self.players = {}  # role -> StreamWriter
+        self.inputs = [0, 0]  # Latest input code per role
+        self.previous = None  # State in the last snapshot sent
+        self.tick = 0
+        self.snapshot_bytes = 0
+
+    def ready(self):
+        return len(self.players) == len(ROLES)
+
+class MatchServer:
+    """Hosts matches for clients joining by match id, ticking them all on one loop"""
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, difficulty='Medium'):
+        self.host = host
+        self.port = port
+        self.difficulty = difficulty
+        self.matches = {}
+        self.tick_times = deque(maxlen=600)  # Seconds spent per server tick
+        self.server = None
+        self.ticker = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]  # The real port when given 0
+        self.ticker = asyncio.create_task(self.run_ticks())
+        return self
+
+    async def stop(self):
+        self.ticker.cancel()
+        for match in list(self.matches.values()):
+            self.end_match(match)
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle_client(self, reader, writer):
+        match = role = None
+        try:
+            kind, match_id, role = JOIN.unpack(await reader.readexactly(JOIN.size))
+            match = self.matches.get(match_id)
+            if kind != b'J' or role >= len(ROLES) or (match and role in match.players):
+                writer.write(REPLY.pack(b'R', role))
+                return
+            if match is None:
+                match = self.matches[match_id] = Match(match_id, self.difficulty)
+            match.players[role] = writer
+            writer.write(REPLY.pack(b'A', role))
+            while True:
+                kind, code = INPUT.unpack(await reader.readexactly(INPUT.size))
+                if kind == b'I':
+                    match.inputs[role] = code
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if match and match.players.get(role) is writer:
+                self.end_match(match)  # A match can't go on without both players
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def end_match(self, match):
+        if self.matches.get(match.id) is match:
+            del self.matches[match.id]
+        for writer in match.players.values():
+            writer.close()  # Sends what is already queued, then closes
+        match.players = {}
+
+    async def run_ticks(self):
+        loop = asyncio.get_running_loop()
+        tick_seconds = TICK_MS / 1000
+        next_tick = loop.time()
+        while True:
+            start = time.perf_counter()
+            for match in list(self.matches.values()):
+                if match.ready():
+                    self.advance(match)
+            self.tick_times.append(time.perf_counter() - start)
+            next_tick += tick_seconds
+            delay = next_tick - loop.time()
+            if delay < -MAX_CATCH_UP * tick_seconds:
+                next_tick = loop.time()  # Overloaded: fall back instead of bursting
+            await asyncio.sleep(max(0.0, delay))
+
+    def advance(self, match):
+        """Step a match one tick and send both players the changes"""
+        sim = match.sim
+        sim.step(ACTIONS[match.inputs[BATTER] & 15], match.inputs[BOWLER])
+        match.tick += 1
+        state = capture(sim)
+        snapshot = encode_snapshot(match.tick, state, match.previous)
+        match.previous = state
+        match.snapshot_bytes += len(snapshot)
+        for writer in match.players.values():
+            if writer.transport.get_write_buffer_size() > MAX_SEND_BUFFER:
+                self.end_match(match)
+                return
+            writer.write(snapshot)
+        if sim.game_over:
+            self.end_match(match)
+
+    def stats(self):
+        times = sorted(self.tick_times)
+        return {
+            'matches': len(self.matches),
+            'tick_mean_ms': 1000 * sum(times) / len(times) if times else 0.0,
+            'tick_p99_ms': 1000 * times[int(len(times) * 0.99)] if times else 0.0,
+        }
+
+class MatchClient:
+    """A player's connection: sends input codes, keeps the latest match state"""
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+        self.state = None
+        self.tick = 0
+        self.last_input = None
+        self.bytes_received = 0
+
+    async def connect(self, host, port, match_id, role):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(JOIN.pack(b'J', match_id, role))
+        kind, _ = REPLY.unpack(await self.reader.readexactly(REPLY.size))
+        if kind != b'A':
+            await self.close()
+            raise ConnectionError(f"match {match_id} already has a player in the {ROLES[role]} role")
+        return self
+
+    def send(self, code):
+        """Send an input code if it differs from the last one sent"""
+        if code != self.last_input:
+            self.writer.write(INPUT.pack(b'I', code))
+            self.last_input = code
+
+    async def receive(self):
+        """Wait for the next snapshot and return the updated state; raises EOFError at match end"""
+        try:
+            data = await read_snapshot(self.reader)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            raise EOFError("match over")
+        self.bytes_received += len(data)
+        self.tick, _, self.state = decode_snapshot(data, self.state)
+        return self.state
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+def observation_from_states(state, previous, tick):
+    """Batting Observation from two consecutive decoded states"""
+    ball_x, ball_y, power_up = state[BALL]
+    last_x, last_y, _ = previous[BALL] if previous else state[BALL]
+    batsman_x, stance, _ = state[BATSMAN]
+    return Observation(tick, ball_x / POSITION_SCALE, ball_y / POSITION_SCALE,
+                       (ball_x - last_x) / POSITION_SCALE, (ball_y - last_y) / POSITION_SCALE,
+                       POWER_UPS[power_up] if power_up < len(POWER_UPS) else None,
+                       batsman_x / POSITION_SCALE + BAT.width // 2, BAT.y + BAT.height // 2,
+                       STANCES[stance] if stance < len(STANCES) else 'ready')
+
+async def bot_player(host, port, match_id, role, ticks=None):
+    """Play a match as a bot: the tracker bats, the bowler sways across the crease"""
+    client = await MatchClient().connect(host, port, match_id, role)
+    tracker = TrackerController()
+    previous = None
+    try:
+        while ticks is None or client.tick < ticks:
+            state = await client.receive()
+            if role == BATTER:
+                client.send(encode_action(tracker.act(observation_from_states(state, previous, client.tick))))
+            else:
+                client.send(bowling_code(1 if client.tick // 90 % 2 else -1, client.tick // 600 % 4))
+            previous = list(state)
+    except EOFError:
+        pass
+    finally:
+        await client.close()
+    return client
+
+async def load_test(matches=200, seconds=10.0, difficulty='Medium'):
+    """Serve bot matches over loopback and report the server's tick cost"""
+    server = await MatchServer('127.0.0.1', 0, difficulty).start()
+    players = [asyncio.create_task(bot_player('127.0.0.1', server.port, match_id, role))
+               for match_id in range(matches) for role in (BATTER, BOWLER)]
+    await asyncio.sleep(seconds)
+    stats = server.stats()
+    match_list = list(server.matches.values())
+    ticks = sum(match.tick for match in match_list)
+    stats['bytes_per_snapshot'] = sum(match.snapshot_bytes for match in match_list) / ticks if ticks else 0.0
+    await server.stop()
+    await asyncio.gather(*players, return_exceptions=True)
+    return stats
+
+async def play(host, port, match_id, role):
+    """Play a match in a window: batting or bowling with the keyboard"""
+    import pygame
+    from controllers import keyboard_action
+    from net_protocol import restore
+    from enhanced_cricket import EnhancedCricket
+    game = EnhancedCricket(persistent=False, sound=False)
+    game.show_menu = False
+    client = await MatchClient().connect(host, port, match_id, role)
+    pygame.display.set_caption(f"Enhanced Retro Cricket - match {match_id}, "
+                               + ('batting' if role == BATTER else 'bowling'))
+
+    async def receive():
+        try:
+            while True:
+                await client.receive()
+        except EOFError:
+            pass
+    receiver = asyncio.create_task(receive())
+
+    variation = 0
+    try:
+        while not receiver.done():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    return
+                if event.type == pygame.KEYDOWN and pygame.K_1 <= event.key <= pygame.K_4:
+                    variation = event.key - pygame.K_1  # 1 stock ball, 2 fast, 3 slow, 4 curve
+            move, swing, defend = keyboard_action()
+            client.send(encode_action((move, swing, defend)) if role == BATTER else bowling_code(move, variation))
+            if client.state:
+                restore(game, client.state)
+                game.dirty_rects = None
+                game.draw()
+            await asyncio.sleep(TICK_MS / 1000)
+        # Hold the final score on screen
+        await asyncio.sleep(3)
+    finally:
+        receiver.cancel()
+        await client.close()
+        pygame.quit()
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Two-player head-to-head matches over the network")
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help='host matches')
+    serve.add_argument('--host', default='0.0.0.0')
+    serve.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve.add_argument('--difficulty', choices=list(DIFFICULTY_LEVELS), default='Medium')
+    join = commands.add_parser('play', help='join a match in a window')
+    join.add_argument('--host', default='127.0.0.1')
+    join.add_argument('--port', type=int, default=DEFAULT_PORT)
+    join.add_argument('--match', type=int, default=1, help='match id shared by both players (default: 1)')
+    join.add_argument('--role', choices=ROLES, required=True)
+    load = commands.add_parser('loadtest', help='time the server with bot matches over loopback')
+    load.add_argument('--matches', type=int, default=200)
+    load.add_argument('--seconds', type=float, default=10.0)
+    load.add_argument('--difficulty', choices=list(DIFFICULTY_LEVELS), default='Medium')
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        async def serve_forever():
+            server = await MatchServer(args.host, args.port, args.difficulty).start()
+            print(f"Serving matches on {args.host}:{server.port}")
+            await asyncio.Event().wait()
+        try:
+            asyncio.run(serve_forever())
+        except KeyboardInterrupt:
+            pass
+    elif args.command == 'play':
+        asyncio.run(play(args.host, args.port, args.match, ROLES.index(args.role)))
+    else:
+        stats = asyncio.run(load_test(args.matches, args.seconds, args.difficulty))
+        print(f"{args.matches} matches: server tick mean {stats['tick_mean_ms']:.2f} ms, "
+              f"p99 {stats['tick_p99_ms']:.2f} ms (budget {TICK_MS:.1f} ms), "
+              f"{stats['bytes_per_snapshot']:.1f} bytes per snapshot")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Balancing for Enhanced Retro Cricket
+Fans headless innings out over worker processes for every DIFFICULTY_LEVELS
+preset and a set of scripted batting policies, then aggregates score
+distributions, wicket rates and boundary/six frequencies.
+
+Every task gets its own RNG stream spawned from one master seed, so a run
+reproduces exactly whatever the worker count or scheduling order.
+"""
+
+import os
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from enhanced_cricket import DIFFICULTY_LEVELS
+from batch_simulator import BatchSimulator, BAT_Y, BATSMAN_WIDTH
+from controllers import MAX_TICKS, tracker_action
+
+# Scores above this share the last histogram bucket
+MAX_SCORE = 5000
+
+
+def idle_policy(sim):
+    """Stand still and let the bat take whatever comes"""
+    return 0, False, False
+
+
+def swing_policy(sim):
+    """Hold the power shot the whole innings"""
+    return 0, True, False
+
+
+def defend_policy(sim):
+    """Hold the defensive shot the whole innings"""
+    return 0, False, True
+
+
+def tracker_policy(sim):
+    """Line up with the ball once it is close and swing as it reaches the bat"""
+    return tracker_action(sim.x - (sim.batsman_x + BATSMAN_WIDTH // 2), BAT_Y - sim.y, sim.speed_y > 0)
+
+
+def random_policy(sim):
+    """Mash keys at random"""
+    lanes = len(sim.x)
+    return sim.rng.integers(-1, 2, lanes), sim.rng.random(lanes) < 0.1, sim.rng.random(lanes) < 0.1
+
+
+POLICIES = {
+    'idle': idle_policy,
+    'swing': swing_policy,
+    'defend': defend_policy,
+    'tracker': tracker_policy,
+    'random': random_policy,
+}
+
+
+def simulate_chunk(difficulty, policy_name, innings, seed, max_ticks=MAX_TICKS):
+    """Worker task: play a chunk of innings and return summable totals"""
+    sim = BatchSimulator(innings, difficulty, seed)
+    results = sim.run(POLICIES[policy_name], max_ticks)
+    return {
+        'innings': innings,
+        'score_histogram': np.bincount(np.minimum(results['score'], MAX_SCORE),
+                                       minlength=MAX_SCORE + 1),
+        'score_total': int(results['score'].sum()),
+        'deliveries': int(results['deliveries'].sum()),
+        'wickets': int((3 - results['outs']).sum()),
+        'boundaries': int(results['boundaries'].sum()),
+        'sixes': int(results['sixes'].sum()),
+        'hits': int(results['hits'].sum()),
+        'ticks': int(results['ticks'].sum()),
+        'capped': int(np.count_nonzero(results['outs'] > 0)),
+    }
+
+
+def merge(totals, chunk):
+    """Add one chunk's totals into the running totals"""
+    if not totals:
+        return dict(chunk)
+    for key, value in chunk.items():
+        totals[key] = totals[key] + value
+    return totals
+
+
+def percentile(histogram, q):
+    """Score at quantile q of a score histogram"""
+    cumulative = np.cumsum(histogram)
+    return int(np.searchsorted(cumulative, q * cumulative[-1]))
+
+
+def summarize(totals):
+    """Turn merged totals into the reported statistics"""
+    histogram = totals['score_histogram']
+    deliveries = max(totals['deliveries'], 1)
+    return {
+        'innings': totals['innings'],
+        'deliveries': totals['deliveries'],
+        'mean_score': totals['score_total'] / totals['innings'],
+        'p10_score': percentile(histogram, 0.10),
+        'median_score': percentile(histogram, 0.50),
+        'p90_score': percentile(histogram, 0.90),
+        'p99_score': percentile(histogram, 0.99),
+        'wicket_rate': totals['wickets'] / deliveries,
+        'boundary_rate': totals['boundaries'] / deliveries,
+        'six_rate': totals['sixes'] / deliveries,
+        'hit_rate': totals['hits'] / deliveries,
+        'mean_ticks': totals['ticks'] / totals['innings'],
+        'capped_share': totals['capped'] / totals['innings'],
+    }
+
+
+def run_tasks(simulate, tasks, workers=None):
+    """Run simulate(*args) for every (key, args) task over worker processes;
+    returns the merged totals of each key"""
+    totals = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(simulate, *args) for _, args in tasks]
+        for (key, _), future in zip(tasks, futures):
+            totals[key] = merge(totals.get(key), future.result())
+    return totals
+
+
+def run_balance(innings=20000, difficulties=None, policies=None, seed=0,
+                workers=None, chunk_size=5000, max_ticks=MAX_TICKS):
+    """Simulate every (difficulty, policy) pair and return summaries by pair"""
+    difficulties = difficulties or list(DIFFICULTY_LEVELS)
+    policies = policies or list(POLICIES)
+
+    # One task per chunk, each with its own child seed in a fixed order
+    chunks = []
+    for difficulty in difficulties:
+        for policy_name in policies:
+            remaining = innings
+            while remaining > 0:
+                size = min(chunk_size, remaining)
+                chunks.append((difficulty, policy_name, size))
+                remaining -= size
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    tasks = [((difficulty, policy_name), (difficulty, policy_name, size, child, max_ticks))
+             for (difficulty, policy_name, size), child in zip(chunks, seeds)]
+
+    totals = run_tasks(simulate_chunk, tasks, workers)
+    return {key: summarize(value) for key, value in totals.items()}
+
+
+def print_report(summaries):
+    """Print one table row per (difficulty, policy) pair"""
+    header = (f"{'Difficulty':<10} {'Policy':<8} {'Innings':>9} {'Mean':>7} {'P10':>5} "
+              f"{'P50':>5} {'P90':>5} {'P99':>5} {'Wkt/ball':>9} {'4s/ball':>8} {'6s/ball':>8} {'Capped':>7}")
+    print(header)
+    print("-" * len(header))
+    for (difficulty, policy_name), stats in summaries.items():
+        print(f"{difficulty:<10} {policy_name:<8} {stats['innings']:>9} {stats['mean_score']:>7.2f} "
+              f"{stats['p10_score']:>5} {stats['median_score']:>5} {stats['p90_score']:>5} "
+              f"{stats['p99_score']:>5} {stats['wicket_rate']:>9.4f} "
+              f"{stats['boundary_rate']:>8.4f} {stats['six_rate']:>8.4f} {stats['capped_share']:>7.2%}")
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Monte Carlo balancing across difficulty presets")
+    parser.add_argument('--innings', type=int, default=20000,
+                        help='innings per difficulty and policy (default: 20000)')
+    parser.add_argument('--difficulty', action='append', choices=list(DIFFICULTY_LEVELS),
+                        help='difficulty to simulate; repeat for several (default: all)')
+    parser.add_argument('--policy', action='append', choices=list(POLICIES),
+                        help='batting policy to simulate; repeat for several (default: all)')
+    parser.add_argument('--seed', type=int, default=0, help='master seed (default: 0)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f'worker processes (default: {os.cpu_count()})')
+    parser.add_argument('--chunk-size', type=int, default=5000,
+                        help='innings per worker task (default: 5000)')
+    parser.add_argument('--max-ticks', type=int, default=MAX_TICKS,
+                        help=f'cut innings off after this many ticks (default: {MAX_TICKS})')
+    parser.add_argument('--json', metavar='PATH', help='also write the summaries as JSON')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    summaries = run_balance(args.innings, args.difficulty, args.policy, args.seed,
+                            args.workers, args.chunk_size, args.max_ticks)
+    elapsed = time.perf_counter() - start
+
+    print_report(summaries)
+    total = sum(stats['innings'] for stats in summaries.values())
+    print(f"\n{total} innings in {elapsed:.1f}s (seed {args.seed})")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'seed': args.seed, 'difficulty_levels': DIFFICULTY_LEVELS,
+                       'results': [dict(difficulty=d, policy=p, **stats)
+                                   for (d, p), stats in summaries.items()]}, f, indent=2)
+        print(f"Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
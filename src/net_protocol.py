@@ -0,0 +1,135 @@
+"""
+Network Snapshots for Enhanced Retro Cricket
+Compact binary match state for networked play.
+
+The state of a tick is a fixed set of blocks (ball, batsman, bowler, each
+fielder, score, celebration). A snapshot is a small header whose block
+mask says which blocks follow, so a delta carries only the blocks that
+changed since the previous snapshot and a keyframe carries all of them.
+Block sizes are fixed, so the mask alone gives a snapshot's length.
+"""
+
+import struct
+
+FIELDERS = 8
+
+# Positions travel as int16 quarter pixels
+POSITION_SCALE = 4
+
+BLOCKS = (
+    ('ball', struct.Struct('<hhB')),  # x, y, power-up
+    ('batsman', struct.Struct('<hBB')),  # x, stance, swing timer
+    ('bowler', struct.Struct('<hBB')),  # x, bowling, bowl timer
+) + tuple((f'fielder{i}', struct.Struct('<hhB')) for i in range(FIELDERS)) + (  # x, y, chasing
+    ('score', struct.Struct('<IBHHBB')),  # score, outs, boundaries, sixes, combo, game over
+    ('celebration', struct.Struct('<BH')),  # type, frames left
+)
+BALL, BATSMAN, BOWLER, FIELDER, SCORE, CELEBRATION = 0, 1, 2, 3, 3 + FIELDERS, 4 + FIELDERS
+
+# A ball moving further than this (px) between snapshots was reset for a new delivery
+RESET_JUMP = 50
+
+SNAPSHOT_MAGIC = b'S'
+SNAPSHOT_HEADER = struct.Struct('<cIH')  # magic, tick, block mask
+KEYFRAME = 0x8000  # Mask bit: every block follows
+ALL_BLOCKS = (1 << len(BLOCKS)) - 1
+
+# Codes for the categorical fields
+POWER_UPS = (None, 'fast', 'slow', 'curve')
+STANCES = ('ready', 'swing', 'defensive')
+CELEBRATIONS = (None, 'boundary', 'six', 'fifty', 'century', 'one_fifty')
+
+def position(value):
+    p = round(value * POSITION_SCALE)
+    return p if -32768 <= p <= 32767 else max(-32768, min(32767, p))
+
+def code(values, value):
+    return values.index(value) if value in values else 0
+
+def capture(sim):
+    """The blocks of a MatchSimulator's current tick, as tuples"""
+    ball, batsman, bowler = sim.ball, sim.batsman, sim.bowler
+    state = [
+        (position(ball.x), position(ball.y), code(POWER_UPS, ball.power_up)),
+        (position(batsman.x), code(STANCES, batsman.stance), batsman.swing_timer),
+        (position(bowler.x), int(bowler.bowling_action), min(bowler.bowl_timer, 255)),
+    ]
+    for fielder in sim.fielders:
+        state.append((position(fielder.x), position(fielder.y), int(fielder.is_chasing)))
+    state.append((sim.score, max(sim.outs, 0), sim.boundaries, sim.sixes, sim.combo_multiplier, int(sim.game_over)))
+    state.append((code(CELEBRATIONS, sim.celebration_type), sim.celebration_timer))
+    return state
+
+def payload_size(mask):
+    """Bytes of block data following a header with this mask"""
+    if mask & KEYFRAME:
+        mask = ALL_BLOCKS
+    return sum(block.size for i, (_, block) in enumerate(BLOCKS) if mask & (1 << i))
+
+def encode_snapshot(tick, state, previous=None):
+    """Snapshot of state: the blocks changed since previous, or a keyframe without one"""
+    if previous is None:
+        mask = KEYFRAME
+        changed = range(len(BLOCKS))
+    else:
+        changed = [i for i, values in enumerate(state) if values != previous[i]]
+        mask = 0
+        for i in changed:
+            mask |= 1 << i
+    parts = [SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, tick, mask)]
+    parts.extend(BLOCKS[i][1].pack(*state[i]) for i in changed)
+    return b''.join(parts)
+
+def decode_snapshot(data, state=None):
+    """Apply a snapshot to state (a list of block tuples) and return (tick, keyframe, state).
+
+    A keyframe needs no prior state; a delta updates the state it follows.
+    """
+    magic, tick, mask = SNAPSHOT_HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("not a snapshot")
+    keyframe = bool(mask & KEYFRAME)
+    if keyframe:
+        mask = ALL_BLOCKS
+        state = [None] * len(BLOCKS)
+    elif state is None:
+        raise ValueError("delta snapshot without a keyframe")
+    offset = SNAPSHOT_HEADER.size
+    for i, (_, block) in enumerate(BLOCKS):
+        if mask & (1 << i):
+            state[i] = block.unpack_from(data, offset)
+            offset += block.size
+    return tick, keyframe, state
+
+async def read_snapshot(reader):
+    """Read one snapshot's bytes from an asyncio StreamReader"""
+    header = await reader.readexactly(SNAPSHOT_HEADER.size)
+    _, _, mask = SNAPSHOT_HEADER.unpack(header)
+    return header + await reader.readexactly(payload_size(mask))
+
+def restore(game, state):
+    """Pose a game's objects as in a decoded state, ready to draw"""
+    from enhanced_cricket import POWER_UP_COLORS, RED
+    (ball_x, ball_y, power_up), (batsman_x, stance, swing_timer), (bowler_x, bowling, bowl_timer) = state[:3]
+    ball = game.ball
+    x, y = ball_x / POSITION_SCALE, ball_y / POSITION_SCALE
+    if abs(x - ball.x) + abs(y - ball.y) > RESET_JUMP:
+        ball.trail.clear()  # A new delivery, not motion
+    ball.x, ball.y = x, y
+    ball.power_up = POWER_UPS[power_up] if power_up < len(POWER_UPS) else None
+    ball.color = POWER_UP_COLORS.get(ball.power_up, RED)
+    ball.trail.append((int(ball.x), int(ball.y)))
+    game.batsman.x = batsman_x / POSITION_SCALE
+    game.batsman.stance = STANCES[stance] if stance < len(STANCES) else 'ready'
+    game.batsman.swing_timer = swing_timer
+    game.bowler.x = bowler_x / POSITION_SCALE
+    game.bowler.bowling_action = bool(bowling)
+    game.bowler.bowl_timer = bowl_timer
+    for fielder, (x, y, chasing) in zip(game.fielders, state[FIELDER:FIELDER + FIELDERS]):
+        fielder.x, fielder.y = x / POSITION_SCALE, y / POSITION_SCALE
+        fielder.is_chasing = bool(chasing)
+    (game.score, game.outs, game.boundaries, game.sixes,
+     game.combo_multiplier, game_over) = state[SCORE]
+    game.game_over = bool(game_over)
+    celebration, game.celebration_timer = state[CELEBRATION]
+    game.celebration_type = CELEBRATIONS[celebration] if celebration < len(CELEBRATIONS) else None
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Innings Replays for Enhanced Retro Cricket
+Records the batting action of every tick as a run-length-encoded stream and
+plays it back through the headless MatchSimulator.
+
+An innings is fully determined by its seed, difficulty and actions, so a
+replay of a few hundred bytes reproduces the exact score of a disputed
+high score, far faster than realtime.
+
+Usage:
+    python src/replay.py REPLAY [REPLAY ...]
+"""
+
+import os
+import sys
+import time
+import struct
+
+# Replay file layout: header, then one run per change of action
+REPLAY_MAGIC = b'CRRP'
+REPLAY_FORMAT = 2  # Bumped when game physics change, as old replays no longer reproduce
+REPLAY_HEADER = struct.Struct('<4sH16sQIiIII')  # magic, format, difficulty, seed,
+                                               # ticks, score, outs, boundaries, sixes
+
+# Seconds of play per recorded tick
+TICK_SECONDS = 1 / 60
+
+# Action bits: each tick's (move, swing, defend) packs into one nibble
+LEFT, RIGHT, SWING, DEFEND = 1, 2, 4, 8
+
+def encode_action(action):
+    """Pack a (move, swing, defend) action into its 4-bit code"""
+    move, swing, defend = action
+    return ((LEFT if move < 0 else 0) | (RIGHT if move > 0 else 0) |
+            (SWING if swing else 0) | (DEFEND if defend else 0))
+
+def decode_action(code):
+    """Unpack a 4-bit code into a (move, swing, defend) action"""
+    move = (1 if code & RIGHT else 0) - (1 if code & LEFT else 0)
+    return (move, bool(code & SWING), bool(code & DEFEND))
+
+def encode_runs(runs):
+    """Serialize (code, length) runs.
+
+    The first byte of a run holds the code in its low nibble and the low 3
+    bits of length - 1 above it; longer runs continue in LEB128 bytes.
+    """
+    out = bytearray()
+    for code, length in runs:
+        rest = length - 1
+        first = code | (rest & 0x7) << 4
+        rest >>= 3
+        out.append(first | (0x80 if rest else 0))
+        while rest:
+            byte = rest & 0x7f
+            rest >>= 7
+            out.append(byte | (0x80 if rest else 0))
+    return bytes(out)
+
+def decode_runs(data):
+    """Parse (code, length) runs written by encode_runs"""
+    runs = []
+    i = 0
+    while i < len(data):
+        first = data[i]
+        i += 1
+        rest = (first >> 4) & 0x7
+        shift = 3
+        more = first & 0x80
+        while more:
+            if i >= len(data):
+                raise ValueError("truncated replay")
+            byte = data[i]
+            i += 1
+            rest |= (byte & 0x7f) << shift
+            shift += 7
+            more = byte & 0x80
+        runs.append((first & 0xf, rest + 1))
+    return runs
+
+class Replay:
+    """One innings: its seed, difficulty, per-tick actions and recorded result"""
+    def __init__(self, seed, difficulty='Medium'):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.runs = []  # [code, length] pairs
+        self.ticks = 0
+        self.results = None
+
+    def record(self, action):
+        """Append one tick's batting action"""
+        code = encode_action(action)
+        if self.runs and self.runs[-1][0] == code:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([code, 1])
+        self.ticks += 1
+
+    def actions(self):
+        """Yield the recorded actions tick by tick"""
+        for code, length in self.runs:
+            action = decode_action(code)
+            for _ in range(length):
+                yield action
+
+    def to_bytes(self):
+        results = self.results or {}
+        header = REPLAY_HEADER.pack(
+            REPLAY_MAGIC, REPLAY_FORMAT, self.difficulty.encode(), self.seed, self.ticks,
+            results.get('score', -1), results.get('outs', 0),
+            results.get('boundaries', 0), results.get('sixes', 0))
+        return header + encode_runs(self.runs)
+
+    @classmethod
+    def from_bytes(cls, data):
+        try:
+            (magic, version, difficulty, seed, ticks,
+             score, outs, boundaries, sixes) = REPLAY_HEADER.unpack_from(data, 0)
+        except struct.error:
+            raise ValueError("truncated replay")
+        if magic != REPLAY_MAGIC:
+            raise ValueError("not a replay file")
+        if version != REPLAY_FORMAT:
+            raise ValueError(f"replay format {version} is from another game version")
+
+        replay = cls(seed, difficulty.rstrip(b'\0').decode())
+        replay.runs = [list(run) for run in decode_runs(data[REPLAY_HEADER.size:])]
+        replay.ticks = sum(length for _, length in replay.runs)
+        if replay.ticks != ticks:
+            raise ValueError("replay tick count does not match its header")
+        if score >= 0:
+            replay.results = {'score': score, 'outs': outs, 'boundaries': boundaries,
+                              'sixes': sixes, 'ticks': ticks}
+        return replay
+
+def default_data_dir():
+    """Persistent game data location: $CRICKET_DATA_DIR, else the user data directory"""
+    data_dir = os.environ.get('CRICKET_DATA_DIR')
+    if not data_dir:
+        base = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+        data_dir = os.path.join(base, 'enhanced-retro-cricket')
+    return data_dir
+
+def default_replay_dir():
+    return os.path.join(default_data_dir(), 'replays')
+
+def save_replay(path, replay):
+    """Write a replay file, replacing any old one atomically"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(replay.to_bytes())
+    os.replace(temp_path, path)
+
+def load_replay(path):
+    with open(path, 'rb') as f:
+        return Replay.from_bytes(f.read())
+
+def play_replay(replay):
+    """Re-simulate a replay headless and return the innings results"""
+    from enhanced_cricket import MatchSimulator
+    sim = MatchSimulator(replay.difficulty)
+    sim.restart_game(replay.seed)
+    for action in replay.actions():
+        sim.step(action)
+    return sim.results()
+
+def verify_replay(replay):
+    """True when playback reproduces the result recorded with the replay"""
+    return replay.results is not None and play_replay(replay) == replay.results
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Play back recorded innings and check their scores")
+    parser.add_argument('replays', nargs='+', metavar='REPLAY', help='replay files to check')
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for path in args.replays:
+        replay = load_replay(path)
+        start = time.perf_counter()
+        results = play_replay(replay)
+        elapsed = time.perf_counter() - start
+        speedup = replay.ticks * TICK_SECONDS / max(elapsed, 1e-9)
+        if replay.results is None:
+            status = "no recorded result"
+        elif results == replay.results:
+            status = "OK"
+        else:
+            status = f"MISMATCH (recorded {replay.results['score']})"
+            failures += 1
+        print(f"{path}: {replay.difficulty}, seed {replay.seed}, {replay.ticks} ticks -> "
+              f"score {results['score']} [{status}] in {elapsed * 1000:.1f} ms ({speedup:.0f}x realtime)")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    sys.exit(main())
@@ -2,93 +2,159 @@
 """
 Screenshot Generator for Enhanced Retro Cricket Game
 This script captures various game states for documentation purposes.
+
+Each scenario is declared as data and rendered in its own fresh headless
+game, spread over worker processes. Screenshots are content-addressed: the
+SHA-256 of the raw pixels is kept in a manifest, and PNGs whose pixels did
+not change are left untouched.
 """
 
 import pygame
 import sys
 import os
-from enhanced_cricket import EnhancedCricket
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from enhanced_cricket import EnhancedCricket, DIFFICULTY_LEVELS, CELEBRATION_MESSAGES, IDLE_ACTION
 
-def capture_screenshots():
-    """Capture screenshots of different game states"""
+SCREENSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'screenshots')
+MANIFEST_NAME = 'manifest.json'
+
+# Raw pixel conversions, named tostring/fromstring before pygame 2.1.3
+if hasattr(pygame.image, 'tobytes'):
+    surface_to_bytes, surface_from_bytes = pygame.image.tobytes, pygame.image.frombytes
+else:
+    surface_to_bytes, surface_from_bytes = pygame.image.tostring, pygame.image.fromstring
+
+# The documentation screenshots. 'state' sets game attributes after a
+# seeded restart, 'celebration' triggers one, then 'ticks' idle ticks run.
+SCENARIOS = [
+    {
+        'name': 'main_menu',
+        'description': 'Main menu with navigation options',
+        'state': {'show_menu': True}
+    },
+    {
+        'name': 'gameplay',
+        'description': 'Active gameplay with batsman and ball',
+        'state': {}
+    },
+    {
+        'name': 'boundary_celebration',
+        'description': 'Boundary celebration animation',
+        'celebration': 'boundary'
+    },
+    {
+        'name': 'milestone_celebration',
+        'description': 'Milestone celebration (50 runs)',
+        'state': {'score': 50},
+        'celebration': 'fifty'
+    },
+    {
+        'name': 'game_over',
+        'description': 'Game over screen with final statistics',
+        'state': {'game_over': True, 'score': 75, 'boundaries': 8, 'sixes': 3}
+    }
+]
+
+# Score shown with each milestone celebration; other celebrations show MATRIX_SCORE
+MILESTONE_SCORES = {'fifty': 50, 'century': 100, 'one_fifty': 150}
+MATRIX_SCORE = 12
+
+def scenario_matrix():
+    """Every difficulty x celebration x power-up combination"""
+    scenarios = []
+    for difficulty in DIFFICULTY_LEVELS:
+        for celebration in CELEBRATION_MESSAGES:
+            for power_up in (None, 'fast', 'slow', 'curve'):
+                scenarios.append({
+                    'name': f"matrix/{difficulty.lower()}_{celebration}_{power_up or 'normal'}",
+                    'description': f"{celebration} celebration on {difficulty} with a {power_up or 'normal'} ball",
+                    'difficulty': difficulty,
+                    'state': {'score': MILESTONE_SCORES.get(celebration, MATRIX_SCORE)},
+                    'ball': {'power_up': power_up},
+                    'celebration': celebration
+                })
+    return scenarios
+
+def init_worker():
+    """Worker processes render without a window or audio device.
     
-    # Initialize the game
-    game = EnhancedCricket()
+    Only takes effect if pygame's display was not initialised before the
+    pool forked, so the parent never initialises it.
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+def render_scenario(scenario):
+    """Render one scenario in a fresh game; return (RGB pixels, size)"""
+    game = EnhancedCricket(persistent=False, sound=False)
+    game.difficulty = scenario.get('difficulty', 'Medium')
+    game.show_menu = False
+    game.restart_game(seed=scenario.get('seed', 0))
+    game.replay = None
     
-    # Create screenshots directory
-    screenshot_dir = "../screenshots"
-    os.makedirs(screenshot_dir, exist_ok=True)
+    for name, value in scenario.get('state', {}).items():
+        setattr(game, name, value)
+    for name, value in scenario.get('ball', {}).items():
+        setattr(game.ball, name, value)
+    if 'celebration' in scenario:
+        game.trigger_celebration(scenario['celebration'])
+    for _ in range(scenario.get('ticks', 1)):
+        game.step(IDLE_ACTION)
+    game.draw()
+    return surface_to_bytes(game.screen, 'RGB'), game.screen.get_size()
+
+def capture_scenario(scenario, screenshot_dir, known_digest=None):
+    """Worker task: render a scenario and write its PNG unless the pixels are unchanged"""
+    pixels, size = render_scenario(scenario)
+    digest = hashlib.sha256(pixels).hexdigest()
+    filename = os.path.join(screenshot_dir, f"{scenario['name']}.png")
+    if digest == known_digest and os.path.exists(filename):
+        return scenario['name'], digest, False
     
-    screenshots_to_capture = [
-        {
-            'name': 'main_menu',
-            'description': 'Main menu with navigation options',
-            'setup': lambda: setattr(game, 'show_menu', True)
-        },
-        {
-            'name': 'gameplay',
-            'description': 'Active gameplay with batsman and ball',
-            'setup': lambda: setattr(game, 'show_menu', False)
-        },
-        {
-            'name': 'boundary_celebration',
-            'description': 'Boundary celebration animation',
-            'setup': lambda: [
-                setattr(game, 'show_menu', False),
-                game.trigger_celebration('boundary')
-            ]
-        },
-        {
-            'name': 'milestone_celebration',
-            'description': 'Milestone celebration (50 runs)',
-            'setup': lambda: [
-                setattr(game, 'show_menu', False),
-                setattr(game, 'score', 50),
-                game.trigger_celebration('fifty')
-            ]
-        },
-        {
-            'name': 'game_over',
-            'description': 'Game over screen with final statistics',
-            'setup': lambda: [
-                setattr(game, 'show_menu', False),
-                setattr(game, 'game_over', True),
-                setattr(game, 'score', 75),
-                setattr(game, 'boundaries', 8),
-                setattr(game, 'sixes', 3)
-            ]
-        }
-    ]
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    pygame.image.save(surface_from_bytes(pixels, size, 'RGB'), filename)
+    return scenario['name'], digest, True
+
+def capture_screenshots(scenarios=None, screenshot_dir=SCREENSHOT_DIR, workers=None):
+    """Capture screenshots of different game states"""
+    scenarios = scenarios or SCENARIOS
+    os.makedirs(screenshot_dir, exist_ok=True)
+    manifest_path = os.path.join(screenshot_dir, MANIFEST_NAME)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
     
     print("🏏 Enhanced Retro Cricket - Screenshot Generator")
     print("=" * 50)
     
-    for i, screenshot in enumerate(screenshots_to_capture, 1):
-        print(f"\n📸 Capturing screenshot {i}/{len(screenshots_to_capture)}: {screenshot['name']}")
-        print(f"   Description: {screenshot['description']}")
-        
-        try:
-            # Setup the game state
-            screenshot['setup']()
-            
-            # Update and draw the game
-            game.update()
-            game.draw()
-            
-            # Save screenshot
-            filename = f"{screenshot_dir}/{screenshot['name']}.png"
-            pygame.image.save(game.screen, filename)
-            
-            print(f"   ✅ Saved: {filename}")
-            
-        except Exception as e:
-            print(f"   ❌ Error capturing {screenshot['name']}: {e}")
+    written = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        futures = [pool.submit(capture_scenario, scenario, screenshot_dir, manifest.get(scenario['name']))
+                   for scenario in scenarios]
+        for i, (scenario, future) in enumerate(zip(scenarios, futures), 1):
+            print(f"\n📸 Screenshot {i}/{len(scenarios)}: {scenario['name']}")
+            print(f"   Description: {scenario['description']}")
+            try:
+                name, digest, changed = future.result()
+            except Exception as e:
+                print(f"   ❌ Error capturing {scenario['name']}: {e}")
+                continue
+            manifest[name] = digest
+            if changed:
+                written += 1
+                print(f"   ✅ Saved: {name}.png")
+            else:
+                print(f"   ⏭️  Unchanged: {name}.png")
     
-    print(f"\n🎉 Screenshot generation complete!")
-    print(f"📁 Screenshots saved in: {screenshot_dir}/")
+    with open(manifest_path, 'w') as f:
+        json.dump(dict(sorted(manifest.items())), f, indent=2)
     
-    # Cleanup
-    pygame.quit()
+    print(f"\n🎉 Screenshot generation complete! {written} of {len(scenarios)} files written")
+    print(f"📁 Screenshots saved in: {screenshot_dir}/")
 
 def create_demo_descriptions():
     """Create descriptions for the demo screenshots"""
@@ -155,27 +221,32 @@ Game over screen displaying:
         """
     }
     
-    # Save descriptions
+    # Save descriptions, leaving unchanged files alone
     for filename, description in descriptions.items():
-        desc_file = f"../screenshots/{filename.replace('.png', '_description.md')}"
+        desc_file = os.path.join(SCREENSHOT_DIR, filename.replace('.png', '_description.md'))
+        try:
+            with open(desc_file) as f:
+                if f.read() == description.strip():
+                    continue
+        except OSError:
+            pass
         with open(desc_file, 'w') as f:
             f.write(description.strip())
     
     print("📝 Screenshot descriptions created!")
 
 if __name__ == "__main__":
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
     print("🏏 Enhanced Retro Cricket - Demo Screenshot Generator")
     print("=" * 55)
     print("\nThis script captures screenshots of various game states.")
     print("Make sure the game runs properly before generating screenshots.\n")
     
     try:
-        # Test if pygame and the game work
-        pygame.init()
-        print("✅ Pygame initialized successfully")
-        
-        # Generate screenshots
-        capture_screenshots()
+        # Generate screenshots, plus every difficulty/celebration/power-up with --matrix
+        scenarios = SCENARIOS + (scenario_matrix() if '--matrix' in sys.argv[1:] else [])
+        capture_screenshots(scenarios)
         
         # Create descriptions
         create_demo_descriptions()
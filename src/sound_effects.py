@@ -1,88 +1,207 @@
+import os
+import mmap
+import struct
+import hashlib
 import pygame
 import numpy as np
 
+SAMPLE_RATE = 22050
+
+# Bump when synthesis changes in a way SOUND_SPECS does not capture
+SYNTH_VERSION = 1
+
+# Synthesis parameters for every game sound: name -> (kind, parameters)
+SOUND_SPECS = {
+    # Hit sound - satisfying "thwack"
+    'hit': ('tone', {'frequency': 200, 'duration': 0.2}),
+    # Wicket sound - descending tone, 400Hz to 100Hz
+    'wicket': ('sweep', {'start_freq': 400, 'end_freq': 100, 'duration': 0.5,
+                         'harmonics': ((1, 0.5),)}),
+    # Boundary sound - ascending celebration, 300Hz to 500Hz with harmony
+    'boundary': ('sweep', {'start_freq': 300, 'end_freq': 500, 'duration': 0.8,
+                           'harmonics': ((1, 0.3), (1.5, 0.2))}),
+    # Power-up sound
+    'powerup': ('tone', {'frequency': 440, 'duration': 0.3}),
+    # Milestone celebration sound (longer, more elaborate)
+    'milestone': ('fanfare', {'base_freq': 440, 'duration': 1.5, 'harmonics': (1, 1.5, 2, 2.5),
+                              'modulation_freq': 5, 'modulation_depth': 0.3}),
+}
+
+# Sound bank file layout: header, one index entry per sound, then int16 PCM
+BANK_MAGIC = b'CRSB'
+BANK_FORMAT = 1
+BANK_HEADER = struct.Struct('<4sI32sI')  # magic, format, key digest, entry count
+BANK_ENTRY = struct.Struct('<16sQQ')  # sound name, byte offset, frames
+BANK_ALIGN = 64
+
+def default_bank_path():
+    """Sound bank location: $CRICKET_CACHE_DIR, else the user cache directory"""
+    cache_dir = os.environ.get('CRICKET_CACHE_DIR')
+    if not cache_dir:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        cache_dir = os.path.join(base, 'enhanced-retro-cricket')
+    return os.path.join(cache_dir, 'sound_bank.bin')
+
+def bank_key(specs, mixer_settings):
+    """Digest of everything that determines the synthesized PCM"""
+    description = repr((SYNTH_VERSION, SAMPLE_RATE, tuple(mixer_settings), sorted(specs.items())))
+    return hashlib.sha256(description.encode()).digest()
+
+def write_bank(path, key, pcm):
+    """Write int16 stereo buffers to a bank file, replacing any old one atomically"""
+    names = sorted(pcm)
+    offset = BANK_HEADER.size + BANK_ENTRY.size * len(names)
+    entries = []
+    for name in names:
+        offset = -(-offset // BANK_ALIGN) * BANK_ALIGN
+        entries.append((name, offset, len(pcm[name])))
+        offset += pcm[name].nbytes
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(BANK_HEADER.pack(BANK_MAGIC, BANK_FORMAT, key, len(names)))
+        for name, offset, frames in entries:
+            f.write(BANK_ENTRY.pack(name.encode(), offset, frames))
+        for name, offset, frames in entries:
+            f.seek(offset)
+            f.write(np.ascontiguousarray(pcm[name], dtype=np.int16).tobytes())
+    os.replace(temp_path, path)
+
+def open_bank(path, key):
+    """Map a bank file and return (mmap, {name: int16 view}), or None if missing or stale"""
+    try:
+        with open(path, 'rb') as f:
+            bank = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    
+    try:
+        magic, version, stored_key, count = BANK_HEADER.unpack_from(bank, 0)
+        if magic != BANK_MAGIC or version != BANK_FORMAT or stored_key != key:
+            raise ValueError("stale sound bank")
+        views = {}
+        for i in range(count):
+            name, offset, frames = BANK_ENTRY.unpack_from(bank, BANK_HEADER.size + i * BANK_ENTRY.size)
+            if offset + frames * 4 > len(bank):
+                raise ValueError("truncated sound bank")
+            views[name.rstrip(b'\0').decode()] = np.frombuffer(
+                bank, dtype=np.int16, count=frames * 2, offset=offset).reshape(frames, 2)
+        return bank, views
+    except (struct.error, ValueError, UnicodeDecodeError):
+        bank.close()
+        return None
+
 class SoundEffects:
-    def __init__(self):
-        pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+    def __init__(self, bank_path=None):
+        pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=2, buffer=512)
         self.sounds = {}
-        self.generate_sounds()
+        self.pcm = {}
+        self.bank = None
+        self.bank_path = bank_path or default_bank_path()
+        self.load_sounds()
     
-    def generate_tone(self, frequency, duration, sample_rate=22050):
-        """Generate a simple tone"""
-        frames = int(duration * sample_rate)
-        arr = np.zeros((frames, 2))
-        
-        for i in range(frames):
-            wave = np.sin(2 * np.pi * frequency * i / sample_rate)
-            arr[i] = [wave, wave]
+    def load_sounds(self):
+        """Map the cached sound bank, regenerating it when the key has changed"""
+        key = bank_key(SOUND_SPECS, pygame.mixer.get_init())
+        cached = open_bank(self.bank_path, key)
+        if cached:
+            self.bank, self.pcm = cached
+            return
         
-        # Fade in/out to avoid clicks
-        fade_frames = int(0.1 * sample_rate)
-        for i in range(fade_frames):
-            arr[i] *= i / fade_frames
-            arr[frames - 1 - i] *= i / fade_frames
-        
-        return (arr * 32767).astype(np.int16)
-    
-    def generate_sounds(self):
-        """Generate all game sound effects"""
         try:
-            # Hit sound - satisfying "thwack"
-            hit_sound = self.generate_tone(200, 0.2)
-            self.sounds['hit'] = pygame.sndarray.make_sound(hit_sound)
-            
-            # Wicket sound - descending tone
-            wicket_frames = int(0.5 * 22050)
-            wicket_arr = np.zeros((wicket_frames, 2))
-            for i in range(wicket_frames):
-                freq = 400 - (i / wicket_frames) * 300  # 400Hz to 100Hz
-                wave = np.sin(2 * np.pi * freq * i / 22050) * 0.5
-                wicket_arr[i] = [wave, wave]
-            self.sounds['wicket'] = pygame.sndarray.make_sound((wicket_arr * 32767).astype(np.int16))
-            
-            # Boundary sound - ascending celebration
-            boundary_frames = int(0.8 * 22050)
-            boundary_arr = np.zeros((boundary_frames, 2))
-            for i in range(boundary_frames):
-                freq = 300 + (i / boundary_frames) * 200  # 300Hz to 500Hz
-                wave = np.sin(2 * np.pi * freq * i / 22050) * 0.3
-                wave += np.sin(2 * np.pi * freq * 1.5 * i / 22050) * 0.2  # Harmony
-                boundary_arr[i] = [wave, wave]
-            self.sounds['boundary'] = pygame.sndarray.make_sound((boundary_arr * 32767).astype(np.int16))
-            
-            # Power-up sound
-            powerup_sound = self.generate_tone(440, 0.3)
-            self.sounds['powerup'] = pygame.sndarray.make_sound(powerup_sound)
-            
-            # Milestone celebration sound (longer, more elaborate)
-            milestone_frames = int(1.5 * 22050)
-            milestone_arr = np.zeros((milestone_frames, 2))
-            for i in range(milestone_frames):
-                # Create a fanfare-like sound
-                base_freq = 440
-                wave = 0
-                # Multiple harmonics for richness
-                for harmonic in [1, 1.5, 2, 2.5]:
-                    freq = base_freq * harmonic
-                    wave += np.sin(2 * np.pi * freq * i / 22050) * (0.2 / harmonic)
-                
-                # Add some modulation for excitement
-                modulation = 1 + 0.3 * np.sin(2 * np.pi * 5 * i / 22050)
-                wave *= modulation
-                milestone_arr[i] = [wave, wave]
-            self.sounds['milestone'] = pygame.sndarray.make_sound((milestone_arr * 32767).astype(np.int16))
-            
+            self.pcm = self.generate_sounds()
         except Exception as e:
             print(f"Could not generate sounds: {e}")
             # Create silent sounds as fallback
             silent = np.zeros((1000, 2), dtype=np.int16)
-            for key in ['hit', 'wicket', 'boundary', 'powerup', 'milestone']:
-                self.sounds[key] = pygame.sndarray.make_sound(silent)
+            self.pcm = {name: silent for name in SOUND_SPECS}
+            return
+        
+        try:
+            write_bank(self.bank_path, key, self.pcm)
+        except OSError:
+            pass  # Read-only cache location; regenerate next time
+    
+    def time_axis(self, duration, sample_rate=SAMPLE_RATE):
+        """Sample times in seconds, as float32 to keep synthesis single precision"""
+        frames = int(duration * sample_rate)
+        return np.arange(frames, dtype=np.float32) / np.float32(sample_rate)
+    
+    def to_stereo(self, wave):
+        """Scale a mono float wave to int16 and broadcast it to both channels"""
+        wave *= 32767
+        stereo = np.empty((len(wave), 2), dtype=np.int16)
+        stereo[:] = wave[:, np.newaxis]
+        return stereo
+    
+    def generate_tone(self, frequency, duration, sample_rate=SAMPLE_RATE):
+        """Generate a simple tone"""
+        t = self.time_axis(duration, sample_rate)
+        wave = np.sin(np.float32(2 * np.pi * frequency) * t)
+        
+        # Fade in/out to avoid clicks
+        fade_frames = min(int(0.1 * sample_rate), len(wave))
+        ramp = np.arange(fade_frames, dtype=np.float32) / np.float32(fade_frames)
+        wave[:fade_frames] *= ramp
+        wave[len(wave) - fade_frames:] *= ramp[::-1]
+        
+        return self.to_stereo(wave)
+    
+    def generate_sweep(self, start_freq, end_freq, duration, harmonics=((1, 1.0),)):
+        """Generate a linear frequency sweep as a sum of (multiple, amplitude) harmonics"""
+        t = self.time_axis(duration)
+        freq = np.arange(len(t), dtype=np.float32) * np.float32((end_freq - start_freq) / len(t))
+        freq += np.float32(start_freq)
+        phase = np.float32(2 * np.pi) * freq * t
+        wave = np.zeros_like(t)
+        for multiple, amplitude in harmonics:
+            wave += np.sin(phase * np.float32(multiple)) * np.float32(amplitude)
+        return self.to_stereo(wave)
+    
+    def generate_fanfare(self, base_freq, duration, harmonics, modulation_freq, modulation_depth):
+        """Generate a harmonic chord with amplitude modulation"""
+        t = self.time_axis(duration)
+        base_phase = np.float32(2 * np.pi * base_freq) * t
+        wave = np.zeros_like(t)
+        # Multiple harmonics for richness
+        for harmonic in harmonics:
+            wave += np.sin(base_phase * np.float32(harmonic)) * np.float32(0.2 / harmonic)
+        
+        # Add some modulation for excitement
+        modulation = np.sin(np.float32(2 * np.pi * modulation_freq) * t)
+        modulation *= np.float32(modulation_depth)
+        modulation += 1
+        wave *= modulation
+        return self.to_stereo(wave)
+    
+    def generate_sounds(self):
+        """Synthesize all game sound effects as int16 stereo buffers"""
+        generators = {
+            'tone': self.generate_tone,
+            'sweep': self.generate_sweep,
+            'fanfare': self.generate_fanfare,
+        }
+        return {name: generators[kind](**params) for name, (kind, params) in SOUND_SPECS.items()}
+    
+    def get_sound(self, sound_name):
+        """Sound for a bank entry, created from its PCM on first use"""
+        sound = self.sounds.get(sound_name)
+        if sound is None and sound_name in self.pcm:
+            sound = pygame.sndarray.make_sound(self.pcm[sound_name])
+            self.sounds[sound_name] = sound
+        return sound
+    
+    def make_sounds(self):
+        """Create every bank entry's Sound now rather than on its first play"""
+        for sound_name in self.pcm:
+            self.get_sound(sound_name)
     
     def play(self, sound_name):
         """Play a sound effect"""
-        if sound_name in self.sounds:
+        sound = self.get_sound(sound_name)
+        if sound:
             try:
-                self.sounds[sound_name].play()
+                sound.play()
             except:
-                pass  # Silently fail if sound can't play
+                pass  # Silently fail if sound can't play
\ No newline at end of file
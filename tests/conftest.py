@@ -0,0 +1,19 @@
+import os
+import sys
+import pytest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from delivery_log import DeliveryLog
+from enhanced_cricket import EnhancedCricket
+
+@pytest.fixture
+def game(tmp_path):
+    """A windowless, silent game logging deliveries to a temporary directory"""
+    game = EnhancedCricket(persistent=False, sound=False)
+    game.delivery_log = DeliveryLog(str(tmp_path))
+    yield game
+    game.delivery_log.close()
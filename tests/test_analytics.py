@@ -0,0 +1,30 @@
+import pytest
+from analytics import InningsAnalytics
+from controllers import TrackerController, MAX_TICKS
+
+def play(game, seeds):
+    return [game.run_innings(TrackerController(), MAX_TICKS, seed)['score'] for seed in seeds]
+
+def test_runs_total_matches_innings_scores(game):
+    analytics = InningsAnalytics(game.delivery_log)
+    scores = play(game, range(3))
+    analytics.update()
+    scores += play(game, range(3, 6))  # Folded in incrementally
+    analytics.update()
+
+    summary = analytics.summary()
+    assert summary['innings'] == 6
+    assert int(analytics.runs.sum()) == sum(scores)
+    assert sum(stats['runs'] for stats in summary['by_power_up'].values()) == sum(scores)
+    balls = sum(stats['balls'] for stats in summary['by_power_up'].values())
+    strike_rate = sum(stats['strike_rate'] * stats['balls'] for stats in summary['by_power_up'].values()) / balls
+    assert strike_rate == pytest.approx(100 * sum(scores) / balls)
+
+def test_incremental_update_matches_full_pass(game):
+    incremental = InningsAnalytics(game.delivery_log)
+    for seed in range(4):
+        play(game, [seed])
+        incremental.update()
+    full = InningsAnalytics(game.delivery_log)
+    full.update()
+    assert incremental.summary() == full.summary()
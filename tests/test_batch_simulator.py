@@ -0,0 +1,40 @@
+import random
+import numpy as np
+import pytest
+from batch_simulator import BatchSimulator
+from enhanced_cricket import MatchSimulator
+from controllers import TrackerController, MAX_TICKS
+from monte_carlo import tracker_policy
+
+class PythonGenerator:
+    """The parts of numpy's Generator the batch simulator uses, drawing from
+    random.Random so one lane consumes the same stream as MatchSimulator"""
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+
+    def integers(self, low, high, size):
+        return np.array([self.rng.randrange(low, high) for _ in range(size)])
+
+    def uniform(self, low, high, size):
+        return np.array([self.rng.uniform(low, high) for _ in range(size)])
+
+    def random(self, size):
+        return np.array([self.rng.random() for _ in range(size)])
+
+POLICIES = {
+    'idle': (None, None),
+    'swing': (lambda sim: (0, True, False), lambda sim: (0, True, False)),
+    'tracker': (TrackerController(), tracker_policy),
+}
+
+@pytest.mark.parametrize('policy', list(POLICIES))
+@pytest.mark.parametrize('seed', range(4))
+def test_batch_matches_match_simulator(policy, seed):
+    scalar_policy, batch_policy = POLICIES[policy]
+    expected = MatchSimulator('Medium').run_innings(scalar_policy, MAX_TICKS, seed)
+
+    batch = BatchSimulator(1, 'Medium')
+    batch.rng = PythonGenerator(seed)
+    results = batch.run(batch_policy, MAX_TICKS)
+    for name in ('score', 'outs', 'boundaries', 'sixes', 'ticks'):
+        assert int(results[name][0]) == expected[name], name
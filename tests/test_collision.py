@@ -0,0 +1,64 @@
+import math
+import random
+import numpy as np
+from enhanced_cricket import Ball, Batsman, sweep_box
+from batch_simulator import sweep_boxes
+
+def bat_box(batsman):
+    """The bat's (left, top, right, bottom), as check_collision places it"""
+    bat_x = batsman.x + batsman.width // 2
+    bat_y = batsman.y + batsman.height // 2
+    half = (35 if batsman.stance == 'swing' else 25) // 2
+    return bat_x - half, bat_y - 5, bat_x + half, bat_y + 5
+
+def fast_ball(batsman, offset_x=0):
+    """A ball that starts above the bat and ends below it after a single tick"""
+    ball = Ball(random.Random(0))
+    left, top, right, bottom = bat_box(batsman)
+    ball.speed_x, ball.speed_y = 0, 40
+    ball.previous_x = ball.x = (left + right) / 2 + offset_x
+    ball.previous_y = top - ball.radius - 15
+    ball.y = ball.previous_y + ball.speed_y
+    return ball
+
+def test_fast_ball_through_the_bat_is_hit():
+    batsman = Batsman(400, 500)
+    ball = fast_ball(batsman)
+    left, top, right, bottom = bat_box(batsman)
+
+    # Checking only where the ball ends up misses it: it is already past the bat
+    assert ball.y + ball.radius > bottom and ball.y - ball.radius > bottom
+
+    start_y, end_y = ball.previous_y, ball.y
+    ball.check_collision(batsman)
+    assert ball.impact_time is not None and 0 < ball.impact_time < 1
+    assert ball.speed_y < 0
+    impact_y = start_y + (end_y - start_y) * ball.impact_time
+    assert top <= impact_y + ball.radius <= bottom
+
+def test_fast_ball_beside_the_bat_is_missed():
+    batsman = Batsman(400, 500)
+    ball = fast_ball(batsman, offset_x=40)
+    ball.check_collision(batsman)
+    assert ball.impact_time is None and ball.speed_y > 0
+
+def test_scalar_and_vectorized_sweeps_agree():
+    rng = np.random.default_rng(0)
+    n = 5000
+    x0, y0 = rng.uniform(0, 100, n), rng.uniform(0, 100, n)
+    x1, y1 = x0 + rng.uniform(-60, 60, n), y0 + rng.uniform(-60, 60, n)
+    x1[:500] = x0[:500]  # Segments with no horizontal or vertical motion
+    y1[500:1000] = y0[500:1000]
+    left, top = rng.uniform(0, 100, n), rng.uniform(0, 100, n)
+    right, bottom = left + rng.uniform(1, 40, n), top + rng.uniform(1, 40, n)
+
+    vectorized = sweep_boxes(x0, y0, x1, y1, left, top, right, bottom)
+    hits = 0
+    for i in range(n):
+        scalar = sweep_box(*(float(a[i]) for a in (x0, y0, x1, y1, left, top, right, bottom)))
+        if scalar is None:
+            assert math.isnan(vectorized[i])
+        else:
+            hits += 1
+            assert vectorized[i] == scalar
+    assert 100 < hits < n - 100  # Both outcomes exercised
@@ -0,0 +1,63 @@
+from delivery_log import DeliveryLog
+from controllers import TrackerController, MAX_TICKS
+
+def test_logged_deltas_sum_to_innings_score(game):
+    combos = set()
+    for seed in range(5):
+        results = game.run_innings(TrackerController(), MAX_TICKS, seed)
+        innings = game.delivery_log.last_innings(1)[0]
+        deliveries = game.delivery_log.innings_deliveries(innings)
+        assert innings.score == results['score']
+        assert sum(d.score_delta for d in deliveries) == results['score']
+        assert deliveries[-1].score == results['score']
+        combos.update(d.combo_multiplier for d in deliveries if d.score_delta)
+    assert combos > {1}  # Multiplied hits were exercised
+
+def test_logged_combo_is_the_one_scored_at(game):
+    game.run_innings(TrackerController(), MAX_TICKS, seed=1)
+    innings = game.delivery_log.last_innings(1)[0]
+    for delivery in game.delivery_log.innings_deliveries(innings):
+        base = {0: (1, 2), 1: (4,), 2: (6,), 3: (0,)}[delivery.outcome]
+        assert delivery.score_delta in [b * delivery.combo_multiplier for b in base]
+
+def test_best_scores_survive_reopen_and_catch_up(tmp_path):
+    log = DeliveryLog(str(tmp_path))
+    for difficulty, score in [('Easy', 30), ('Hard', 80), ('Easy', 50), ('Hard', 20)]:
+        log.begin_innings(difficulty)
+        log.end_innings({'score': score})
+    stale = (tmp_path / 'best.idx').read_bytes()
+    log.begin_innings('Medium')
+    log.end_innings({'score': 40})
+    log.close()
+
+    (tmp_path / 'best.idx').write_bytes(stale)  # As if the last update was lost
+    log = DeliveryLog(str(tmp_path))
+    assert [log.best_score(d) for d in ('Easy', 'Medium', 'Hard')] == [50, 40, 80]
+    assert [i.score for i in log.last_innings(2, 'Easy')] == [30, 50]
+    log.close()
+
+    (tmp_path / 'best.idx').unlink()
+    log = DeliveryLog(str(tmp_path))
+    assert log.best_score() == 80
+    assert log.best_innings('Hard').score == 80
+    log.close()
+
+def test_abandoned_innings_keeps_its_recorded_totals(tmp_path):
+    log = DeliveryLog(str(tmp_path))
+    log.begin_innings('Medium')
+    log.end_innings({'score': 10})
+    log.begin_innings('Medium')
+    log.record(10, 'hit', 'swing', None, 1, 3, 2, 2)
+    log.record(20, 'boundary', 'swing', None, 1, 3, 4, 6)
+    log.record(30, 'six', 'swing', None, 1, 3, 6, 12)
+    log.begin_innings('Medium')  # Restarted mid-innings
+    log.record(10, 'hit', 'swing', None, 1, 3, 1, 1)
+    log.close()
+
+    log = DeliveryLog(str(tmp_path))
+    _, abandoned, unfinished = log.last_innings(3)
+    assert (abandoned.score, abandoned.boundaries, abandoned.sixes, abandoned.completed) == (12, 1, 1, 0)
+    assert abandoned.score == log.innings_deliveries(abandoned)[-1].score
+    assert (unfinished.score, unfinished.deliveries, unfinished.completed) == (1, 1, 0)
+    assert log.best_score() == 10  # Only completed innings count
+    log.close()
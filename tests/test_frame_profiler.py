@@ -0,0 +1,21 @@
+from frame_profiler import FrameProfiler
+
+def test_hiding_overlay_keeps_profiling_enabled():
+    profiler = FrameProfiler(enabled=True)
+    profiler.toggle_overlay()
+    profiler.next_frame()
+    assert profiler.overlay_visible and profiler.enabled
+    profiler.toggle_overlay()
+    profiler.next_frame()
+    assert not profiler.overlay_visible
+    assert profiler.enabled
+    with profiler.phase('update'):
+        pass
+    assert profiler.summary()['update']['count'] == 1
+
+def test_overlay_toggles_take_effect_at_frame_boundary():
+    profiler = FrameProfiler()
+    profiler.toggle_overlay()
+    assert not profiler.overlay_visible and not profiler.enabled
+    profiler.next_frame()
+    assert profiler.overlay_visible and profiler.enabled
@@ -0,0 +1,19 @@
+import pytest
+from enhanced_cricket import EnhancedCricket, DEFAULT_MAX_FPS, parse_max_fps
+
+@pytest.mark.parametrize('value, expected', [
+    (None, DEFAULT_MAX_FPS),
+    ('', DEFAULT_MAX_FPS),
+    ('144', 144),
+    (' 30 ', 30),
+    ('fast', DEFAULT_MAX_FPS),
+    ('59.9', DEFAULT_MAX_FPS),
+    ('0', 1),
+    ('-5', 1),
+])
+def test_parse_max_fps(value, expected):
+    assert parse_max_fps(value) == expected
+
+def test_game_survives_invalid_max_fps(monkeypatch):
+    monkeypatch.setenv('CRICKET_MAX_FPS', 'fast')
+    assert EnhancedCricket(persistent=False, sound=False).max_fps == DEFAULT_MAX_FPS
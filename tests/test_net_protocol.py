@@ -0,0 +1,36 @@
+import pytest
+from net_protocol import (capture, encode_snapshot, decode_snapshot, payload_size,
+                          SNAPSHOT_HEADER)
+from enhanced_cricket import MatchSimulator
+from controllers import TrackerController
+
+def test_keyframe_and_deltas_round_trip_to_captured_state():
+    sim = MatchSimulator(seed=5)
+    sim.restart_game()
+    controller = TrackerController()
+    received = None
+    previous = None
+    sizes = []
+    for tick in range(3000):
+        state = capture(sim)
+        snapshot = encode_snapshot(tick, state, None if tick % 1000 == 0 else previous)
+        assert len(snapshot) == SNAPSHOT_HEADER.size + payload_size(SNAPSHOT_HEADER.unpack_from(snapshot)[2])
+        decoded_tick, keyframe, received = decode_snapshot(snapshot, received)
+        assert (decoded_tick, keyframe) == (tick, tick % 1000 == 0)
+        assert received == state
+        sizes.append((keyframe, len(snapshot)))
+        previous = state
+        sim.step(controller(sim))
+        if sim.game_over:
+            sim.restart_game()
+    keyframe_size = max(size for keyframe, size in sizes if keyframe)
+    deltas = [size for keyframe, size in sizes if not keyframe]
+    assert sum(deltas) / len(deltas) < keyframe_size / 2
+
+def test_delta_needs_a_keyframe():
+    sim = MatchSimulator(seed=1)
+    sim.restart_game()
+    first = capture(sim)
+    sim.step((1, False, False))
+    with pytest.raises(ValueError):
+        decode_snapshot(encode_snapshot(1, capture(sim), first))
@@ -0,0 +1,59 @@
+import random
+import struct
+import pytest
+from replay import (Replay, REPLAY_FORMAT, REPLAY_HEADER, encode_action, decode_action,
+                    encode_runs, decode_runs, play_replay, verify_replay)
+from enhanced_cricket import MatchSimulator
+from controllers import TrackerController, RandomController
+
+ACTIONS = [(move, swing, defend) for move in (-1, 0, 1) for swing in (False, True) for defend in (False, True)]
+
+def test_every_action_round_trips():
+    codes = {encode_action(action) for action in ACTIONS}
+    assert len(codes) == len(ACTIONS) and max(codes) < 16
+    for action in ACTIONS:
+        assert decode_action(encode_action(action)) == action
+
+def test_runs_round_trip_including_long_runs():
+    lengths = [1, 2, 7, 8, 9, 1023, 1024, 1025, 2 ** 21, 2 ** 31 + 5]
+    runs = [(code, length) for code in range(16) for length in lengths]
+    assert decode_runs(encode_runs(runs)) == runs
+    assert len(encode_runs([(3, 8)])) == 1  # Short runs take one byte
+
+def test_replay_bytes_round_trip():
+    rng = random.Random(0)
+    replay = Replay(1234, 'Hard')
+    for _ in range(5000):
+        replay.record(rng.choice(ACTIONS[:4]) if rng.random() < 0.1 else ACTIONS[0])
+    for _ in range(100000):
+        replay.record(ACTIONS[-1])
+    replay.results = {'score': 42, 'outs': 0, 'boundaries': 3, 'sixes': 1, 'ticks': replay.ticks}
+
+    copy = Replay.from_bytes(replay.to_bytes())
+    assert (copy.seed, copy.difficulty, copy.ticks, copy.results) == (1234, 'Hard', 105000, replay.results)
+    assert list(copy.actions()) == list(replay.actions())
+
+def test_other_format_versions_are_rejected():
+    data = bytearray(Replay(1).to_bytes())
+    struct.pack_into('<H', data, 4, REPLAY_FORMAT + 1)
+    with pytest.raises(ValueError, match="format"):
+        Replay.from_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        Replay.from_bytes(bytes(data[:REPLAY_HEADER.size - 1]))
+
+@pytest.mark.parametrize('controller', [TrackerController(), RandomController(7)])
+def test_verify_reproduces_the_recorded_score(controller):
+    sim = MatchSimulator('Medium', seed=3)
+    sim.restart_game()
+    replay = Replay(sim.seed, sim.difficulty)
+    while not sim.game_over and sim.ticks < 20000:
+        action = controller(sim)
+        replay.record(action)
+        sim.step(action)
+    replay.results = sim.results()
+
+    replay = Replay.from_bytes(replay.to_bytes())
+    assert play_replay(replay) == replay.results
+    assert verify_replay(replay)
+    replay.results = dict(replay.results, score=replay.results['score'] + 1)
+    assert not verify_replay(replay)
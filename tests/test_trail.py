@@ -0,0 +1,25 @@
+import pygame
+from enhanced_cricket import Trail, TrailRenderer
+
+def test_trail_keeps_newest_points_oldest_first_after_wrapping():
+    trail = Trail(4)
+    for i in range(11):
+        trail.append((i, -i))
+    assert len(trail) == 4
+    assert trail.ordered() == [(7, -7), (8, -8), (9, -9), (10, -10)]
+    assert list(trail) == trail.ordered()
+
+    trail.clear()
+    trail.append((1, 2))
+    assert trail.ordered() == [(1, 2)]
+
+def test_renderer_draws_wrapped_trail_oldest_to_newest():
+    trail = Trail(4)
+    for i in range(6):
+        trail.append((10 + 20 * i, 50))
+    screen = pygame.Surface((200, 100), pygame.SRCALPHA)
+    rect = TrailRenderer().draw(screen, trail, (255, 0, 0), 6)
+    assert rect == pygame.Rect(50 - 6, 50 - 6, 60 + 1 + 12, 1 + 12)
+    # Discs fade in from the oldest point, so alpha rises along the trail
+    alphas = [screen.get_at((x, 50)).a for x, _ in trail.ordered()]
+    assert alphas == sorted(alphas) and alphas[0] < alphas[-1]